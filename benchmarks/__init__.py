@@ -0,0 +1,8 @@
+"""Performance benchmarks for the helpcenter app.
+
+Run the suite with::
+
+    python -m benchmarks --output results.json
+
+See `python -m benchmarks --help` for the available options.
+"""
@@ -0,0 +1,236 @@
+"""Run the benchmark suite.
+
+Every dataset is generated in a fresh test database, and every case is
+run against it a number of times. The latency and number of queries of
+each case are written to a JSON file. If a baseline file from a
+previous run is given, the results are compared against it and the
+command exits with a non-zero status if anything regressed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+
+def compare(results, baseline, tolerance):
+    """Compare benchmark results against a baseline.
+
+    Args:
+        results (dict):
+            The results of the current run.
+        baseline (dict):
+            The results of a previous run.
+        tolerance (float):
+            The fraction by which a case's median latency may exceed
+            the baseline before it is considered a regression.
+
+    Returns:
+        list:
+            A description of each regression.
+    """
+    regressions = []
+
+    for dataset, cases in sorted(results['results'].items()):
+        base_cases = baseline.get('results', {}).get(dataset, {})
+
+        for case, result in sorted(cases.items()):
+            base = base_cases.get(case)
+
+            if base is None:
+                continue
+
+            if result['median_ms'] > base['median_ms'] * (1 + tolerance):
+                regressions.append(
+                    '{}.{}: median latency {:.2f}ms > {:.2f}ms'.format(
+                        dataset, case, result['median_ms'],
+                        base['median_ms']))
+
+            if result['queries'] > base['queries']:
+                regressions.append(
+                    '{}.{}: {} queries > {} queries'.format(
+                        dataset, case, result['queries'], base['queries']))
+
+    return regressions
+
+
+def measure(func, repeat):
+    """Measure the latency and query count of a function.
+
+    Args:
+        func:
+            The function to measure. It is called once to warm up
+            before being measured.
+        repeat (int):
+            The number of times to call the function.
+
+    Returns:
+        dict:
+            The minimum and median latencies in milliseconds, and the
+            number of queries made by a single call.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    func()
+
+    timings = []
+
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            start = timeit.default_timer()
+            func()
+            timings.append((timeit.default_timer() - start) * 1000)
+
+    timings.sort()
+
+    return {
+        'median_ms': timings[len(timings) // 2],
+        'min_ms': timings[0],
+        'queries': len(queries),
+    }
+
+
+def run(datasets, cases, scale, repeat):
+    """Run the benchmarks.
+
+    Args:
+        datasets (list):
+            The names of the datasets to generate.
+        cases (list):
+            The names of the cases to measure.
+        scale (float):
+            The factor used to scale the size of each dataset.
+        repeat (int):
+            The number of times to run each case.
+
+    Returns:
+        dict:
+            The results of each case, grouped by dataset.
+    """
+    from django.core.management import call_command
+    from django.test import Client
+
+    from benchmarks.cases import CASES
+    from benchmarks.datasets import DATASETS
+    from helpcenter import cache
+
+    results = {}
+
+    for dataset in datasets:
+        call_command('flush', interactive=False, verbosity=0)
+        cache.get_cache().clear()
+
+        sys.stderr.write('Generating {}...\n'.format(dataset))
+        targets = DATASETS[dataset](scale)
+
+        client = Client()
+        results[dataset] = {}
+
+        for case in cases:
+            sys.stderr.write('  {}\n'.format(case))
+            results[dataset][case] = measure(
+                lambda: CASES[case](client, targets), repeat)
+
+    return results
+
+
+def main(argv=None):
+    """Run the benchmark suite from the command line.
+
+    Returns:
+        int:
+            The exit status of the command.
+    """
+    sys.path.insert(0, os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'test_settings')
+
+    import django
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment, teardown_test_environment)
+
+    django.setup()
+
+    from benchmarks.cases import CASES
+    from benchmarks.datasets import DATASETS
+
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Benchmark the helpcenter app.')
+    parser.add_argument(
+        '--baseline',
+        help='A results file from a previous run to compare against.')
+    parser.add_argument(
+        '--case', action='append', choices=sorted(CASES), dest='cases',
+        help='A case to run. May be given multiple times. (default: all)')
+    parser.add_argument(
+        '--dataset', action='append', choices=sorted(DATASETS),
+        dest='datasets',
+        help='A dataset to generate. May be given multiple times. '
+             '(default: all)')
+    parser.add_argument(
+        '--output', default='benchmark-results.json',
+        help='The file to write the results to. (default: %(default)s)')
+    parser.add_argument(
+        '--repeat', default=5, type=int,
+        help='The number of times to run each case. (default: %(default)s)')
+    parser.add_argument(
+        '--scale', default=1.0, type=float,
+        help='A factor to scale the size of each dataset by. '
+             '(default: %(default)s)')
+    parser.add_argument(
+        '--tolerance', default=0.2, type=float,
+        help='The fraction by which latency may grow before being '
+             'reported as a regression. (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+
+    try:
+        results = {
+            'meta': {
+                'django': django.get_version(),
+                'python': platform.python_version(),
+                'repeat': args.repeat,
+                'scale': args.scale,
+            },
+            'results': run(
+                args.datasets or sorted(DATASETS),
+                args.cases or sorted(CASES),
+                args.scale,
+                args.repeat),
+        }
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+    for dataset, cases in sorted(results['results'].items()):
+        for case, result in sorted(cases.items()):
+            print('{:<16} {:<26} {:>10.2f}ms {:>6} queries'.format(
+                dataset, case, result['median_ms'], result['queries']))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        regressions = compare(results, baseline, args.tolerance)
+
+        for regression in regressions:
+            print('REGRESSION: {}'.format(regression))
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
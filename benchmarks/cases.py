@@ -0,0 +1,79 @@
+"""The operations measured by the benchmark suite.
+
+Each case receives a test client and the targets returned by a dataset
+and performs a single operation.
+"""
+
+from django.core.urlresolvers import reverse
+from django.test import override_settings
+
+
+def _get(client, url):
+    """Request a page and make sure it was served successfully."""
+    response = client.get(url)
+
+    assert response.status_code == 200, (
+        "'{}' returned a {} response.".format(url, response.status_code))
+
+    return response
+
+
+def api_article_detail(client, targets):
+    """The API's article detail endpoint."""
+    _get(client, reverse('helpcenter:helpcenter-api:article-detail',
+                         kwargs={'pk': targets['article'].pk}))
+
+
+def api_article_list(client, targets):
+    """The API's article list endpoint."""
+    _get(client, reverse('helpcenter:helpcenter-api:article-list'))
+
+
+def api_category_detail(client, targets):
+    """The API's category detail endpoint."""
+    _get(client, reverse('helpcenter:helpcenter-api:category-detail',
+                         kwargs={'pk': targets['leaf_category'].pk}))
+
+
+def api_category_list(client, targets):
+    """The API's category list endpoint."""
+    _get(client, reverse('helpcenter:helpcenter-api:category-list'))
+
+
+def article_detail(client, targets):
+    """The article detail view."""
+    _get(client, targets['article'].get_absolute_url())
+
+
+def article_save(client, targets):
+    """Saving an existing article."""
+    targets['article'].save()
+
+
+def category_detail(client, targets):
+    """The category detail view."""
+    _get(client, targets['category'].get_absolute_url())
+
+
+def category_detail_expanded(client, targets):
+    """The category detail view with the expanded article list."""
+    with override_settings(HELPCENTER_EXPANDED_ARTICLE_LIST=True):
+        _get(client, targets['category'].get_absolute_url())
+
+
+def index(client, targets):
+    """The index view."""
+    _get(client, reverse('helpcenter:index'))
+
+
+CASES = {
+    'api_article_detail': api_article_detail,
+    'api_article_list': api_article_list,
+    'api_category_detail': api_category_detail,
+    'api_category_list': api_category_list,
+    'article_detail': article_detail,
+    'article_save': article_save,
+    'category_detail': category_detail,
+    'category_detail_expanded': category_detail_expanded,
+    'index': index,
+}
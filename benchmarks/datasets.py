@@ -0,0 +1,147 @@
+"""Generators for synthetic help center datasets.
+
+Each dataset function populates an empty database and returns a
+dictionary of the objects the benchmarks should target.
+"""
+
+from django.utils.text import slugify
+
+from helpcenter import models
+
+
+def _create_articles(categories, per_category, body, title_prefix='Article'):
+    """Create articles in bulk.
+
+    Args:
+        categories (list):
+            The categories to create articles in. `None` creates
+            uncategorized articles.
+        per_category (int):
+            The number of articles to create in each category.
+        body (str):
+            The body of each article.
+        title_prefix (str):
+            The prefix of each article's title.
+
+    Returns:
+        list:
+            The created articles.
+    """
+    articles = []
+
+    # Every article shares a body, so its derived fields are computed
+    # once and copied to each article.
+    template = models.Article(body=body)
+    template.update_derived_fields()
+    derived = dict(
+        (name, getattr(template, name))
+        for name in models.Article.DERIVED_FIELDS)
+
+    for category in categories:
+        for i in range(per_category):
+            title = '{} {}-{}'.format(
+                title_prefix, category.pk if category else 0, i)
+            articles.append(models.Article(
+                body=body,
+                category=category,
+                slug=slugify(title)[:50],
+                title=title,
+                **derived))
+
+    models.Article.objects.bulk_create(articles, batch_size=500)
+
+    return list(models.Article.objects.order_by('pk'))
+
+
+def _paragraphs(size):
+    """Create an HTML body of roughly `size` characters."""
+    paragraph = (
+        '<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed '
+        'do eiusmod tempor incididunt ut labore et dolore magna '
+        'aliqua.</p>\n')
+
+    return paragraph * max(1, size // len(paragraph))
+
+
+def deep_chain(scale=1.0):
+    """A single chain of nested categories.
+
+    Every category contains a couple of articles, and the deepest
+    category is targeted. This stresses anything that walks up or down
+    the category tree. The chain is never deeper than categories can be
+    nested.
+    """
+    depth = min(models.Category.MAX_DEPTH, max(2, int(50 * scale)))
+    parent = None
+    categories = []
+
+    for i in range(depth):
+        parent = models.Category.objects.create(
+            title='Level {}'.format(i), parent=parent)
+        categories.append(parent)
+
+    articles = _create_articles(categories, 2, _paragraphs(2000))
+
+    return {
+        'article': articles[-1],
+        'category': categories[0],
+        'leaf_category': categories[-1],
+    }
+
+
+def large_bodies(scale=1.0):
+    """Articles with very large bodies in a single category."""
+    category = models.Category.objects.create(title='Large')
+    count = max(1, int(200 * scale))
+
+    articles = _create_articles([category], count, _paragraphs(200000))
+
+    return {
+        'article': articles[0],
+        'category': category,
+        'leaf_category': category,
+    }
+
+
+def many_articles(scale=1.0):
+    """A large number of small articles spread over a few categories."""
+    categories = [
+        models.Category.objects.create(title='Category {}'.format(i))
+        for i in range(10)]
+    per_category = max(1, int(10000 * scale))
+
+    articles = _create_articles(categories, per_category, _paragraphs(500))
+
+    return {
+        'article': articles[len(articles) // 2],
+        'category': categories[0],
+        'leaf_category': categories[-1],
+    }
+
+
+def wide_fanout(scale=1.0):
+    """A root category with a large number of child categories."""
+    root = models.Category.objects.create(title='Root')
+    width = max(1, int(500 * scale))
+
+    # The children are saved one at a time rather than in bulk, since a
+    # category's path, depth, and label are only set when it is saved.
+    children = [
+        models.Category.objects.create(
+            parent=root, title='Child {}'.format(i))
+        for i in range(width)]
+    articles = _create_articles(children, 2, _paragraphs(1000))
+
+    return {
+        'article': articles[0],
+        'category': root,
+        'leaf_category': children[-1],
+    }
+
+
+DATASETS = {
+    'deep_chain': deep_chain,
+    'large_bodies': large_bodies,
+    'many_articles': many_articles,
+    'wide_fanout': wide_fanout,
+}
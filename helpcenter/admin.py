@@ -1,10 +1,70 @@
+from django.conf.urls import url
 from django.contrib import admin
+from django.contrib.admin import helpers
+from django.core.paginator import Paginator
+from django.db import connections
+from django.template.response import TemplateResponse
 
-from helpcenter import models
+from helpcenter import articles, duplicates, forms, fulltext, models
+
+
+# Unfiltered changelists of tables estimated to have at least this many
+# rows use the estimate instead of counting every row.
+ESTIMATE_THRESHOLD = 10000
+
+
+def get_estimated_count(queryset):
+    """Estimate the number of rows in an unfiltered queryset.
+
+    Args:
+        queryset:
+            The queryset to estimate the size of.
+
+    Returns:
+        int:
+            The query planner's estimate of the number of rows in the
+            queryset's table, or None if the queryset is filtered or the
+            database isn't PostgreSQL.
+    """
+    connection = connections[queryset.db]
+
+    if connection.vendor != 'postgresql' or queryset.query.where:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples FROM pg_class WHERE relname = %s',
+            [queryset.model._meta.db_table])
+        row = cursor.fetchone()
+
+    return int(row[0]) if row else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that estimates the size of large tables.
+
+    Counting every row of a large table takes a full scan on
+    PostgreSQL, so unfiltered changelists use the query planner's
+    estimate of the table's size once it reaches `ESTIMATE_THRESHOLD`
+    rows. Filtered changelists and other databases are counted exactly.
+    """
+
+    def _get_count(self):
+        """Get the estimated or exact number of objects."""
+        if self._count is None:
+            estimate = get_estimated_count(self.object_list)
+
+            if estimate is not None and estimate >= ESTIMATE_THRESHOLD:
+                self._count = estimate
+
+        return super(EstimatedCountPaginator, self)._get_count()
+
+    count = property(_get_count)
 
 
 class ArticleAdmin(admin.ModelAdmin):
     """ Admin for the Article model """
+    actions = ('publish_articles', 'unpublish_articles', 'move_articles')
     date_hierarchy = 'time_published'
     fieldsets = (
         (None, {
@@ -16,7 +76,99 @@ class ArticleAdmin(admin.ModelAdmin):
         }))
     list_display = (
         'title', 'category', 'time_published', 'time_edited', 'draft')
-    search_fields = ('title',)
+    list_select_related = ('category',)
+    paginator = EstimatedCountPaginator
+    search_fields = ('title', 'body')
+    show_full_result_count = False
+
+    def duplicates_view(self, request):
+        """List every pair of near-duplicate articles."""
+        context = dict(
+            self.admin_site.each_context(request),
+            duplicates=duplicates.find_all_duplicates(),
+            opts=self.model._meta,
+            threshold=duplicates.get_threshold(),
+            title='Near-duplicate articles')
+
+        return TemplateResponse(
+            request, 'admin/helpcenter/article/duplicates.html', context)
+
+    def formfield_for_foreignkey(self, db_field, request=None, **kwargs):
+        """Choose the article's category with an autocomplete widget."""
+        if db_field.name == 'category':
+            kwargs['widget'] = forms.CategoryAutocompleteWidget
+
+        return super(ArticleAdmin, self).formfield_for_foreignkey(
+            db_field, request, **kwargs)
+
+    def get_search_results(self, request, queryset, search_term):
+        """Search the articles' titles and bodies using their terms.
+
+        See `helpcenter.fulltext`.
+        """
+        return fulltext.filter_articles(queryset, search_term), False
+
+    def get_urls(self):
+        """Add the near-duplicate report to the admin's URLs."""
+        info = self.model._meta.app_label, self.model._meta.model_name
+        urls = [
+            url(r'^duplicates/$',
+                self.admin_site.admin_view(self.duplicates_view),
+                name='{}_{}_duplicates'.format(*info)),
+        ]
+
+        return urls + super(ArticleAdmin, self).get_urls()
+
+    def move_articles(self, request, queryset):
+        """Move the selected articles to a category.
+
+        The category is chosen on an intermediate page, which submits
+        the action again along with the chosen category.
+        """
+        form = forms.MoveArticlesForm(
+            request.POST if 'apply' in request.POST else None)
+
+        if form.is_valid():
+            category = form.cleaned_data['category']
+            count = articles.move_articles(
+                queryset, category.pk if category is not None else None)
+            self.message_user(
+                request, 'Moved {} article(s).'.format(count))
+
+            return None
+
+        context = dict(
+            self.admin_site.each_context(request),
+            action_checkbox_name=helpers.ACTION_CHECKBOX_NAME,
+            articles=queryset,
+            form=form,
+            opts=self.model._meta,
+            title='Move articles')
+
+        return TemplateResponse(
+            request, 'admin/helpcenter/article/move.html', context)
+
+    move_articles.short_description = 'Move selected articles'
+
+    def publish_articles(self, request, queryset):
+        """Publish the selected draft articles."""
+        count = articles.publish_articles(queryset)
+        self.message_user(request, 'Published {} article(s).'.format(count))
+
+    publish_articles.short_description = 'Publish selected articles'
+
+    def save_model(self, request, obj, form, change):
+        """Save the article, warning about near-duplicates."""
+        super(ArticleAdmin, self).save_model(request, obj, form, change)
+        duplicates.warn_duplicates(request, obj)
+
+    def unpublish_articles(self, request, queryset):
+        """Turn the selected articles back into drafts."""
+        count = articles.unpublish_articles(queryset)
+        self.message_user(
+            request, 'Unpublished {} article(s).'.format(count))
+
+    unpublish_articles.short_description = 'Unpublish selected articles'
 
 
 class CategoryAdmin(admin.ModelAdmin):
@@ -26,7 +178,18 @@ class CategoryAdmin(admin.ModelAdmin):
             'fields': ('parent', 'title')
         }),)
     list_display = ('title', 'parent')
+    list_select_related = ('parent',)
+    paginator = EstimatedCountPaginator
     search_fields = ('title',)
+    show_full_result_count = False
+
+    def formfield_for_foreignkey(self, db_field, request=None, **kwargs):
+        """Choose the category's parent with an autocomplete widget."""
+        if db_field.name == 'parent':
+            kwargs['widget'] = forms.CategoryAutocompleteWidget
+
+        return super(CategoryAdmin, self).formfield_for_foreignkey(
+            db_field, request, **kwargs)
 
 
 admin.site.register(models.Article, ArticleAdmin)
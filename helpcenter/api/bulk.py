@@ -0,0 +1,315 @@
+"""Batched creation, modification, and deletion of articles."""
+
+from django.db import connections, router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from helpcenter import (
+    cache, duplicates, fulltext, models, revisions, routers, slugs, utils)
+from helpcenter.api import serializers
+
+
+class BulkArticleOperations(object):
+    """A batch of operations to apply to articles.
+
+    The batch is validated as a whole before anything is written. All
+    the categories referenced by the batch are checked with one query
+    and all the articles being modified are fetched with another. The
+    operations are then applied in a single transaction using one
+    statement per type of operation where the database allows it.
+
+    Attributes:
+        errors (list):
+            After calling `is_valid`, a list containing a dictionary of
+            errors for each operation. Operations without errors have
+            an empty dictionary.
+        operations (list):
+            The validated operations, as produced by
+            `BulkOperationSerializer`.
+    """
+
+    def __init__(self, operations):
+        """Create a new batch from a list of validated operations."""
+        self.operations = operations
+        self.errors = None
+
+        self._attrs = [None] * len(operations)
+        self._instances = {}
+
+        # Everything is read from the database being written to, since
+        # replicas may not have caught up with recent changes.
+        self._db = router.db_for_write(models.Article)
+
+    def is_valid(self):
+        """Determine if every operation in the batch can be applied.
+
+        Returns:
+            bool:
+                True if there are no errors in any of the operations.
+        """
+        self.errors = [{} for _ in self.operations]
+
+        self._validate_data()
+        self._validate_categories()
+        self._validate_targets()
+
+        return not any(self.errors)
+
+    def save(self):
+        """Apply the operations in the batch.
+
+        Returns:
+            list:
+                A result for each operation in the same order as the
+                operations. Each result is a dictionary containing the
+                operation's action, the id of the affected article,
+                and, unless the article was deleted, the article
+                instance.
+        """
+        assert self.errors is not None and not any(self.errors), (
+            'The operations must be valid before they can be saved.')
+
+        created, updated, deleted = [], [], []
+        reindexed, renamed, slug_changes, retermed = [], [], [], []
+        republished = False
+        results = []
+
+        for operation, attrs in zip(self.operations, self._attrs):
+            action = operation['action']
+
+            if action == 'create':
+                article = models.Article(**attrs)
+                article.update_derived_fields()
+                created.append(article)
+                reindexed.append(article)
+                renamed.append((article, article.title))
+                retermed.append(article)
+            elif action == 'update':
+                article = self._instances[operation['id']]
+                old = (article.category_id, article.slug, article.title)
+
+                for name, value in attrs.items():
+                    setattr(article, name, value)
+
+                # As in `Article.save`, articles moved to a different
+                # category keep their slug if it's available.
+                if article.title != old[2]:
+                    renamed.append((article, article.title))
+                elif article.category_id != old[0]:
+                    renamed.append((article, old[1]))
+
+                if (article.category_id, article.title) != (old[0], old[2]):
+                    slug_changes.append((article, old[0], old[1]))
+
+                if 'body' in attrs:
+                    article.update_derived_fields()
+                    reindexed.append(article)
+
+                if 'body' in attrs or article.title != old[2]:
+                    retermed.append(article)
+
+                if not set(attrs).isdisjoint(
+                        models.Article.PUBLISHING_FIELDS):
+                    republished = True
+
+                updated.append(article)
+            else:
+                article = None
+                deleted.append(operation['id'])
+
+            results.append((action, operation.get('id'), article))
+
+        with transaction.atomic(using=self._db):
+            if deleted:
+                models.Article.objects.using(self._db).filter(
+                    pk__in=deleted).delete()
+
+            self._assign_slugs(renamed)
+            saved = self._create(created)
+            self._update(updated, update_slugs=bool(slug_changes))
+
+            models.SlugHistory.record(slug_changes, using=self._db)
+
+            # Articles created with `Article.save` already had their
+            # revisions and indexes written by its signal handlers.
+            if saved:
+                saved_pks = set(article.pk for article in created)
+                created = []
+                reindexed = [article for article in reindexed
+                             if article.pk not in saved_pks]
+                retermed = [article for article in retermed
+                            if article.pk not in saved_pks]
+
+            revisions.record_revisions(created + updated, using=self._db)
+            duplicates.index_articles(reindexed, using=self._db)
+            fulltext.index_articles(retermed, using=self._db)
+
+            # Articles published or unpublished without changing their
+            # terms still change the vocabulary searches use.
+            if republished and not retermed:
+                cache.invalidate_terms(using=self._db)
+
+        # Bulk queries don't send signals, so cached content has to be
+        # invalidated and the write recorded manually. Doing it once for
+        # the whole batch is cheaper anyways.
+        cache.bump_generation()
+        routers.record_write()
+
+        return [
+            {
+                'action': action,
+                'id': article.pk if article is not None else pk,
+                'instance': article,
+            }
+            for action, pk, article in results]
+
+    def _assign_slugs(self, articles):
+        """Give new or renamed articles unique slugs.
+
+        The slugs already used in the articles' categories are fetched
+        with a single query.
+
+        Args:
+            articles (list):
+                A tuple for each article containing the article and the
+                title to generate its slug from.
+        """
+        if not articles:
+            return
+
+        query = Q()
+
+        for article, title in articles:
+            query |= Q(
+                category_id=article.category_id,
+                slug__startswith=slugs.get_prefix(title))
+
+        used = {}
+        rows = models.Article.objects.using(self._db).filter(
+            query).values_list('pk', 'category_id', 'slug')
+        renamed = set(article.pk for article, _ in articles)
+
+        for pk, category_id, slug in rows:
+            # Renamed articles may reuse their own slug
+            if pk not in renamed:
+                used.setdefault(category_id, set()).add(slug)
+
+        for article, title in articles:
+            taken = used.setdefault(article.category_id, set())
+            article.slug = slugs.make_slug(title, taken)
+            taken.add(article.slug)
+
+    def _create(self, articles):
+        """Insert new articles into the database.
+
+        Returns:
+            bool:
+                True if the articles were saved one at a time with
+                `Article.save`, which sends signals, rather than
+                inserted in bulk.
+        """
+        if not articles:
+            return False
+
+        connection = connections[self._db]
+
+        if getattr(connection.features, 'can_return_ids_from_bulk_insert',
+                   False):
+            models.Article.objects.using(self._db).bulk_create(articles)
+
+            return False
+
+        # Older versions of Django can't retrieve the primary keys of
+        # rows inserted in bulk, so the rows are inserted one at a
+        # time. Since we're in a transaction, this is still much
+        # cheaper than a request per article.
+        for article in articles:
+            article.save(force_insert=True, using=self._db)
+
+        return True
+
+    def _update(self, articles, update_slugs=False):
+        """Save modified articles to the database."""
+        if not articles:
+            return
+
+        now = timezone.now()
+        fields = {'time_edited'}
+
+        if update_slugs:
+            fields.add('slug')
+
+        for article in articles:
+            article.time_edited = now
+
+        for operation, attrs in zip(self.operations, self._attrs):
+            if operation['action'] == 'update':
+                fields.update(attrs.keys())
+
+                if 'body' in attrs:
+                    fields.update(models.Article.DERIVED_FIELDS)
+
+        utils.bulk_update(articles, fields, using=self._db)
+
+    def _validate_categories(self):
+        """Ensure every referenced category exists using one query."""
+        category_ids = set(
+            attrs['category_id'] for attrs in self._attrs
+            if attrs and attrs.get('category_id') is not None)
+
+        if not category_ids:
+            return
+
+        existing = set(models.Category.objects.using(self._db).filter(
+            pk__in=category_ids).values_list('pk', flat=True))
+
+        for attrs, errors in zip(self._attrs, self.errors):
+            if not attrs:
+                continue
+
+            pk = attrs.get('category_id')
+
+            if pk is not None and pk not in existing:
+                errors['category_id'] = [
+                    'Invalid pk "{}" - object does not exist.'.format(pk)]
+
+    def _validate_data(self):
+        """Validate the article data of each operation."""
+        for i, operation in enumerate(self.operations):
+            if operation['action'] == 'delete':
+                continue
+
+            serializer = serializers.BulkArticleSerializer(
+                data=operation['data'],
+                partial=operation['action'] == 'update')
+
+            if serializer.is_valid():
+                self._attrs[i] = dict(serializer.validated_data)
+            else:
+                self.errors[i]['data'] = serializer.errors
+
+    def _validate_targets(self):
+        """Ensure the modified articles exist using one query."""
+        seen = set()
+
+        for operation, errors in zip(self.operations, self.errors):
+            pk = operation.get('id')
+
+            if operation['action'] == 'create' or pk is None:
+                continue
+
+            if pk in seen:
+                errors['id'] = [
+                    'Only one operation per article is allowed.']
+
+            seen.add(pk)
+
+        self._instances = models.Article.objects.using(self._db).in_bulk(
+            seen)
+
+        for operation, errors in zip(self.operations, self.errors):
+            if operation['action'] == 'create':
+                continue
+
+            if operation.get('id') not in self._instances:
+                errors.setdefault('id', ['Not found.'])
@@ -10,6 +10,9 @@ class ArticleSerializer(serializers.HyperlinkedModelSerializer):
         queryset=models.Category.objects.all(),
         required=False,
         source='category')
+    table_of_contents = serializers.ListField(
+        child=serializers.DictField(),
+        read_only=True)
 
     class Meta:
         extra_kwargs = {
@@ -21,11 +24,41 @@ class ArticleSerializer(serializers.HyperlinkedModelSerializer):
             },
         }
         fields = (
-            'body', 'category', 'category_id', 'id', 'time_published', 'title',
-            'url'
+            'body', 'body_html', 'category', 'category_id', 'excerpt', 'id',
+            'reading_time', 'table_of_contents', 'time_published', 'title',
+            'url', 'view_count', 'word_count'
         )
         model = models.Article
-        read_only_fields = ('category', 'id')
+        read_only_fields = (
+            'body_html', 'category', 'excerpt', 'id', 'reading_time',
+            'view_count', 'word_count'
+        )
+
+
+class ArticleListSerializer(ArticleSerializer):
+    """Serializer for articles in a listing.
+
+    The article's body and the fields derived from it are left out so
+    listings can be built from `ArticleQuerySet.for_listing`.
+    """
+
+    class Meta(ArticleSerializer.Meta):
+        fields = (
+            'category', 'category_id', 'excerpt', 'id', 'time_published',
+            'title', 'url'
+        )
+
+
+class ArticleRevisionSerializer(serializers.ModelSerializer):
+    """Serializer for the ArticleRevision model.
+
+    The revision's body is not included since it has to be rebuilt
+    from the revision's stored changes.
+    """
+
+    class Meta:
+        fields = ('is_snapshot', 'number', 'time_created', 'title')
+        model = models.ArticleRevision
 
 
 class CategorySerializer(serializers.HyperlinkedModelSerializer):
@@ -48,3 +81,62 @@ class CategorySerializer(serializers.HyperlinkedModelSerializer):
         fields = ('id', 'parent', 'parent_id', 'title', 'url')
         model = models.Category
         read_only_fields = ('id', 'parent')
+
+    def validate_parent_id(self, value):
+        """Ensure the category can be moved to the parent.
+
+        The category can't be moved into its own subtree or nested more
+        than `Category.MAX_DEPTH` levels deep.
+        """
+        if value is None:
+            return value
+
+        if (self.instance is not None and
+                self.instance.creates_cycle(value.path)):
+            raise serializers.ValidationError(
+                "A category can't be moved into itself or one of its "
+                "subcategories.")
+
+        path = self.instance.path if self.instance is not None else None
+
+        if models.Category.is_too_deep(value.path, path):
+            raise serializers.ValidationError(
+                models.Category.get_max_depth_message())
+
+        return value
+
+
+class BulkArticleSerializer(serializers.ModelSerializer):
+    """Serializer for the article data in a bulk operation.
+
+    Unlike `ArticleSerializer`, the category is accepted as a plain
+    integer so the categories referenced by every operation in a batch
+    can be validated with a single query.
+    """
+    category_id = serializers.IntegerField(allow_null=True, required=False)
+
+    class Meta:
+        fields = ('body', 'category_id', 'time_published', 'title')
+        model = models.Article
+
+
+class BulkOperationSerializer(serializers.Serializer):
+    """Serializer for a single operation in a bulk request."""
+    action = serializers.ChoiceField(choices=('create', 'delete', 'update'))
+    data = serializers.DictField(required=False)
+    id = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        """Ensure the fields required by the operation are present."""
+        errors = {}
+
+        if attrs['action'] in ('delete', 'update') and 'id' not in attrs:
+            errors['id'] = ['This field is required.']
+
+        if attrs['action'] in ('create', 'update') and 'data' not in attrs:
+            errors['data'] = ['This field is required.']
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return attrs
@@ -0,0 +1,98 @@
+"""Utilities for streaming large exports of help center content."""
+
+import json
+import zlib
+
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def gzip_stream(chunks, level=6):
+    """Compress an iterable of byte strings into a gzip stream.
+
+    Args:
+        chunks:
+            An iterable of byte strings to compress.
+        level (int):
+            The compression level to use.
+
+    Yields:
+        bytes:
+            Pieces of a single gzip member. Empty pieces are skipped so
+            the stream only yields when there is data to send.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+
+        if data:
+            yield data
+
+    yield compressor.flush()
+
+
+def iterate_in_chunks(queryset, chunk_size):
+    """Iterate over a queryset in fixed size chunks.
+
+    Rows are fetched using keyset pagination on the primary key, so
+    each chunk is a separate, cheap, indexed query and at most
+    `chunk_size` instances are held in memory at once, regardless of
+    the database backend.
+
+    Args:
+        queryset:
+            The queryset to iterate over. Any existing ordering is
+            replaced with an ordering by primary key.
+        chunk_size (int):
+            The maximum number of rows to fetch per query.
+
+    Yields:
+        list:
+            Lists of model instances, each at most `chunk_size` long.
+    """
+    queryset = queryset.order_by('pk')
+    last_pk = None
+
+    while True:
+        chunk = queryset
+
+        if last_pk is not None:
+            chunk = chunk.filter(pk__gt=last_pk)
+
+        chunk = list(chunk[:chunk_size])
+
+        if not chunk:
+            return
+
+        yield chunk
+
+        if len(chunk) < chunk_size:
+            return
+
+        last_pk = chunk[-1].pk
+
+
+def ndjson_lines(queryset, serializer_class, context=None, chunk_size=500):
+    """Serialize a queryset as newline-delimited JSON.
+
+    Args:
+        queryset:
+            The queryset containing the instances to serialize.
+        serializer_class:
+            The serializer class used to represent each instance.
+        context (dict):
+            Extra context passed to the serializer.
+        chunk_size (int):
+            The number of instances to fetch and serialize at once.
+
+    Yields:
+        bytes:
+            One encoded chunk of lines for each chunk of instances.
+            Every line is a complete JSON document terminated by a
+            newline.
+    """
+    for chunk in iterate_in_chunks(queryset, chunk_size):
+        serializer = serializer_class(chunk, many=True, context=context)
+        lines = [json.dumps(item, cls=JSONEncoder) for item in serializer.data]
+
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
@@ -0,0 +1,264 @@
+from django.test import TestCase, skipIfDBFeature
+
+from helpcenter import cache, models
+from helpcenter.api.bulk import BulkArticleOperations
+from helpcenter.testing_utils import create_article, create_category
+
+
+class TestBulkArticleOperations(TestCase):
+    """Test cases for applying batches of article operations."""
+
+    def test_create(self):
+        """Test creating articles in bulk.
+
+        Each article should be created with a generated slug.
+        """
+        category = create_category()
+        operations = BulkArticleOperations([
+            {
+                'action': 'create',
+                'data': {'title': 'Foo Bar', 'body': 'Foo'},
+            },
+            {
+                'action': 'create',
+                'data': {
+                    'title': 'Baz',
+                    'body': 'Baz',
+                    'category_id': category.pk,
+                },
+            },
+        ])
+
+        self.assertTrue(operations.is_valid())
+
+        results = operations.save()
+        article = models.Article.objects.get(title='Foo Bar')
+        article2 = models.Article.objects.get(title='Baz')
+
+        self.assertEqual(
+            [('create', article.pk), ('create', article2.pk)],
+            [(result['action'], result['id']) for result in results])
+        self.assertEqual('foo-bar', article.slug)
+        self.assertEqual('Foo', article.body_html)
+        self.assertEqual(category, article2.category)
+
+    @skipIfDBFeature('can_return_ids_from_bulk_insert')
+    def test_create_saved(self):
+        """Test creating articles that can't be inserted in bulk.
+
+        The articles are saved one at a time, which already writes their
+        revisions and indexes, so they shouldn't be written again.
+        """
+        operations = BulkArticleOperations([
+            {
+                'action': 'create',
+                'data': {'title': 'Foo', 'body': 'Bar'},
+            },
+            {
+                'action': 'create',
+                'data': {'title': 'Baz', 'body': 'Qux'},
+            },
+        ])
+
+        self.assertTrue(operations.is_valid())
+
+        # Looking up used slugs, then for each article: checking its
+        # slug, inserting it, replacing its MinHash buckets and terms,
+        # and recording its revision, inside a savepoint
+        with self.assertNumQueries(19):
+            article = operations.save()[0]['instance']
+
+        self.assertEqual(1, article.revisions.count())
+        self.assertEqual(
+            ['bar', 'foo'],
+            sorted(article.terms.values_list('term', flat=True)))
+
+    def test_delete(self):
+        """Test deleting articles in bulk.
+
+        The articles should be removed from the database.
+        """
+        article = create_article()
+        article2 = create_article()
+        operations = BulkArticleOperations([
+            {'action': 'delete', 'id': article.pk},
+            {'action': 'delete', 'id': article2.pk},
+        ])
+
+        self.assertTrue(operations.is_valid())
+
+        results = operations.save()
+
+        self.assertEqual(0, models.Article.objects.count())
+        self.assertEqual(
+            [{'action': 'delete', 'id': article.pk, 'instance': None},
+             {'action': 'delete', 'id': article2.pk, 'instance': None}],
+            results)
+
+    def test_duplicate_target(self):
+        """Test performing multiple operations on the same article.
+
+        Only one operation per article should be allowed.
+        """
+        article = create_article()
+        operations = BulkArticleOperations([
+            {'action': 'update', 'id': article.pk, 'data': {'title': 'Foo'}},
+            {'action': 'delete', 'id': article.pk},
+        ])
+
+        self.assertFalse(operations.is_valid())
+        self.assertEqual({}, operations.errors[0])
+        self.assertIn('id', operations.errors[1])
+
+    def test_invalid_category(self):
+        """Test referencing a category that doesn't exist.
+
+        Every invalid category should be reported using a single query.
+        """
+        operations = BulkArticleOperations([
+            {
+                'action': 'create',
+                'data': {'title': 'Foo', 'body': 'Foo', 'category_id': 42},
+            },
+            {
+                'action': 'create',
+                'data': {'title': 'Bar', 'body': 'Bar', 'category_id': 43},
+            },
+        ])
+
+        with self.assertNumQueries(1):
+            self.assertFalse(operations.is_valid())
+
+        self.assertIn('category_id', operations.errors[0])
+        self.assertIn('category_id', operations.errors[1])
+        self.assertEqual(0, models.Article.objects.count())
+
+    def test_missing_target(self):
+        """Test modifying an article that doesn't exist.
+
+        An error should be reported for the operation.
+        """
+        operations = BulkArticleOperations([
+            {'action': 'delete', 'id': 42},
+        ])
+
+        self.assertFalse(operations.is_valid())
+        self.assertEqual({'id': ['Not found.']}, operations.errors[0])
+
+    def test_update(self):
+        """Test updating articles in bulk.
+
+        Each article should receive its own changes in a single query.
+        """
+        category = create_category()
+        article = create_article(title='Foo')
+        article2 = create_article(title='Bar')
+        operations = BulkArticleOperations([
+            {
+                'action': 'update',
+                'id': article.pk,
+                'data': {'category_id': category.pk},
+            },
+            {
+                'action': 'update',
+                'id': article2.pk,
+                'data': {'title': 'New Bar'},
+            },
+        ])
+
+        with self.assertNumQueries(2):
+            self.assertTrue(operations.is_valid())
+
+        operations.save()
+        article.refresh_from_db()
+        article2.refresh_from_db()
+
+        self.assertEqual(category, article.category)
+        self.assertEqual('Foo', article.title)
+        self.assertEqual('New Bar', article2.title)
+        self.assertIsNone(article2.category)
+
+    def test_update_title(self):
+        """Test renaming articles in bulk.
+
+        Each article's slug should follow its title without colliding,
+        and its old slug should be recorded.
+        """
+        article = create_article(title='Foo')
+        article2 = create_article(title='Bar')
+        operations = BulkArticleOperations([
+            {
+                'action': 'update',
+                'id': article.pk,
+                'data': {'title': 'Baz'},
+            },
+            {
+                'action': 'update',
+                'id': article2.pk,
+                'data': {'title': 'Baz'},
+            },
+        ])
+
+        self.assertTrue(operations.is_valid())
+
+        operations.save()
+        article.refresh_from_db()
+        article2.refresh_from_db()
+
+        self.assertEqual('baz', article.slug)
+        self.assertEqual('baz-2', article2.slug)
+        self.assertEqual(
+            ['bar', 'foo'],
+            sorted(models.SlugHistory.objects.values_list('slug', flat=True)))
+
+    def test_update_body(self):
+        """Test updating the body of articles in bulk.
+
+        The fields derived from the body and the article's terms should
+        be updated as well.
+        """
+        article = create_article(body='Old')
+        operations = BulkArticleOperations([
+            {
+                'action': 'update',
+                'id': article.pk,
+                'data': {'body': '<p>New body<script>x</script></p>'},
+            },
+        ])
+
+        self.assertTrue(operations.is_valid())
+
+        operations.save()
+        article.refresh_from_db()
+
+        self.assertEqual('<p>New body</p>', article.body_html)
+        self.assertEqual('New body', article.excerpt)
+        self.assertEqual(2, article.word_count)
+
+        terms = set(article.terms.values_list('term', flat=True))
+
+        self.assertIn('new', terms)
+        self.assertNotIn('old', terms)
+
+    def test_update_time_published(self):
+        """Test rescheduling articles in bulk.
+
+        The vocabulary of published articles should be invalidated,
+        even though the articles' terms don't change.
+        """
+        article = create_article()
+        operations = BulkArticleOperations([
+            {
+                'action': 'update',
+                'id': article.pk,
+                'data': {'time_published': '2100-01-01T00:00:00Z'},
+            },
+        ])
+        generation = cache.get_generation(cache.TERMS_GENERATION_KEY)
+
+        self.assertTrue(operations.is_valid())
+
+        operations.save()
+
+        self.assertEqual(
+            generation + 1, cache.get_generation(cache.TERMS_GENERATION_KEY))
@@ -46,13 +46,19 @@ class TestArticleSerializer(TestCase):
 
         expected_dict = {
             'body': article.body,
+            'body_html': article.body_html,
             'category': article.category,
             'category_id': None,
+            'excerpt': article.excerpt,
             'url': full_url('help:api:article-detail',
                             kwargs={'pk': article.pk}),
             'id': article.id,
+            'reading_time': article.reading_time,
+            'table_of_contents': [],
             'time_published': article.time_published.isoformat(),
             'title': article.title,
+            'view_count': article.view_count,
+            'word_count': article.word_count,
         }
         expected = json.dumps(expected_dict)
 
@@ -75,11 +81,17 @@ class TestArticleSerializer(TestCase):
                 'helpcenter:helpcenter-api:category-detail',
                 kwargs={'pk': category.pk}),
             'category_id': article.category.id,
+            'body_html': article.body_html,
+            'excerpt': article.excerpt,
             'id': article.id,
+            'reading_time': article.reading_time,
+            'table_of_contents': [],
             'time_published': article.time_published.isoformat(),
             'title': article.title,
             'url': full_url('help:api:article-detail',
                             kwargs={'pk': article.pk}),
+            'view_count': article.view_count,
+            'word_count': article.word_count,
         }
         expected = json.dumps(expected_dict)
 
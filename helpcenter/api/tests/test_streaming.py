@@ -0,0 +1,90 @@
+import zlib
+
+from django.test import TestCase
+
+from helpcenter import models
+from helpcenter.api import serializers, streaming
+from helpcenter.testing_utils import create_article
+
+
+class TestGzipStream(TestCase):
+    """Test cases for compressing a stream with gzip."""
+
+    def test_compress(self):
+        """Test compressing multiple chunks.
+
+        The chunks should be compressed into a single gzip member that
+        decompresses to the concatenated input.
+        """
+        chunks = [b'foo\n', b'bar\n', b'baz\n']
+
+        compressed = b''.join(streaming.gzip_stream(chunks))
+
+        self.assertEqual(
+            b''.join(chunks),
+            zlib.decompress(compressed, 16 + zlib.MAX_WBITS))
+
+
+class TestIterateInChunks(TestCase):
+    """Test cases for iterating over a queryset in chunks."""
+
+    def test_chunks(self):
+        """Test iterating over a queryset.
+
+        Every instance should be returned exactly once, in order of
+        primary key, in chunks no larger than the chunk size.
+        """
+        articles = [create_article(title=str(i)) for i in range(5)]
+
+        chunks = list(streaming.iterate_in_chunks(
+            models.Article.objects.all(), 2))
+
+        self.assertEqual([2, 2, 1], [len(chunk) for chunk in chunks])
+        self.assertEqual(
+            articles, [article for chunk in chunks for article in chunk])
+
+    def test_empty(self):
+        """Test iterating over an empty queryset.
+
+        No chunks should be produced.
+        """
+        chunks = streaming.iterate_in_chunks(models.Article.objects.all(), 2)
+
+        self.assertEqual([], list(chunks))
+
+    def test_exact_multiple(self):
+        """Test a queryset whose size is a multiple of the chunk size.
+
+        Iteration should stop once a chunk comes back empty.
+        """
+        for i in range(4):
+            create_article(title=str(i))
+
+        with self.assertNumQueries(3):
+            chunks = list(streaming.iterate_in_chunks(
+                models.Article.objects.all(), 2))
+
+        self.assertEqual([2, 2], [len(chunk) for chunk in chunks])
+
+
+class TestNDJSONLines(TestCase):
+    """Test cases for serializing a queryset as NDJSON."""
+
+    def test_lines(self):
+        """Test serializing articles.
+
+        Each article should be serialized on its own line.
+        """
+        create_article(title='Foo')
+        create_article(title='Bar')
+
+        content = b''.join(streaming.ndjson_lines(
+            models.Article.objects.all(),
+            serializers.ArticleSerializer,
+            context={'request': None},
+            chunk_size=1))
+        lines = content.decode('utf-8').splitlines()
+
+        self.assertEqual(2, len(lines))
+        self.assertIn('"title": "Foo"', lines[0])
+        self.assertIn('"title": "Bar"', lines[1])
@@ -1,14 +1,19 @@
 import json
+import zlib
+from datetime import timedelta
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Permission
 from django.core.urlresolvers import reverse
+from django.test import override_settings
+from django.utils import timezone
 
 from rest_framework.test import APIRequestFactory, APITestCase
 
-from helpcenter import models
+from helpcenter import cache, models, rankings, viewcounts
 from helpcenter.api import serializers
-from helpcenter.testing_utils import create_article, create_category
+from helpcenter.testing_utils import (
+    QueryBudgetTestMixin, create_article, create_category)
 
 
 def attach_permission(user, permission_name):
@@ -38,7 +43,7 @@ class AuthMixin:
         self.client.login(username=u, password=p)
 
 
-class TestArticleViewSet(AuthMixin, APITestCase):
+class TestArticleViewSet(AuthMixin, QueryBudgetTestMixin, APITestCase):
     """ Test cases for the article view set """
     factory = APIRequestFactory()
 
@@ -47,6 +52,116 @@ class TestArticleViewSet(AuthMixin, APITestCase):
         """ Create a request for the given view """
         return TestArticleViewSet.factory.get(reverse(viewname, kwargs=kwargs))
 
+    def test_bulk(self):
+        """Test applying a batch of operations.
+
+        A POST request to the bulk view should apply every operation
+        and return a result for each one.
+        """
+        attach_permission(self.user, 'add_article')
+        attach_permission(self.user, 'change_article')
+        attach_permission(self.user, 'delete_article')
+        self.login()
+
+        article = create_article(title='Foo')
+        article2 = create_article(title='Bar')
+        data = [
+            {'action': 'create', 'data': {'title': 'Baz', 'body': 'Baz'}},
+            {'action': 'update', 'id': article.pk, 'data': {'title': 'Qux'}},
+            {'action': 'delete', 'id': article2.pk},
+        ]
+
+        url = reverse('helpcenter:helpcenter-api:article-bulk')
+        response = self.client.post(url, data, format='json')
+        created = models.Article.objects.get(title='Baz')
+
+        self.assertEqual(200, response.status_code, msg=response.data)
+        self.assertEqual(
+            ['create', 'update', 'delete'],
+            [result['action'] for result in response.data])
+        self.assertEqual(created.pk, response.data[0]['article']['id'])
+        self.assertEqual('Qux', response.data[1]['article']['title'])
+        self.assertEqual(
+            ['Baz', 'Qux'],
+            sorted(models.Article.objects.values_list('title', flat=True)))
+
+    def test_bulk_invalid(self):
+        """Test submitting a batch containing an invalid operation.
+
+        If any operation is invalid, none of the operations should be
+        applied.
+        """
+        attach_permission(self.user, 'add_article')
+        self.login()
+
+        data = [
+            {'action': 'create', 'data': {'title': 'Foo', 'body': 'Foo'}},
+            {'action': 'create', 'data': {'title': 'Bar'}},
+        ]
+
+        url = reverse('helpcenter:helpcenter-api:article-bulk')
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(400, response.status_code)
+        self.assertEqual({}, response.data[0])
+        self.assertIn('body', response.data[1]['data'])
+        self.assertEqual(0, models.Article.objects.count())
+
+    def test_bulk_missing_permission(self):
+        """Test submitting operations the user isn't allowed to apply.
+
+        The user needs the permissions for every type of operation in
+        the batch.
+        """
+        attach_permission(self.user, 'add_article')
+        self.login()
+
+        article = create_article()
+        data = [
+            {'action': 'create', 'data': {'title': 'Foo', 'body': 'Foo'}},
+            {'action': 'delete', 'id': article.pk},
+        ]
+
+        url = reverse('helpcenter:helpcenter-api:article-bulk')
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(403, response.status_code)
+        self.assertEqual(1, models.Article.objects.count())
+
+    @override_settings(HELPCENTER_BULK_MAX_OPERATIONS=1)
+    def test_bulk_too_many_operations(self):
+        """Test submitting more operations than are allowed.
+
+        The request should be rejected without applying anything.
+        """
+        attach_permission(self.user, 'add_article')
+        self.login()
+
+        data = [
+            {'action': 'create', 'data': {'title': 'Foo', 'body': 'Foo'}},
+            {'action': 'create', 'data': {'title': 'Bar', 'body': 'Bar'}},
+        ]
+
+        url = reverse('helpcenter:helpcenter-api:article-bulk')
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(400, response.status_code)
+        self.assertEqual(0, models.Article.objects.count())
+
+    def test_bulk_unauthenticated(self):
+        """Test submitting operations while unauthenticated.
+
+        Unauthenticated users should not be able to use the bulk view.
+        """
+        data = [
+            {'action': 'create', 'data': {'title': 'Foo', 'body': 'Foo'}},
+        ]
+
+        url = reverse('helpcenter:helpcenter-api:article-bulk')
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(403, response.status_code)
+
     def test_create(self):
         """ Test creating an article.
 
@@ -135,11 +250,89 @@ class TestArticleViewSet(AuthMixin, APITestCase):
         self.assertEqual(200, response.status_code)
         self.assertEqual(serializer.data, response.data)
 
+    def test_diff(self):
+        """Test getting the diff between two revisions of an article.
+
+        By default, the latest revision should be compared to the one
+        before it.
+        """
+        attach_permission(self.user, 'change_article')
+        self.login()
+
+        article = create_article(body='Old\n')
+        article.body = 'New\n'
+        article.save()
+
+        url = reverse(
+            'helpcenter:helpcenter-api:article-diff',
+            kwargs={'pk': article.pk})
+        response = self.client.get(url)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(1, response.data['from'])
+        self.assertEqual(2, response.data['to'])
+        self.assertIn('-Old\n+New\n', response.data['diff'])
+
+    def test_diff_missing_revision(self):
+        """Test getting a diff with a revision that doesn't exist."""
+        attach_permission(self.user, 'change_article')
+        self.login()
+
+        article = create_article()
+        url = reverse(
+            'helpcenter:helpcenter-api:article-diff',
+            kwargs={'pk': article.pk})
+        response = self.client.get(url, {'from': 1, 'to': 5})
+
+        self.assertEqual(404, response.status_code)
+
+    def test_export(self):
+        """Test exporting articles as newline-delimited JSON.
+
+        The export view should stream one serialized article per line.
+        """
+        article = create_article()
+        article2 = create_article(title='Test Article 2')
+        context = {
+            'request': self._get_request(
+                'helpcenter:helpcenter-api:article-list')
+        }
+        serializer = serializers.ArticleSerializer(
+            [article, article2], many=True, context=context)
+
+        url = reverse('helpcenter:helpcenter-api:article-export')
+        response = self.client.get(url)
+        content = b''.join(response.streaming_content).decode('utf-8')
+        lines = content.splitlines()
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('application/x-ndjson', response['Content-Type'])
+        self.assertEqual(
+            json.loads(json.dumps(serializer.data)),
+            [json.loads(line) for line in lines])
+
+    def test_export_gzip(self):
+        """Test exporting articles with gzip compression.
+
+        If the 'compress' parameter is 'gzip', the response should be
+        gzip encoded.
+        """
+        create_article()
+
+        url = reverse('helpcenter:helpcenter-api:article-export')
+        response = self.client.get(url, {'compress': 'gzip'})
+        content = zlib.decompress(
+            b''.join(response.streaming_content), 16 + zlib.MAX_WBITS)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('gzip', response['Content-Encoding'])
+        self.assertEqual(1, len(content.decode('utf-8').splitlines()))
+
     def test_list(self):
         """ Test getting a list of articles.
 
         A GET request to the 'article-list' url should return a
-        serialized list of articles.
+        serialized list of articles without their bodies, newest first.
         """
         article = create_article()
         article2 = create_article(title='Test Article 2')
@@ -147,8 +340,8 @@ class TestArticleViewSet(AuthMixin, APITestCase):
             'request': self._get_request(
                 'helpcenter:helpcenter-api:article-list')
         }
-        serializer = serializers.ArticleSerializer(
-            [article, article2], many=True, context=context)
+        serializer = serializers.ArticleListSerializer(
+            [article2, article], many=True, context=context)
 
         url = reverse('helpcenter:helpcenter-api:article-list')
         response = self.client.get(url)
@@ -156,6 +349,89 @@ class TestArticleViewSet(AuthMixin, APITestCase):
         self.assertEqual(200, response.status_code)
         self.assertEqual(serializer.data, response.data)
 
+    def test_list_scheduled(self):
+        """Test listing articles that are scheduled to be published.
+
+        Scheduled articles should only be listed for users who can
+        change articles.
+        """
+        article = create_article(
+            time_published=timezone.now() + timedelta(hours=1))
+        url = reverse('helpcenter:helpcenter-api:article-list')
+
+        response = self.client.get(url)
+
+        self.assertEqual([], response.data)
+
+        attach_permission(self.user, 'change_article')
+        self.login()
+
+        response = self.client.get(url)
+
+        self.assertEqual([article.pk], [a['id'] for a in response.data])
+
+    def test_list_query_budget(self):
+        """Test the number of queries made by the list view.
+
+        Listing articles should stay within the view's query budget no
+        matter how many articles there are.
+        """
+        category = create_category()
+
+        for i in range(5):
+            create_article(title=str(i), category=category)
+
+        url = reverse('helpcenter:helpcenter-api:article-list')
+        self.assertWithinQueryBudget(self.client.get, url)
+
+    def test_popular(self):
+        """Test getting the popular and trending articles.
+
+        The precomputed rankings of the requested category should be
+        returned.
+        """
+        cache.get_cache().clear()
+        category = create_category()
+        article = create_article(category=category)
+        other = create_article(title='Other')
+
+        for ranked in (article, other):
+            models.ArticleViewDay.objects.create(
+                article=ranked, day=viewcounts.get_today(), views=1)
+
+        rankings.compute_rankings()
+
+        url = reverse('helpcenter:helpcenter-api:article-popular')
+        response = self.client.get(url, {'category': category.pk})
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            [article.pk], [a['id'] for a in response.data['popular']])
+        self.assertEqual(
+            [article.pk], [a['id'] for a in response.data['trending']])
+
+    def test_popular_invalid_category(self):
+        """Test getting the rankings of an invalid category."""
+        url = reverse('helpcenter:helpcenter-api:article-popular')
+        response = self.client.get(url, {'category': 'foo'})
+
+        self.assertEqual(400, response.status_code)
+
+    def test_popular_query_budget(self):
+        """Test the number of queries made getting the rankings."""
+        cache.get_cache().clear()
+
+        for i in range(5):
+            models.ArticleViewDay.objects.create(
+                article=create_article(title=str(i)),
+                day=viewcounts.get_today(),
+                views=i + 1)
+
+        rankings.compute_rankings()
+
+        url = reverse('helpcenter:helpcenter-api:article-popular')
+        self.assertWithinQueryBudget(self.client.get, url)
+
     def test_patch(self):
         """ Test partially updating an article.
 
@@ -194,6 +470,65 @@ class TestArticleViewSet(AuthMixin, APITestCase):
 
         self.assertEqual(403, response.status_code)
 
+    def test_revision(self):
+        """Test getting a single revision of an article.
+
+        The revision should include the article's body at the time.
+        """
+        attach_permission(self.user, 'change_article')
+        self.login()
+
+        article = create_article(body='Old')
+        article.body = 'New'
+        article.save()
+
+        url = reverse(
+            'helpcenter:helpcenter-api:article-revision',
+            kwargs={'pk': article.pk, 'number': 1})
+        response = self.client.get(url)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(1, response.data['number'])
+        self.assertEqual('Old', response.data['body'])
+
+    def test_revision_list(self):
+        """Test listing the revisions of an article.
+
+        The revisions should be listed newest first.
+        """
+        attach_permission(self.user, 'change_article')
+        self.login()
+
+        article = create_article(title='Old')
+        article.title = 'New'
+        article.save()
+
+        url = reverse(
+            'helpcenter:helpcenter-api:article-revisions',
+            kwargs={'pk': article.pk})
+        response = self.client.get(url)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            [(2, 'New'), (1, 'Old')],
+            [(rev['number'], rev['title']) for rev in response.data])
+
+    def test_revision_list_without_permission(self):
+        """Test listing revisions without permission to edit articles.
+
+        Revisions may contain unpublished content, so only users who
+        can change articles should see them.
+        """
+        self.login()
+
+        article = create_article()
+        url = reverse(
+            'helpcenter:helpcenter-api:article-revisions',
+            kwargs={'pk': article.pk})
+        response = self.client.get(url)
+
+        self.assertEqual(403, response.status_code)
+
     def test_update(self):
         """ Test updating an article.
 
@@ -237,7 +572,7 @@ class TestArticleViewSet(AuthMixin, APITestCase):
         self.assertEqual(403, response.status_code)
 
 
-class TestCategoryViewSet(AuthMixin, APITestCase):
+class TestCategoryViewSet(AuthMixin, QueryBudgetTestMixin, APITestCase):
     """ Test cases for the category view set """
     factory = APIRequestFactory()
 
@@ -247,6 +582,24 @@ class TestCategoryViewSet(AuthMixin, APITestCase):
         return TestCategoryViewSet.factory.get(
             reverse(viewname, kwargs=kwargs))
 
+    def test_autocomplete(self):
+        """Test autocompleting a category.
+
+        Categories whose title starts with the query should be returned
+        with their labels, within the view's query budget.
+        """
+        parent = create_category(title='Account')
+        category = create_category(title='Passwords', parent=parent)
+        url = reverse('helpcenter:helpcenter-api:category-autocomplete')
+
+        response = self.assertWithinQueryBudget(
+            self.client.get, url, {'q': 'pass'})
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            [{'id': category.pk, 'label': 'Account > Passwords'}],
+            response.data)
+
     def test_create(self):
         """ Test creating a category.
 
@@ -354,6 +707,20 @@ class TestCategoryViewSet(AuthMixin, APITestCase):
         self.assertEqual(200, response.status_code)
         self.assertEqual(serializer.data, response.data)
 
+    def test_list_query_budget(self):
+        """Test the number of queries made by the list view.
+
+        Listing categories with parents should stay within the view's
+        query budget no matter how many categories there are.
+        """
+        parent = create_category()
+
+        for i in range(5):
+            create_category(title=str(i), parent=parent)
+
+        url = reverse('helpcenter:helpcenter-api:category-list')
+        self.assertWithinQueryBudget(self.client.get, url)
+
     def test_patch(self):
         """ Test partially updating a category.
 
@@ -375,6 +742,28 @@ class TestCategoryViewSet(AuthMixin, APITestCase):
         self.assertEqual(200, response.status_code)
         self.assertEqual(data['title'], models.Category.objects.get().title)
 
+    def test_patch_into_subcategory(self):
+        """Test moving a category into one of its subcategories.
+
+        The request should be rejected, and the category should not
+        move.
+        """
+        attach_permission(self.user, 'change_category')
+        self.login()
+
+        category = create_category()
+        child = create_category(title='Child', parent=category)
+
+        url = reverse('helpcenter:helpcenter-api:category-detail',
+                      kwargs={'pk': category.pk})
+        response = self.client.patch(url, {'parent_id': child.pk})
+
+        category.refresh_from_db()
+
+        self.assertEqual(400, response.status_code)
+        self.assertIn('parent_id', response.data)
+        self.assertIsNone(category.parent)
+
     def test_patch_unauthenticated(self):
         """ Test partially updating a category while not authenticated.
 
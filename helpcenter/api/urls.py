@@ -13,6 +13,9 @@ router.register(r'categories', views.CategoryViewSet)
 app_name = 'helpcenter-api'
 
 urlpatterns = [
+    url(r'^articles/(?P<pk>[^/.]+)/revisions/(?P<number>[0-9]+)/$',
+        views.ArticleViewSet.as_view({'get': 'revision'}),
+        name='article-revision'),
     url(r'^permissions/$', views.PermissionsView.as_view(),
         name='permissions'),
     url(r'^', include(router.urls)),
@@ -1,30 +1,325 @@
-from rest_framework import permissions, viewsets
+from django.conf import settings
+from django.db.models import Max
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import detail_route, list_route
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from helpcenter import models
-from helpcenter.api import serializers
+from helpcenter import categories, models, rankings, revisions
+from helpcenter.mixins import (
+    InstrumentedViewMixin, ProfilingMixin, ViewCountMixin)
+from helpcenter.api import bulk, serializers, streaming
 
 
-class ArticleViewSet(viewsets.ModelViewSet):
+class ArticleViewSet(ProfilingMixin, InstrumentedViewMixin, ViewCountMixin,
+                     viewsets.ModelViewSet):
     """ View set for the Article model """
     permission_classes = (
         permissions.DjangoModelPermissionsOrAnonReadOnly,
     )
+    query_budget = {
+        'bulk': 20,
+        'create': 13,
+        'destroy': 13,
+        'diff': 6,
+        'export': 6,
+        'list': 5,
+        'partial_update': 18,
+        'popular': 4,
+        'retrieve': 5,
+        'revision': 4,
+        'revision_list': 4,
+        'update': 18,
+    }
     queryset = models.Article.objects.all()
     serializer_class = serializers.ArticleSerializer
 
+    # Maps bulk actions to the permissions they require
+    bulk_permissions = {
+        'create': 'add',
+        'delete': 'delete',
+        'update': 'change',
+    }
+
+    def get_queryset(self):
+        """Get the articles for the current action.
+
+        Drafts and scheduled articles are only included for users
+        who can change articles, and listings only load the fields they
+        display.
+        """
+        queryset = super(ArticleViewSet, self).get_queryset().visible_to(
+            self.request.user)
+
+        if self.action == 'list':
+            return queryset.for_listing()
+
+        return queryset
+
+    def get_serializer_class(self):
+        """Get the serializer for the current action.
+
+        Listings leave out the article's body.
+        """
+        if self.action == 'list':
+            return serializers.ArticleListSerializer
+
+        return super(ArticleViewSet, self).get_serializer_class()
+
+    def retrieve(self, request, *args, **kwargs):
+        """Get an article, counting the view."""
+        response = super(ArticleViewSet, self).retrieve(
+            request, *args, **kwargs)
+        response.viewed_article_pk = response.data['id']
+
+        return response
+
+    @list_route(methods=['post'],
+                permission_classes=(permissions.IsAuthenticated,))
+    def bulk(self, request, *args, **kwargs):
+        """Apply a batch of create, update, and delete operations.
+
+        The request body is a list of operations, each of which has an
+        'action' of 'create', 'update', or 'delete'. Updates and
+        deletes identify their article with an 'id', and creates and
+        updates provide the article's fields in 'data'.
+
+        Either every operation is applied in a single transaction, or
+        none are and a list of errors for each operation is returned.
+        At most `HELPCENTER_BULK_MAX_OPERATIONS` operations may be
+        sent in one request.
+        """
+        max_operations = getattr(
+            settings, 'HELPCENTER_BULK_MAX_OPERATIONS', 100)
+
+        if (isinstance(request.data, list) and
+                len(request.data) > max_operations):
+            return Response(
+                {'detail': 'At most {} operations may be sent at once.'.format(
+                    max_operations)},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = serializers.BulkOperationSerializer(
+            data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        required_perms = set(
+            'helpcenter.{}_article'.format(self.bulk_permissions[op['action']])
+            for op in serializer.validated_data)
+
+        if not request.user.has_perms(required_perms):
+            self.permission_denied(request)
+
+        operations = bulk.BulkArticleOperations(serializer.validated_data)
+
+        if not operations.is_valid():
+            return Response(
+                operations.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        context = self.get_serializer_context()
+        results = []
+
+        for result in operations.save():
+            instance = result.pop('instance')
+
+            if instance is not None:
+                result['article'] = self.get_serializer_class()(
+                    instance, context=context).data
+
+            results.append(result)
+
+        return Response(results)
+
+    @list_route(methods=['get'])
+    def export(self, request, *args, **kwargs):
+        """Stream every article as newline-delimited JSON.
+
+        Articles are read from the database in chunks of
+        `HELPCENTER_EXPORT_CHUNK_SIZE` and written to the client as
+        they are serialized, so memory usage doesn't depend on the
+        number of articles. Passing `?compress=gzip` compresses the
+        stream with gzip.
+
+        Passing an ISO 8601 timestamp as `?edited_since` only exports
+        the published articles edited after that time.
+        """
+        chunk_size = getattr(settings, 'HELPCENTER_EXPORT_CHUNK_SIZE', 500)
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if 'edited_since' in request.query_params:
+            edited_since = parse_datetime(
+                request.query_params['edited_since'])
+
+            if edited_since is None:
+                return Response(
+                    {'detail': 'edited_since must be an ISO 8601 timestamp.'},
+                    status=status.HTTP_400_BAD_REQUEST)
+
+            if settings.USE_TZ and timezone.is_naive(edited_since):
+                edited_since = timezone.make_aware(edited_since)
+            elif not settings.USE_TZ and timezone.is_aware(edited_since):
+                edited_since = timezone.make_naive(edited_since)
+
+            queryset = queryset.edited_since(edited_since)
 
-class CategoryViewSet(viewsets.ModelViewSet):
+        content = streaming.ndjson_lines(
+            queryset,
+            self.get_serializer_class(),
+            context=self.get_serializer_context(),
+            chunk_size=chunk_size)
+
+        compress = request.query_params.get('compress') == 'gzip'
+
+        if compress:
+            content = streaming.gzip_stream(content)
+
+        response = StreamingHttpResponse(
+            content, content_type='application/x-ndjson')
+
+        if compress:
+            response['Content-Encoding'] = 'gzip'
+
+        return response
+
+    @list_route(methods=['get'])
+    def popular(self, request, *args, **kwargs):
+        """Get the popular and trending articles.
+
+        The rankings are precomputed by the ``computerankings``
+        management command. Passing a category's id as `?category` gets
+        the rankings of the articles in that category and its
+        descendants.
+        """
+        category_id = request.query_params.get('category')
+
+        if category_id is not None:
+            try:
+                category_id = int(category_id)
+            except ValueError:
+                return Response(
+                    {'detail': 'category must be an integer.'},
+                    status=status.HTTP_400_BAD_REQUEST)
+
+        context = self.get_serializer_context()
+        data = dict(
+            (kind, serializers.ArticleListSerializer(
+                articles, context=context, many=True).data)
+            for kind, articles in rankings.get_ranked_articles(
+                category_id).items())
+
+        return Response(data)
+
+    @detail_route(methods=['get'])
+    def diff(self, request, *args, **kwargs):
+        """Get a unified diff between two revisions of an article.
+
+        The revisions are given by the 'from' and 'to' query
+        parameters. By default, the latest revision is compared to the
+        one before it.
+        """
+        article = self.get_object()
+        self._check_revision_permissions(request)
+
+        latest = article.revisions.aggregate(Max('number'))['number__max']
+
+        try:
+            new_number = int(request.query_params.get('to', latest or 0))
+            old_number = int(request.query_params.get('from', new_number - 1))
+        except ValueError:
+            return Response(
+                {'detail': 'Revision numbers must be integers.'},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            old, old_body = revisions.get_revision(article, old_number)
+            new, new_body = revisions.get_revision(article, new_number)
+        except models.ArticleRevision.DoesNotExist:
+            raise Http404
+
+        return Response({
+            'diff': revisions.make_diff(
+                old_body, new_body,
+                'revision {}'.format(old.number),
+                'revision {}'.format(new.number)),
+            'from': old.number,
+            'to': new.number,
+        })
+
+    def revision(self, request, number, *args, **kwargs):
+        """Get a single revision of an article, including its body.
+
+        Routers can't generate the URL for this action since it takes
+        an extra argument, so it is routed in `helpcenter.api.urls`.
+        """
+        article = self.get_object()
+        self._check_revision_permissions(request)
+
+        try:
+            revision, body = revisions.get_revision(article, int(number))
+        except models.ArticleRevision.DoesNotExist:
+            raise Http404
+
+        data = serializers.ArticleRevisionSerializer(revision).data
+        data['body'] = body
+
+        return Response(data)
+
+    @detail_route(methods=['get'], url_path='revisions')
+    def revision_list(self, request, *args, **kwargs):
+        """List the revisions of an article, newest first."""
+        article = self.get_object()
+        self._check_revision_permissions(request)
+
+        queryset = article.revisions.defer('data').order_by('-number')
+        serializer = serializers.ArticleRevisionSerializer(
+            queryset, many=True)
+
+        return Response(serializer.data)
+
+    def _check_revision_permissions(self, request):
+        """Only allow users who can change articles to see revisions.
+
+        Revisions may contain content that was never published.
+        """
+        if not request.user.has_perm('helpcenter.change_article'):
+            self.permission_denied(request)
+
+
+class CategoryViewSet(ProfilingMixin, InstrumentedViewMixin,
+                      viewsets.ModelViewSet):
     """ View set for the Category model """
     permission_classes = (
         permissions.DjangoModelPermissionsOrAnonReadOnly,
     )
-    queryset = models.Category.objects.all()
+    query_budget = {
+        'autocomplete': 3,
+        'create': 11,
+        'destroy': 18,
+        'list': 3,
+        'partial_update': 11,
+        'retrieve': 3,
+        'update': 11,
+    }
+    queryset = models.Category.objects.select_related('parent')
     serializer_class = serializers.CategorySerializer
 
+    @list_route(methods=['get'])
+    def autocomplete(self, request, *args, **kwargs):
+        """Find the categories whose title starts with a query.
+
+        The beginning of the title is passed as `?q`. Each category is
+        returned with its `id` and `label`. See
+        `helpcenter.categories.autocomplete`.
+        """
+        return Response(
+            categories.autocomplete(request.query_params.get('q', '')))
+
 
-class PermissionsView(APIView):
+class PermissionsView(ProfilingMixin, InstrumentedViewMixin, APIView):
     """ View for user permissions in the help center """
     permission_classes = (permissions.IsAuthenticated,)
     permissions_to_check = [
@@ -35,6 +330,7 @@ class PermissionsView(APIView):
         'delete_article',
         'delete_category',
     ]
+    query_budget = 4
 
     def get(self, request, *args, **kwargs):
         """ Handle GET requests """
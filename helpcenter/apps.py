@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class HelpcenterConfig(AppConfig):
+    """Configuration for the helpcenter app."""
+    name = 'helpcenter'
+    verbose_name = 'Help Center'
+
+    def ready(self):
+        """Connect the app's signal handlers."""
+        from helpcenter import signals  # noqa
@@ -0,0 +1,117 @@
+"""Changing articles in bulk.
+
+Each change is made with a single update of every selected article,
+instead of saving the articles one at a time, and cached content is
+only invalidated once, after the transaction making the change ends.
+The updates don't send any signals, so only fields that the articles'
+revisions and indexes don't depend on are changed.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from helpcenter import cache, models, routers, slugs
+
+
+def move_articles(articles, category_id):
+    """Move articles to another category.
+
+    Articles whose slugs are already used in the category are given new
+    slugs, and their previous slugs are recorded so old links are
+    redirected.
+
+    Args:
+        articles:
+            A queryset of the articles to move.
+        category_id (int):
+            The id of the category to move the articles to, or None to
+            make them top level articles.
+
+    Returns:
+        int:
+            The number of articles moved.
+    """
+    using = articles.db
+    all_articles = models.Article.objects.using(using)
+
+    with transaction.atomic(using=using):
+        previous = list(articles.exclude(category=category_id).order_by(
+        ).values_list('pk', 'category', 'slug'))
+
+        if not previous:
+            return 0
+
+        moving = all_articles.filter(pk__in=[pk for pk, _, _ in previous])
+        new_slugs = slugs.rename_conflicts(
+            moving, all_articles.filter(category=category_id))
+        moving.update(category=category_id, time_edited=timezone.now())
+
+        models.SlugHistory.record([
+            (models.Article(pk=pk, category_id=category_id,
+                            slug=new_slugs.get(pk, slug)),
+             old_category_id, slug)
+            for pk, old_category_id, slug in previous], using=using)
+
+    cache.invalidate(using=using)
+    routers.record_write()
+
+    return len(previous)
+
+
+def publish_articles(articles, now=None):
+    """Publish draft articles.
+
+    Like saving a draft as a normal article, the articles' publish time
+    is set to the current time.
+
+    Args:
+        articles:
+            A queryset of the articles to publish. Articles that aren't
+            drafts are left unchanged.
+        now (datetime):
+            The time the articles are published. Defaults to the current
+            time.
+
+    Returns:
+        int:
+            The number of articles published.
+    """
+    using = articles.db
+    now = now or timezone.now()
+
+    with transaction.atomic(using=using):
+        count = articles.filter(draft=True).update(
+            draft=False, time_edited=now, time_published=now)
+
+    if count:
+        cache.invalidate(using=using)
+        cache.invalidate_terms(using=using)
+        routers.record_write()
+
+    return count
+
+
+def unpublish_articles(articles):
+    """Turn articles back into drafts.
+
+    Args:
+        articles:
+            A queryset of the articles to unpublish. Articles that are
+            already drafts are left unchanged.
+
+    Returns:
+        int:
+            The number of articles unpublished.
+    """
+    using = articles.db
+
+    with transaction.atomic(using=using):
+        count = articles.filter(draft=False).update(
+            draft=True, time_edited=timezone.now())
+
+    if count:
+        cache.invalidate(using=using)
+        cache.invalidate_terms(using=using)
+        routers.record_write()
+
+    return count
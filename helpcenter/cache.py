@@ -0,0 +1,262 @@
+"""Caching of help center content.
+
+Cached content is keyed by a generation number that is incremented
+whenever an article or category changes. Rather than tracking down
+every cached value that could be affected by a change, bumping the
+generation makes all the old values unreachable, and they eventually
+expire on their own.
+
+Changes made inside `batch_invalidation` only bump the generation once,
+when the batch ends.
+
+If the generation is bumped inside a database transaction, content
+read by other requests before the transaction commits could be cached
+under the new generation. The generation is bumped again once the
+transaction commits, so that content is never served afterwards. This
+second bump requires Django 1.9 or newer.
+
+The vocabulary of published articles used by searches is expensive to
+rebuild and rarely changes, so it is keyed by a separate terms
+generation. It is only bumped by `invalidate_terms`, when the terms of
+articles are indexed or articles are published, unpublished, or
+deleted.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from helpcenter import models
+
+
+GENERATION_KEY = 'helpcenter:generation'
+
+TERMS_GENERATION_KEY = 'helpcenter:terms-generation'
+
+# Cached in place of the next publish time if nothing is scheduled
+NOTHING_SCHEDULED = 'nothing-scheduled'
+
+
+_state = threading.local()
+
+
+@contextmanager
+def batch_invalidation():
+    """Invalidate cached content once for every change in the context.
+
+    Calls to `invalidate` inside the context are deferred until the
+    outermost batch ends, so a bulk change to many articles or
+    categories only bumps the generation once. To only bump it after
+    the changes are committed, the batch should be started outside of
+    the transaction making them.
+    """
+    _state.batches = getattr(_state, 'batches', 0) + 1
+
+    try:
+        yield
+    finally:
+        _state.batches -= 1
+
+        if not _state.batches and getattr(_state, 'pending', None):
+            pending, _state.pending = _state.pending, None
+            _bump_after_commit(pending)
+
+
+def _bump_after_commit(databases, key=GENERATION_KEY):
+    """Bump the generation now and after the current transactions commit.
+
+    Args:
+        databases (set):
+            The aliases of the databases changes were made in.
+        key (str):
+            The cache key of the generation to bump.
+    """
+    bump_generation(key)
+
+    # Django 1.8 can't run callbacks on commit, so the generation is
+    # only bumped immediately there.
+    if not hasattr(transaction, 'on_commit'):
+        return
+
+    for using in databases:
+        if transaction.get_connection(using).in_atomic_block:
+            transaction.on_commit(partial(bump_generation, key), using=using)
+
+
+def bump_generation(key=GENERATION_KEY):
+    """Invalidate all cached help center content.
+
+    Args:
+        key (str):
+            The cache key of the generation to bump. Defaults to the
+            content generation.
+
+    Returns:
+        int:
+            The new generation number.
+    """
+    cache = get_cache()
+
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # The key doesn't exist, so nothing was cached under the old
+        # generation anyways.
+        return get_generation(key)
+
+
+def get_cache():
+    """Get the cache used for help center content.
+
+    Returns:
+        The cache given by the `HELPCENTER_CACHE` setting.
+    """
+    return caches[getattr(settings, 'HELPCENTER_CACHE', 'default')]
+
+
+def get_generation(key=GENERATION_KEY):
+    """Get the current generation of help center content.
+
+    Args:
+        key (str):
+            The cache key of the generation. Defaults to the content
+            generation.
+
+    Returns:
+        int:
+            The current generation number. If the generation isn't
+            known, for example because it was evicted from the cache,
+            a new one is started based on the current time so it can't
+            collide with a previous generation.
+    """
+    cache = get_cache()
+    generation = cache.get(key)
+
+    if generation is None:
+        cache.add(key, int(time.time() * 1000), None)
+        generation = cache.get(key)
+
+    return generation
+
+
+def get_next_publish_time():
+    """Get the time the next scheduled article is published.
+
+    The time is cached for the current generation of content, so it is
+    only looked up again after an article changes or once the article
+    has been published.
+
+    Returns:
+        datetime:
+            The publish time of the next scheduled article, or None if
+            no articles are scheduled.
+    """
+    cache = get_cache()
+    key = make_key('next-publish')
+    now = timezone.now()
+
+    publish_time = cache.get(key)
+
+    if publish_time == NOTHING_SCHEDULED:
+        return None
+
+    if publish_time is not None and publish_time > now:
+        return publish_time
+
+    publish_time = models.Article.objects.scheduled(now).aggregate(
+        Min('time_published'))['time_published__min']
+
+    if publish_time is None:
+        cache.set(key, NOTHING_SCHEDULED,
+                  getattr(settings, 'HELPCENTER_CACHE_TIMEOUT', 300))
+    else:
+        cache.set(key, publish_time, seconds_until(publish_time))
+
+    return publish_time
+
+
+def invalidate(using=None):
+    """Invalidate all cached help center content.
+
+    The generation is bumped immediately, unless a batch started by
+    `batch_invalidation` is in progress. If the change was made inside
+    a transaction, it is bumped again once the transaction commits.
+
+    Args:
+        using (str):
+            The database the change was made in. Defaults to the
+            default database.
+    """
+    using = using or DEFAULT_DB_ALIAS
+
+    if getattr(_state, 'batches', 0):
+        _state.pending = (getattr(_state, 'pending', None) or set()) | {
+            using}
+    else:
+        _bump_after_commit({using})
+
+
+def invalidate_terms(using=None):
+    """Invalidate the cached vocabulary of published articles.
+
+    Like `invalidate`, the terms generation is bumped immediately and
+    again once the current transaction commits, but it is never
+    deferred by a batch.
+
+    Args:
+        using (str):
+            The database the change was made in. Defaults to the
+            default database.
+    """
+    _bump_after_commit({using or DEFAULT_DB_ALIAS}, TERMS_GENERATION_KEY)
+
+
+def make_key(prefix, *parts):
+    """Create a cache key for the current generation of content.
+
+    Args:
+        prefix (str):
+            The type of value being cached.
+        *parts:
+            The values identifying the cached value. They are hashed so
+            the key has a fixed length.
+
+    Returns:
+        str:
+            A cache key that is only valid until the next time the
+            content generation changes.
+    """
+    digest = hashlib.md5()
+
+    for part in parts:
+        digest.update(u'{}\0'.format(part).encode('utf-8'))
+
+    return 'helpcenter:{}:{}:{}'.format(
+        prefix, get_generation(), digest.hexdigest())
+
+
+def seconds_until(moment):
+    """Get the number of whole seconds until a certain time.
+
+    Args:
+        moment (datetime):
+            The time to count down to.
+
+    Returns:
+        int:
+            The number of seconds until the given time, rounded up so
+            the time has passed once they elapse. If the time is in the
+            past, 0 is returned.
+    """
+    seconds = (moment - timezone.now()).total_seconds()
+
+    return max(int(math.ceil(seconds)), 0)
@@ -0,0 +1,231 @@
+"""Deleting and looking up categories.
+
+What happens to the contents of a deleted category is decided by the
+`HELPCENTER_CATEGORY_DELETE_POLICY` setting:
+
+``orphan``
+    The category's articles and subcategories become top level content.
+``reparent``
+    The category's articles and subcategories are moved to the deleted
+    category's parent.
+``cascade``
+    The category's whole subtree is deleted, including every article in
+    it.
+
+Contents are moved with a few bulk updates per deleted category,
+regardless of how large its subtree is, using the categories'
+materialized paths. Moved articles have their previous slugs recorded
+like articles moved any other way, so old links are redirected. Cached
+content is only invalidated once for the whole deletion, and again once
+it has been committed.
+
+Categories are looked up for autocompletion by a prefix of their
+stored lowercase title, which can use an index on every database, and
+the stored label of each category is returned so none of their
+ancestors have to be fetched.
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import router, transaction
+from django.db.models import F, Q, QuerySet, Value
+from django.db.models.functions import Concat, Substr
+from django.utils import timezone
+
+from helpcenter import cache, models, slugs
+
+
+POLICIES = ('cascade', 'orphan', 'reparent')
+
+
+def autocomplete(query, limit=None, using=None):
+    """Find the categories whose title starts with a query.
+
+    Args:
+        query (str):
+            The beginning of the title, ignoring case.
+        limit (int):
+            The maximum number of categories returned. Defaults to the
+            `HELPCENTER_AUTOCOMPLETE_RESULTS` setting.
+        using (str):
+            The database to read from.
+
+    Returns:
+        list:
+            A dictionary containing the `id` and `label` of each
+            matching category, ordered by title ignoring case.
+    """
+    query = query.strip()
+
+    if not query:
+        return []
+
+    limit = limit or getattr(settings, 'HELPCENTER_AUTOCOMPLETE_RESULTS', 10)
+    categories = models.Category.objects.using(
+        using or router.db_for_read(models.Category))
+
+    return list(categories.filter(
+        search_title__startswith=query.lower(),
+    ).order_by('search_title', 'id').values('id', 'label')[:limit])
+
+
+def delete_categories(categories, policy=None):
+    """Delete categories according to a deletion policy.
+
+    Args:
+        categories:
+            A queryset of the categories to delete.
+        policy (str):
+            One of `POLICIES`. Defaults to the policy given by the
+            `HELPCENTER_CATEGORY_DELETE_POLICY` setting.
+
+    Returns:
+        tuple:
+            The number of objects deleted and a dictionary with the
+            number of deletions for each model, like `QuerySet.delete`.
+    """
+    policy = policy or get_delete_policy()
+    using = categories.db
+    all_categories = models.Category.objects.using(using)
+    articles = models.Article.objects.using(using)
+
+    with cache.batch_invalidation(), transaction.atomic(using=using):
+        deleted, labels = {}, {}
+
+        for pk, path, label in categories.order_by().values_list(
+                'pk', 'path', 'label'):
+            deleted[pk] = path
+            labels[pk] = label
+
+        if not deleted:
+            return 0, {}
+
+        if policy == 'cascade':
+            subtree = Q()
+
+            for path in deleted.values():
+                subtree |= Q(path__startswith=path)
+
+            articles.filter(category__in=all_categories.filter(
+                subtree).values('pk')).delete()
+            doomed = all_categories.filter(subtree)
+        else:
+            _move_contents(
+                deleted, labels, policy == 'reparent', all_categories,
+                articles)
+            doomed = all_categories.filter(pk__in=list(deleted))
+
+        cache.invalidate(using=using)
+
+        # The contents have been dealt with, so the categories are
+        # deleted without applying the policy again.
+        return QuerySet.delete(doomed)
+
+
+def get_delete_policy():
+    """Get the policy for deleting categories.
+
+    Returns:
+        str:
+            The value of the `HELPCENTER_CATEGORY_DELETE_POLICY` setting.
+
+    Raises:
+        ImproperlyConfigured:
+            If the setting isn't one of `POLICIES`.
+    """
+    policy = getattr(settings, 'HELPCENTER_CATEGORY_DELETE_POLICY', 'orphan')
+
+    if policy not in POLICIES:
+        raise ImproperlyConfigured(
+            'HELPCENTER_CATEGORY_DELETE_POLICY must be one of: {}'.format(
+                ', '.join(POLICIES)))
+
+    return policy
+
+
+def _move_contents(deleted, labels, reparent, categories, articles):
+    """Move the contents out of categories that are being deleted.
+
+    Args:
+        deleted (dict):
+            A mapping of the id of each category being deleted to its
+            path.
+        labels (dict):
+            A mapping of the id of each category being deleted to its
+            label.
+        reparent (bool):
+            If true, contents are moved to the closest ancestor that
+            isn't being deleted. Otherwise they become top level
+            content.
+        categories:
+            A queryset of all categories in the database being used.
+        articles:
+            A queryset of all articles in the database being used.
+    """
+    moves = []
+    targets = defaultdict(list)
+
+    # Categories are processed deepest first, so the subcategories moved
+    # out of a category are no longer under any of its deleted
+    # ancestors by the time those are processed.
+    for pk, path in sorted(
+            deleted.items(), key=lambda item: -item[1].count('/')):
+        target, target_path = None, ''
+
+        if reparent:
+            ancestors = [int(part) for part in path.split('/')[:-2]]
+
+            for i in reversed(range(len(ancestors))):
+                if ancestors[i] not in deleted:
+                    target = ancestors[i]
+                    target_path = ''.join(
+                        models.Category.get_path_segment(ancestor)
+                        for ancestor in ancestors[:i + 1])
+                    break
+
+        targets[target].append(pk)
+        moves.append((pk, path, target, target_path))
+
+    target_labels = {}
+
+    if any(target is not None for target in targets):
+        target_labels = dict(categories.filter(
+            pk__in=[target for target in targets if target is not None],
+        ).values_list('pk', 'label'))
+
+    separator = models.Category.LABEL_SEPARATOR
+
+    for pk, path, target, target_path in moves:
+        target_label = target_labels.get(target, '')
+
+        categories.filter(path__startswith=path).exclude(
+            pk__in=list(deleted)).update(
+                depth=F('depth') - (path.count('/') - target_path.count('/')),
+                label=Concat(
+                    Value(target_label + separator if target_label else ''),
+                    Substr('label', len(labels[pk] + separator) + 1)),
+                path=Concat(Value(target_path), Substr('path', len(path) + 1)))
+
+    now = timezone.now()
+    changes = []
+
+    for target, pks in targets.items():
+        moving = articles.filter(category__in=pks)
+        previous = list(moving.order_by().values_list(
+            'pk', 'category', 'slug'))
+        new_slugs = slugs.rename_conflicts(
+            moving, articles.filter(category=target))
+        moving.update(category=target, time_edited=now)
+        categories.filter(parent__in=pks).exclude(
+            pk__in=list(deleted)).update(parent=target)
+
+        changes.extend(
+            (models.Article(pk=pk, category_id=target,
+                            slug=new_slugs.get(pk, slug)),
+             old_category_id, slug)
+            for pk, old_category_id, slug in previous)
+
+    # The previous categories still exist until the end of the deletion
+    models.SlugHistory.record(changes, using=articles.db)
@@ -0,0 +1,328 @@
+"""Processing of article bodies.
+
+Article bodies are written as HTML. Rather than processing the body
+every time an article is displayed, the values derived from it are
+computed once when the article is saved. See `process_body`.
+"""
+
+import math
+import re
+from collections import namedtuple
+
+from django.conf import settings
+from django.utils import six
+from django.utils.html import escape
+from django.utils.six.moves import html_parser
+from django.utils.text import slugify
+
+
+# Tags that are kept in sanitized HTML. Any other tags are removed,
+# but their contents are kept.
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'dd', 'del', 'div', 'dl',
+    'dt', 'em', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img', 'li',
+    'ol', 'p', 'pre', 's', 'span', 'strong', 'sub', 'sup', 'table', 'tbody',
+    'td', 'th', 'thead', 'tr', 'u', 'ul',
+}
+
+# The attributes that are kept for each allowed tag
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title'},
+    'abbr': {'title'},
+    'img': {'alt', 'height', 'src', 'title', 'width'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan'},
+}
+
+# URL schemes allowed in links and images
+ALLOWED_SCHEMES = {'http', 'https', 'mailto'}
+
+# Tags whose contents are removed along with the tag
+DROPPED_TAGS = {'script', 'style'}
+
+# Tags that are separated from the surrounding text
+BLOCK_TAGS = {
+    'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'h1', 'h2', 'h3', 'h4',
+    'h5', 'h6', 'hr', 'li', 'ol', 'p', 'pre', 'table', 'td', 'th', 'tr',
+    'ul',
+}
+
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+VOID_TAGS = {'br', 'hr', 'img'}
+
+ELLIPSIS = '...'
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+ProcessedBody = namedtuple(
+    'ProcessedBody', ('html', 'text', 'toc', 'word_count'))
+
+
+class BodyParser(html_parser.HTMLParser):
+    """Parser producing sanitized HTML from an article body.
+
+    Only the tags and attributes in `ALLOWED_TAGS` and
+    `ALLOWED_ATTRIBUTES` are kept, whitespace outside of `<pre>` tags is
+    collapsed, and comments are removed. Each heading is given an id so
+    it can be linked to from the table of contents.
+
+    Attributes:
+        text (list):
+            The plain text chunks of the body.
+        toc (list):
+            A dictionary for each heading in the body containing its
+            `id`, `level`, and `title`.
+    """
+
+    def __init__(self):
+        """Create a new parser."""
+        try:
+            html_parser.HTMLParser.__init__(self, convert_charrefs=True)
+        except TypeError:
+            # Python 2's parser doesn't accept 'convert_charrefs', and
+            # instead calls 'handle_charref' and 'handle_entityref'.
+            html_parser.HTMLParser.__init__(self)
+
+        self.text = []
+        self.toc = []
+
+        self._dropping = 0
+        self._heading = None
+        self._ids = set()
+        self._open = []
+        self._output = []
+        self._pre = 0
+
+    def close(self):
+        """Finish parsing, closing any tags that were left open."""
+        html_parser.HTMLParser.close(self)
+
+        self._dropping = 0
+
+        while self._open:
+            self.handle_endtag(self._open[-1])
+
+    def get_html(self):
+        """Get the sanitized HTML of the parsed body."""
+        return ''.join(self._output).strip()
+
+    def handle_charref(self, name):
+        self.handle_data(self.unescape('&#{};'.format(name)))
+
+    def handle_data(self, data):
+        if self._dropping:
+            return
+
+        if not self._pre:
+            data = WHITESPACE_RE.sub(' ', data)
+
+        self._output.append(escape(data))
+        self.text.append(data)
+
+        if self._heading is not None:
+            self._heading['text'].append(data)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_TAGS:
+            self._dropping = max(self._dropping - 1, 0)
+
+            return
+
+        if self._dropping or tag not in self._open:
+            return
+
+        # Close any tags that were left open inside this one
+        while self._open:
+            current = self._open.pop()
+            self._output.append('</{}>'.format(current))
+
+            if current == 'pre':
+                self._pre -= 1
+
+            if (self._heading is not None and
+                    len(self._open) == self._heading['depth']):
+                self._finish_heading()
+
+            if current == tag:
+                break
+
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+
+    def handle_entityref(self, name):
+        self.handle_data(self.unescape('&{};'.format(name)))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_TAGS:
+            self._dropping += 1
+
+            return
+
+        if self._dropping:
+            return
+
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+
+        if tag not in ALLOWED_TAGS:
+            return
+
+        attrs = self._clean_attributes(tag, attrs)
+
+        if tag in HEADING_TAGS and self._heading is None:
+            # The id is generated from the heading's text, so the tag
+            # is written once the heading is finished.
+            self._heading = {
+                'attrs': attrs,
+                'depth': len(self._open),
+                'index': len(self._output),
+                'tag': tag,
+                'text': [],
+            }
+            self._output.append(None)
+        else:
+            self._output.append(self._format_tag(tag, attrs))
+
+        if tag in VOID_TAGS:
+            return
+
+        if tag == 'pre':
+            self._pre += 1
+
+        self._open.append(tag)
+
+    def _clean_attributes(self, tag, attrs):
+        """Remove disallowed attributes and URLs from a tag."""
+        allowed = ALLOWED_ATTRIBUTES.get(tag, set())
+        cleaned = []
+
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+
+            if name in ('href', 'src') and not is_safe_url(value):
+                continue
+
+            cleaned.append((name, value))
+
+        return cleaned
+
+    def _finish_heading(self):
+        """Write the tag of the current heading and record it."""
+        heading = self._heading
+        self._heading = None
+
+        title = WHITESPACE_RE.sub(' ', ''.join(heading['text'])).strip()
+        base = slugify(title) or 'section'
+        heading_id = base
+        suffix = 1
+
+        while heading_id in self._ids:
+            suffix += 1
+            heading_id = '{}-{}'.format(base, suffix)
+
+        self._ids.add(heading_id)
+
+        attrs = [('id', heading_id)] + heading['attrs']
+        self._output[heading['index']] = self._format_tag(
+            heading['tag'], attrs)
+
+        self.toc.append({
+            'id': heading_id,
+            'level': int(heading['tag'][1]),
+            'title': title,
+        })
+
+    @staticmethod
+    def _format_tag(tag, attrs):
+        """Format the start of a tag."""
+        parts = [tag] + [
+            '{}="{}"'.format(name, escape(value)) for name, value in attrs]
+
+        return '<{}>'.format(' '.join(parts))
+
+
+def is_safe_url(url):
+    """Determine if a URL may be included in sanitized HTML.
+
+    Relative URLs are allowed, as are absolute URLs with a scheme in
+    `ALLOWED_SCHEMES`.
+    """
+    # Browsers ignore control characters and whitespace in schemes
+    url = re.sub(r'[\x00-\x20]+', '', url)
+    match = re.match(r'([a-zA-Z][a-zA-Z0-9+.-]*):', url)
+
+    return match is None or match.group(1).lower() in ALLOWED_SCHEMES
+
+
+def get_excerpt(text):
+    """Get an excerpt of an article's text.
+
+    The excerpt is at most `HELPCENTER_EXCERPT_LENGTH` characters long,
+    including the ellipsis added to text that is cut off. Text is only
+    cut off between words.
+    """
+    length = getattr(settings, 'HELPCENTER_EXCERPT_LENGTH', 200)
+
+    if len(text) <= length:
+        return text
+
+    # One extra character is included to tell if the cut falls right
+    # before a space.
+    excerpt = text[:length - len(ELLIPSIS) + 1]
+
+    if ' ' in excerpt:
+        excerpt = excerpt.rsplit(' ', 1)[0]
+    else:
+        excerpt = excerpt[:-1]
+
+    return excerpt.rstrip(' .,;:') + ELLIPSIS
+
+
+def get_reading_time(word_count):
+    """Estimate the number of minutes it takes to read an article.
+
+    The estimate is based on the setting `HELPCENTER_READING_SPEED`,
+    which is given in words per minute.
+    """
+    speed = getattr(settings, 'HELPCENTER_READING_SPEED', 200)
+
+    if not word_count:
+        return 0
+
+    return int(math.ceil(float(word_count) / speed))
+
+
+def process_body(body):
+    """Process the body of an article.
+
+    Args:
+        body (str):
+            The HTML body of the article.
+
+    Returns:
+        ProcessedBody:
+            The sanitized and minified HTML of the body, its plain
+            text, its table of contents, and the number of words in it.
+    """
+    parser = BodyParser()
+    parser.feed(six.text_type(body or ''))
+    parser.close()
+
+    text = WHITESPACE_RE.sub(' ', ''.join(parser.text)).strip()
+
+    return ProcessedBody(
+        html=parser.get_html(),
+        text=text,
+        toc=parser.toc,
+        word_count=len(WORD_RE.findall(text)))
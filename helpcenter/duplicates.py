@@ -0,0 +1,204 @@
+"""Detection of near-duplicate articles.
+
+Every article's MinHash signature is computed when it is saved, and
+the keys of the buckets its signature hashes into are stored in
+`MinHashBucket`. Finding the near-duplicates of an article only needs
+to look up the articles in the same buckets through an index, and
+finding every near-duplicate pair only needs to look at buckets shared
+by more than one article. No pair of articles is compared unless their
+signatures put them in the same bucket. See `helpcenter.minhash`.
+
+Candidates sharing a bucket are then compared using their full
+signatures, and only pairs whose estimated similarity is at least
+`HELPCENTER_DUPLICATE_THRESHOLD` are reported.
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib import messages
+from django.db import router
+from django.db.models import Count
+
+from helpcenter import minhash, models
+
+
+# The maximum number of parameters used in a single query
+BATCH_SIZE = 500
+
+# The fields loaded for articles reported as duplicates
+FIELDS = ('category', 'id', 'minhash', 'slug', 'title')
+
+
+def find_all_duplicates(threshold=None, using=None):
+    """Find every pair of near-duplicate articles.
+
+    Args:
+        threshold (float):
+            The minimum estimated similarity of a pair. Defaults to the
+            `HELPCENTER_DUPLICATE_THRESHOLD` setting.
+        using (str):
+            The database to read from.
+
+    Returns:
+        list:
+            A tuple for each pair containing the two articles and their
+            estimated similarity, from most to least similar.
+    """
+    threshold = get_threshold() if threshold is None else threshold
+    buckets = models.MinHashBucket.objects.using(
+        using or router.db_for_read(models.MinHashBucket))
+
+    shared = list(buckets.order_by().values('key').annotate(
+        count=Count('id')).filter(count__gt=1).values_list('key', flat=True))
+
+    members = defaultdict(set)
+
+    for start in range(0, len(shared), BATCH_SIZE):
+        for key, pk in buckets.filter(
+                key__in=shared[start:start + BATCH_SIZE]).values_list(
+                    'key', 'article'):
+            members[key].add(pk)
+
+    candidates = set()
+
+    for pks in members.values():
+        pks = sorted(pks)
+        candidates.update(
+            (pk, other) for i, pk in enumerate(pks) for other in pks[i + 1:])
+
+    articles = _get_articles(
+        set(pk for pair in candidates for pk in pair), using)
+    duplicates = []
+
+    for pk, other in candidates:
+        similarity = minhash.get_similarity(
+            minhash.unpack(articles[pk].minhash),
+            minhash.unpack(articles[other].minhash))
+
+        if similarity >= threshold:
+            duplicates.append((articles[pk], articles[other], similarity))
+
+    duplicates.sort(key=lambda pair: (-pair[2], pair[0].pk, pair[1].pk))
+
+    return duplicates
+
+
+def find_duplicates(article, threshold=None, using=None):
+    """Find the near-duplicates of an article.
+
+    The candidates are found with a single query using the index on the
+    bucket keys.
+
+    Args:
+        article:
+            The saved article to find the near-duplicates of.
+        threshold (float):
+            The minimum estimated similarity of a near-duplicate.
+            Defaults to the `HELPCENTER_DUPLICATE_THRESHOLD` setting.
+        using (str):
+            The database to read from.
+
+    Returns:
+        list:
+            A tuple for each near-duplicate containing the article and
+            its estimated similarity, from most to least similar.
+    """
+    threshold = get_threshold() if threshold is None else threshold
+    signature = minhash.unpack(article.minhash)
+    keys = minhash.get_bucket_keys(signature)
+
+    if not keys:
+        return []
+
+    candidates = models.Article.objects.using(
+        using or router.db_for_read(models.Article)).filter(
+            minhash_buckets__key__in=keys).exclude(
+                pk=article.pk).order_by().distinct().only(*FIELDS)
+
+    duplicates = []
+
+    for candidate in candidates:
+        similarity = minhash.get_similarity(
+            signature, minhash.unpack(candidate.minhash))
+
+        if similarity >= threshold:
+            duplicates.append((candidate, similarity))
+
+    duplicates.sort(key=lambda pair: (-pair[1], pair[0].pk))
+
+    return duplicates
+
+
+def get_threshold():
+    """Get the minimum similarity of near-duplicate articles."""
+    return getattr(settings, 'HELPCENTER_DUPLICATE_THRESHOLD', 0.8)
+
+
+def index_articles(articles, using=None):
+    """Store the buckets of articles' signatures.
+
+    Any previous buckets of the articles are replaced.
+
+    Args:
+        articles (list):
+            The saved articles to index.
+        using (str):
+            The database to write to. Defaults to the database buckets
+            are written to.
+    """
+    articles = [article for article in articles if article.pk is not None]
+
+    if not articles:
+        return
+
+    buckets = models.MinHashBucket.objects.using(
+        using or router.db_for_write(models.MinHashBucket))
+
+    buckets.filter(article__in=[article.pk for article in articles]).delete()
+    buckets.bulk_create([
+        models.MinHashBucket(article=article, key=key)
+        for article in articles
+        for key in minhash.get_bucket_keys(minhash.unpack(article.minhash))])
+
+
+def warn_duplicates(request, article):
+    """Warn the user if an article they saved has near-duplicates.
+
+    Args:
+        request:
+            The request the article was saved in.
+        article:
+            The saved article.
+
+    Returns:
+        list:
+            The article's near-duplicates, as returned by
+            `find_duplicates`.
+    """
+    duplicates = find_duplicates(article)
+
+    if duplicates:
+        titles = ', '.join(
+            '"{}" ({:.0%})'.format(duplicate.title, similarity)
+            for duplicate, similarity in duplicates)
+
+        messages.warning(
+            request,
+            'This article is very similar to: {}'.format(titles),
+            fail_silently=True)
+
+    return duplicates
+
+
+def _get_articles(pks, using):
+    """Get articles by primary key in batches."""
+    pks = sorted(pks)
+    queryset = models.Article.objects.using(
+        using or router.db_for_read(models.Article)).only(*FIELDS)
+    articles = {}
+
+    for start in range(0, len(pks), BATCH_SIZE):
+        articles.update(queryset.in_bulk(pks[start:start + BATCH_SIZE]))
+
+    return articles
@@ -0,0 +1,99 @@
+"""Forms used to edit help center content."""
+
+from django import forms
+from django.core.urlresolvers import reverse
+from django.forms.utils import flatatt
+from django.utils.html import format_html
+
+from helpcenter import models
+
+
+class CategoryAutocompleteWidget(forms.Widget):
+    """Widget choosing a category by typing the beginning of its title.
+
+    The category's id is kept in a hidden input. As the user types in a
+    text input, matching categories are suggested by the category
+    autocomplete endpoint of the API. Unlike a select, the widget never
+    lists every category, so rendering it only looks up the label of the
+    selected category.
+    """
+
+    class Media:
+        js = ('helpcenter/js/category-autocomplete.js',)
+
+    def get_label(self, value):
+        """Get the label of the selected category.
+
+        Args:
+            value:
+                The id of the selected category.
+
+        Returns:
+            str:
+                The category's label, or an empty string if no valid
+                category is selected.
+        """
+        if value in (None, ''):
+            return ''
+
+        try:
+            pk = int(value)
+        except (TypeError, ValueError):
+            return ''
+
+        return models.Category.objects.filter(pk=pk).values_list(
+            'label', flat=True).first() or ''
+
+    def render(self, name, value, attrs=None):
+        """Render the hidden id and the text input for the label."""
+        final_attrs = self.build_attrs(attrs, type='hidden', name=name)
+        input_id = final_attrs.setdefault('id', 'id_{}'.format(name))
+
+        if value not in (None, ''):
+            final_attrs['value'] = value
+
+        label_attrs = {
+            'autocomplete': 'off',
+            'data-category-autocomplete': '',
+            'data-target': input_id,
+            'data-url': reverse(
+                'helpcenter:helpcenter-api:category-autocomplete'),
+            'id': '{}_label'.format(input_id),
+            'list': '{}_choices'.format(input_id),
+            'type': 'text',
+            'value': self.get_label(value),
+        }
+
+        return format_html(
+            '<input{} /><input{} /><datalist id="{}_choices"></datalist>',
+            flatatt(final_attrs), flatatt(label_attrs), input_id)
+
+
+class ArticleForm(forms.ModelForm):
+    """Form to create or update an article."""
+
+    class Meta:
+        fields = ('title', 'body', 'category', 'draft')
+        model = models.Article
+        widgets = {
+            'category': CategoryAutocompleteWidget,
+        }
+
+
+class CategoryForm(forms.ModelForm):
+    """Form to create or update a category."""
+
+    class Meta:
+        fields = ('title', 'parent')
+        model = models.Category
+        widgets = {
+            'parent': CategoryAutocompleteWidget,
+        }
+
+
+class MoveArticlesForm(forms.Form):
+    """Form to choose the category articles are moved to."""
+    category = forms.ModelChoiceField(
+        queryset=models.Category.objects.all(),
+        required=False,
+        widget=CategoryAutocompleteWidget)
@@ -0,0 +1,108 @@
+"""Full-text index of articles used to search them in the admin.
+
+Every distinct word in an article's title and body is stored in
+`ArticleTerm` when the article is saved. Searching for a word only
+needs an indexed prefix lookup of the word in the terms, instead of
+scanning the title and body of every article for it.
+"""
+
+from django.db import router
+from django.utils.html import strip_tags
+
+from helpcenter import cache, content, models
+
+
+# The maximum length of a term. Longer words are truncated, so they can
+# still be found by searching for their beginning.
+MAX_LENGTH = 50
+
+
+def filter_articles(queryset, query):
+    """Get the articles in a queryset matching a query.
+
+    Args:
+        queryset:
+            The articles to search.
+        query (str):
+            The text searched for.
+
+    Returns:
+        A queryset of the articles containing a word starting with each
+        word of the query, in either their title or body. If the query
+        doesn't contain any words, the original queryset is returned.
+    """
+    words = get_terms(query)
+
+    if not words:
+        return queryset
+
+    terms = models.ArticleTerm.objects.using(queryset.db)
+
+    for word in words:
+        queryset = queryset.filter(pk__in=terms.filter(
+            term__startswith=word).values('article'))
+
+    return queryset
+
+
+def get_article_terms(title, body_html):
+    """Get the terms of an article.
+
+    Args:
+        title (str):
+            The article's title.
+        body_html (str):
+            The article's sanitized body.
+
+    Returns:
+        set:
+            The terms in the article's title and the text of its body.
+    """
+    return get_terms(u'{} {}'.format(title, strip_tags(body_html)))
+
+
+def get_terms(text):
+    """Get the terms in a piece of text.
+
+    Args:
+        text (str):
+            The text to get the terms of.
+
+    Returns:
+        set:
+            The distinct lowercase words in the text, truncated to
+            `MAX_LENGTH` characters.
+    """
+    return set(
+        word[:MAX_LENGTH] for word in content.WORD_RE.findall(text.lower()))
+
+
+def index_articles(articles, using=None):
+    """Store the terms of articles.
+
+    Any previous terms of the articles are replaced, and the cached
+    vocabulary of published articles is invalidated.
+
+    Args:
+        articles (list):
+            The saved articles to index.
+        using (str):
+            The database to write to. Defaults to the database terms
+            are written to.
+    """
+    articles = [article for article in articles if article.pk is not None]
+
+    if not articles:
+        return
+
+    using = using or router.db_for_write(models.ArticleTerm)
+    terms = models.ArticleTerm.objects.using(using)
+
+    terms.filter(article__in=[article.pk for article in articles]).delete()
+    terms.bulk_create([
+        models.ArticleTerm(article=article, term=term)
+        for article in articles
+        for term in sorted(get_article_terms(article.title,
+                                             article.body_html))])
+
+    cache.invalidate_terms(using=using)
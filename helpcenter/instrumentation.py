@@ -0,0 +1,253 @@
+"""Instrumentation of help center views.
+
+When instrumentation is enabled, every help center view records the
+number of queries it makes, the time spent in the database, the number
+of cache hits and misses, and the time spent rendering its response.
+The metrics are sent with the `view_instrumented` signal once the view
+has finished.
+
+Each view also declares a query budget. If a view makes more queries
+than its budget while `DEBUG` is true, a `QueryBudgetWarning` is
+issued, making N+1 query problems easy to spot during development.
+Tests can use `capture_metrics` or
+`helpcenter.testing_utils.QueryBudgetTestMixin` to enforce budgets.
+"""
+
+import threading
+import timeit
+import warnings
+from collections import deque
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.dispatch import Signal
+from django.test.utils import CaptureQueriesContext
+
+
+view_instrumented = Signal(providing_args=['metrics'])
+
+
+_state = threading.local()
+
+
+class QueryBudgetWarning(RuntimeWarning):
+    """Warning issued when a view exceeds its query budget."""
+    pass
+
+
+class QueryCapture(CaptureQueriesContext):
+    """Context manager capturing every query made on a connection.
+
+    `CaptureQueriesContext` finds the captured queries by their position
+    in the connection's query log, which stops moving once the log is
+    full. Queries are instead logged separately while the context is
+    active, then added to the connection's log when it exits.
+    """
+
+    def __enter__(self):
+        """Start logging queries separately."""
+        self.log = self.connection.queries_log
+        self.connection.queries_log = deque()
+
+        return super(QueryCapture, self).__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop capturing and restore the connection's query log."""
+        super(QueryCapture, self).__exit__(exc_type, exc_value, traceback)
+
+        self.captured = list(self.connection.queries_log)
+        self.connection.queries_log = self.log
+        self.log.extend(self.captured)
+
+    @property
+    def captured_queries(self):
+        """list: The queries made inside the context."""
+        return self.captured
+
+
+class ViewMetrics(object):
+    """The metrics recorded for a single view.
+
+    Attributes:
+        budget (int):
+            The maximum number of queries the view is expected to make,
+            or `None` if the view has no budget.
+        cache_hits (int):
+            The number of help center cache lookups that were hits.
+        cache_misses (int):
+            The number of help center cache lookups that were misses.
+        db_time (float):
+            The total time spent executing queries, in seconds.
+        name (str):
+            The name of the view.
+        queries (int):
+            The number of queries made.
+        render_time (float):
+            The time spent rendering the response, in seconds.
+        total_time (float):
+            The total time spent in the view, in seconds.
+    """
+
+    def __init__(self, name=None, budget=None):
+        """Create an empty set of metrics."""
+        self.budget = budget
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.db_time = 0.0
+        self.name = name
+        self.queries = 0
+        self.render_time = 0.0
+        self.total_time = 0.0
+
+    def __repr__(self):
+        """Return a summary of the metrics."""
+        return '<ViewMetrics {}: {} queries (budget {})>'.format(
+            self.name, self.queries, self.budget)
+
+    @property
+    def over_budget(self):
+        """bool: Whether the view made more queries than its budget."""
+        return self.budget is not None and self.queries > self.budget
+
+    @contextmanager
+    def time_render(self):
+        """Context manager timing the rendering of a response."""
+        start = timeit.default_timer()
+
+        try:
+            yield
+        finally:
+            self.render_time += timeit.default_timer() - start
+
+
+@contextmanager
+def capture_queries():
+    """Capture the queries made on every database connection.
+
+    Yields:
+        list:
+            A list that a tuple containing the database alias and the
+            query is added to for each query made inside the context.
+            The queries of each connection are added in the order they
+            were made once the context exits.
+    """
+    captures = [QueryCapture(connection) for connection in connections.all()]
+    queries = []
+
+    for capture in captures:
+        capture.__enter__()
+
+    try:
+        yield queries
+    finally:
+        for capture in captures:
+            capture.__exit__(None, None, None)
+            queries.extend(
+                (capture.connection.alias, query)
+                for query in capture.captured_queries)
+
+
+@contextmanager
+def capture_metrics():
+    """Capture the metrics of every view run inside the context.
+
+    Instrumentation is enabled inside the context regardless of the
+    `HELPCENTER_INSTRUMENT_VIEWS` setting.
+
+    Yields:
+        list:
+            A list that the `ViewMetrics` of each view are appended to.
+    """
+    captured = []
+
+    def receiver(sender, metrics, **kwargs):
+        captured.append(metrics)
+
+    view_instrumented.connect(receiver, weak=False)
+    _state.forced = getattr(_state, 'forced', 0) + 1
+
+    try:
+        yield captured
+    finally:
+        _state.forced -= 1
+        view_instrumented.disconnect(receiver)
+
+
+def check_budget(metrics):
+    """Warn about a view that exceeded its query budget.
+
+    The warning is only issued if `DEBUG` is true.
+
+    Args:
+        metrics (ViewMetrics):
+            The metrics of the view to check.
+    """
+    if metrics.over_budget and settings.DEBUG:
+        warnings.warn(
+            '{} made {} queries, exceeding its budget of {}.'.format(
+                metrics.name, metrics.queries, metrics.budget),
+            QueryBudgetWarning)
+
+
+@contextmanager
+def instrument():
+    """Record the metrics of the code run inside the context.
+
+    Queries made on every database connection are counted. The caller
+    is responsible for filling in the name and budget of the returned
+    metrics.
+
+    Yields:
+        ViewMetrics:
+            The metrics being recorded. They are complete once the
+            context exits.
+    """
+    metrics = ViewMetrics()
+    previous = getattr(_state, 'metrics', None)
+    _state.metrics = metrics
+
+    start = timeit.default_timer()
+
+    try:
+        with capture_queries() as queries:
+            yield metrics
+    finally:
+        metrics.total_time = timeit.default_timer() - start
+        metrics.queries = len(queries)
+        metrics.db_time = sum(float(query['time']) for _, query in queries)
+
+        _state.metrics = previous
+
+
+def is_enabled():
+    """Determine if views should be instrumented.
+
+    Returns:
+        bool:
+            True if metrics are being captured, or if the
+            `HELPCENTER_INSTRUMENT_VIEWS` setting is true. The setting
+            defaults to the value of `DEBUG`.
+    """
+    if getattr(_state, 'forced', 0):
+        return True
+
+    return getattr(settings, 'HELPCENTER_INSTRUMENT_VIEWS', settings.DEBUG)
+
+
+def record_cache_access(hit):
+    """Record a lookup in a help center cache.
+
+    Args:
+        hit (bool):
+            True if the value was found in the cache.
+    """
+    metrics = getattr(_state, 'metrics', None)
+
+    if metrics is None:
+        return
+
+    if hit:
+        metrics.cache_hits += 1
+    else:
+        metrics.cache_misses += 1
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from helpcenter import models, revisions
+
+
+class Command(BaseCommand):
+    """Remove old article revisions.
+
+    Only the most recent revisions of each article are kept. The
+    oldest kept revision of each article becomes a full snapshot.
+    """
+    help = 'Remove all but the most recent revisions of articles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'article_ids',
+            help='The ids of the articles to compact. Defaults to all.',
+            metavar='article_id',
+            nargs='*',
+            type=int)
+        parser.add_argument(
+            '--keep',
+            default=10,
+            help='The number of revisions to keep for each article.',
+            type=int)
+
+    def handle(self, *args, **options):
+        keep = max(options['keep'], 1)
+
+        # Articles without enough revisions to remove are skipped
+        # without being queried individually.
+        articles = models.Article.objects.only('id').annotate(
+            num_revisions=Count('revisions')).filter(num_revisions__gt=keep)
+
+        if options['article_ids']:
+            articles = articles.filter(pk__in=options['article_ids'])
+
+        removed = 0
+
+        for article in articles.iterator():
+            removed += revisions.compact(article, keep)
+
+        self.stdout.write('Removed {} revisions.'.format(removed))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from helpcenter import rankings
+
+
+class Command(BaseCommand):
+    """Compute the popular and trending article rankings.
+
+    This should be run periodically, eg: from cron after
+    ``flushviewcounts``. The rankings are stored in the cache and
+    served until the next run.
+    """
+    help = 'Compute the popular and trending article rankings.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=None,
+            help='The database to read views from.')
+
+    def handle(self, *args, **options):
+        computed = rankings.compute_rankings(using=options['database'])
+
+        for kind in sorted(computed):
+            self.stdout.write('Computed {} {} rankings.'.format(
+                len(computed[kind]), kind))
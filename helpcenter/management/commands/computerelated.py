@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from helpcenter import related
+
+
+class Command(BaseCommand):
+    """Compute the related articles of every published article.
+
+    Requires NumPy and SciPy.
+    """
+    help = 'Compute the related articles of published articles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=None,
+            help='The database to use.')
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            default=False,
+            help=('Only update articles edited since their related '
+                  'articles were computed.'))
+
+    def handle(self, *args, **options):
+        if not related.is_available():
+            raise CommandError(
+                'Computing related articles requires NumPy and SciPy.')
+
+        computed = related.compute_related(
+            incremental=options['incremental'], using=options['database'])
+
+        self.stdout.write(
+            'Computed related articles for {} articles.'.format(computed))
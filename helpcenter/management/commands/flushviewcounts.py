@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from helpcenter import viewcounts
+
+
+class Command(BaseCommand):
+    """Write buffered article view counts to the database.
+
+    This should be run periodically, eg: from cron. Views counted since
+    the last run are only visible in the database once it has run.
+    """
+    help = 'Write the article views counted in the cache to the database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=None,
+            help='The database to write to.')
+
+    def handle(self, *args, **options):
+        written = viewcounts.write_counts(using=options['database'])
+
+        self.stdout.write('Wrote {} views.'.format(written))
@@ -0,0 +1,350 @@
+"""In-process metrics exposed in the Prometheus text format.
+
+Samples are first aggregated in a buffer local to the current thread,
+so recording a sample never needs a lock. Each thread periodically
+merges its buffer into the help center cache using atomic increments,
+which combines the samples from every thread and every worker process
+sharing the cache. The metrics view then reads the combined values from
+the cache.
+
+For samples to be combined across processes, the cache given by
+`HELPCENTER_CACHE` must be shared between them, eg: memcached or redis.
+"""
+
+import bisect
+import threading
+import time
+
+from django.conf import settings
+from django.utils.encoding import force_text
+
+from helpcenter import cache
+
+
+SERIES_KEY = 'helpcenter:metrics:series'
+
+# Sums are stored in the cache as integers, so fractional values are
+# scaled by this amount.
+SUM_SCALE = 1000000
+
+
+_local = threading.local()
+
+
+def _buffer():
+    """Get the sample buffer for the current thread."""
+    if not hasattr(_local, 'samples'):
+        _local.samples = {}
+        _local.last_flush = time.time()
+
+    return _local.samples
+
+
+def _format_labels(labels, extra=None):
+    """Format a set of labels for the Prometheus text format."""
+    labels = list(labels)
+
+    if extra is not None:
+        labels.append(extra)
+
+    if not labels:
+        return ''
+
+    return '{{{}}}'.format(','.join(
+        '{}="{}"'.format(name, force_text(value).replace('\\', r'\\')
+                         .replace('"', r'\"').replace('\n', r'\n'))
+        for name, value in labels))
+
+
+def _key(name, labels, suffix):
+    """Get the cache key for a single sample."""
+    return 'helpcenter:metrics:{}:{}:{}'.format(
+        name, _format_labels(labels), suffix)
+
+
+def _record(name, labels, suffix, amount):
+    """Add an amount to a sample in the current thread's buffer."""
+    samples = _buffer()
+    key = (name, labels, suffix)
+    samples[key] = samples.get(key, 0) + amount
+
+    interval = getattr(settings, 'HELPCENTER_METRICS_FLUSH_INTERVAL', 10)
+
+    if time.time() - _local.last_flush >= interval:
+        flush()
+
+
+class Metric(object):
+    """Base class for metrics.
+
+    Attributes:
+        documentation (str):
+            A description of the metric.
+        labelnames (tuple):
+            The names of the labels the metric is partitioned by.
+        name (str):
+            The name of the metric.
+    """
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        """Create and register a new metric."""
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.name = name
+
+        REGISTRY.append(self)
+
+    def _labels(self, labels):
+        """Convert keyword arguments to an ordered tuple of labels."""
+        return tuple(
+            (name, force_text(labels[name])) for name in self.labelnames)
+
+    def render(self, values, series):
+        """Render the metric in the Prometheus text format.
+
+        Args:
+            values (dict):
+                The combined value of each sample, keyed by cache key.
+            series (list):
+                The label sets the metric has samples for.
+
+        Returns:
+            list:
+                The lines representing the metric.
+        """
+        raise NotImplementedError
+
+    def suffixes(self):
+        """Get the suffixes of the samples stored for each label set."""
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """A value that only increases."""
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """Increase the counter.
+
+        Args:
+            amount (int):
+                The amount to increase the counter by.
+            **labels:
+                The labels identifying the counter to increase.
+        """
+        _record(self.name, self._labels(labels), 'value', amount)
+
+    def render(self, values, series):
+        """Render the counter's value for each label set."""
+        return [
+            '{}{} {}'.format(
+                self.name, _format_labels(labels),
+                values.get(_key(self.name, labels, 'value')) or 0)
+            for labels in series]
+
+    def suffixes(self):
+        """Counters store a single value."""
+        return ['value']
+
+
+class Histogram(Metric):
+    """A distribution of observed values.
+
+    Attributes:
+        buckets (tuple):
+            The upper bounds of the histogram's buckets. A final bucket
+            for values larger than every bound is added automatically.
+    """
+    type = 'histogram'
+
+    DEFAULT_BUCKETS = (
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name, documentation, labelnames=(), buckets=None):
+        """Create and register a new histogram."""
+        super(Histogram, self).__init__(name, documentation, labelnames)
+
+        self.buckets = tuple(buckets or self.DEFAULT_BUCKETS)
+
+    def observe(self, value, **labels):
+        """Record an observation.
+
+        Args:
+            value (float):
+                The observed value.
+            **labels:
+                The labels identifying the histogram to record in.
+        """
+        labels = self._labels(labels)
+        bucket = bisect.bisect_left(self.buckets, value)
+
+        _record(self.name, labels, 'bucket:{}'.format(bucket), 1)
+        _record(self.name, labels, 'count', 1)
+        _record(self.name, labels, 'sum', int(value * SUM_SCALE))
+
+    def render(self, values, series):
+        """Render the cumulative buckets, sum, and count of each set."""
+        lines = []
+        bounds = [repr(float(bound)) for bound in self.buckets] + ['+Inf']
+
+        for labels in series:
+            cumulative = 0
+
+            for i, bound in enumerate(bounds):
+                key = _key(self.name, labels, 'bucket:{}'.format(i))
+                cumulative += values.get(key) or 0
+
+                lines.append('{}_bucket{} {}'.format(
+                    self.name, _format_labels(labels, ('le', bound)),
+                    cumulative))
+
+            total = values.get(_key(self.name, labels, 'sum')) or 0
+
+            lines.append('{}_sum{} {}'.format(
+                self.name, _format_labels(labels),
+                float(total) / SUM_SCALE))
+            lines.append('{}_count{} {}'.format(
+                self.name, _format_labels(labels),
+                values.get(_key(self.name, labels, 'count')) or 0))
+
+        return lines
+
+    def suffixes(self):
+        """Histograms store their buckets, sum, and count."""
+        buckets = [
+            'bucket:{}'.format(i) for i in range(len(self.buckets) + 1)]
+
+        return buckets + ['count', 'sum']
+
+
+REGISTRY = []
+
+
+CACHE_HITS = Counter(
+    'helpcenter_cache_hits_total',
+    'Lookups in help center caches that were hits.',
+    ('view',))
+CACHE_MISSES = Counter(
+    'helpcenter_cache_misses_total',
+    'Lookups in help center caches that were misses.',
+    ('view',))
+DB_QUERIES = Counter(
+    'helpcenter_db_queries_total',
+    'Database queries made by help center views.',
+    ('view',))
+DB_TIME = Histogram(
+    'helpcenter_db_duration_seconds',
+    'Time spent in the database per request to a help center view.',
+    ('view',))
+REQUEST_LATENCY = Histogram(
+    'helpcenter_request_duration_seconds',
+    'Time spent handling requests to help center views.',
+    ('view',))
+SEARCH_LATENCY = Histogram(
+    'helpcenter_search_duration_seconds',
+    'Time spent answering help center searches.')
+
+
+def flush():
+    """Merge the current thread's samples into the shared cache.
+
+    Every sample is added to its total in the cache with an atomic
+    increment, so concurrent flushes from other threads and processes
+    are safe.
+    """
+    samples = _buffer()
+    _local.last_flush = time.time()
+
+    if not samples:
+        return
+
+    metrics_cache = cache.get_cache()
+    series = set(metrics_cache.get(SERIES_KEY) or ())
+    new_series = False
+
+    for (name, labels, suffix), amount in samples.items():
+        key = _key(name, labels, suffix)
+
+        if (name, labels) not in series:
+            series.add((name, labels))
+            new_series = True
+
+        try:
+            metrics_cache.incr(key, amount)
+        except ValueError:
+            if not metrics_cache.add(key, amount, None):
+                metrics_cache.incr(key, amount)
+
+    if new_series:
+        # Concurrent flushes may race to update the set of series. A
+        # series lost this way is re-added by its next flush.
+        metrics_cache.set(SERIES_KEY, series, None)
+
+    samples.clear()
+
+
+def record_view(metrics):
+    """Record the metrics of a help center view.
+
+    Args:
+        metrics (helpcenter.instrumentation.ViewMetrics):
+            The metrics recorded for the view.
+    """
+    view = metrics.name
+
+    REQUEST_LATENCY.observe(metrics.total_time, view=view)
+    DB_TIME.observe(metrics.db_time, view=view)
+    DB_QUERIES.inc(metrics.queries, view=view)
+
+    if metrics.cache_hits:
+        CACHE_HITS.inc(metrics.cache_hits, view=view)
+
+    if metrics.cache_misses:
+        CACHE_MISSES.inc(metrics.cache_misses, view=view)
+
+
+def render(extra=None):
+    """Render every metric in the Prometheus text format.
+
+    Args:
+        extra (list):
+            Additional gauges to include, as tuples containing the
+            name, description, and a list of `(labels, value)` pairs.
+
+    Returns:
+        str:
+            The exposition of every metric.
+    """
+    flush()
+
+    metrics_cache = cache.get_cache()
+    series = metrics_cache.get(SERIES_KEY) or ()
+
+    by_metric = {}
+    for name, labels in series:
+        by_metric.setdefault(name, []).append(labels)
+
+    keys = [
+        _key(metric.name, labels, suffix)
+        for metric in REGISTRY
+        for labels in by_metric.get(metric.name, [])
+        for suffix in metric.suffixes()]
+    values = metrics_cache.get_many(keys)
+
+    lines = []
+
+    for metric in REGISTRY:
+        lines.append('# HELP {} {}'.format(metric.name, metric.documentation))
+        lines.append('# TYPE {} {}'.format(metric.name, metric.type))
+        lines.extend(metric.render(
+            values, sorted(by_metric.get(metric.name, []))))
+
+    for name, documentation, samples in extra or []:
+        lines.append('# HELP {} {}'.format(name, documentation))
+        lines.append('# TYPE {} gauge'.format(name))
+
+        for labels, value in samples:
+            lines.append('{}{} {}'.format(name, _format_labels(labels), value))
+
+    return '\n'.join(lines) + '\n'
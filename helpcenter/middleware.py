@@ -0,0 +1,54 @@
+import time
+
+from django.conf import settings
+
+from helpcenter import routers
+
+try:
+    from django.utils.deprecation import MiddlewareMixin
+except ImportError:     # Django < 1.10
+    MiddlewareMixin = object
+
+
+class ReplicaStickinessMiddleware(MiddlewareMixin):
+    """Middleware that keeps a user's reads on the primary after a write.
+
+    When a request writes help center content, a cookie is set that
+    pins the user's requests to the primary database for the next
+    `HELPCENTER_REPLICA_PIN_SECONDS` seconds, giving the replicas time
+    to catch up with the change.
+    """
+    cookie_name = 'helpcenter_primary'
+
+    def process_request(self, request):
+        """Pin the request to the primary if the user recently wrote."""
+        routers.reset_state()
+
+        try:
+            pinned_until = float(request.COOKIES.get(self.cookie_name, 0))
+        except ValueError:
+            pinned_until = 0
+
+        if pinned_until > time.time():
+            routers.pin_to_primary()
+
+    def process_response(self, request, response):
+        """Set the pin cookie if the request wrote anything.
+
+        The thread's pin is always cleared, so it doesn't carry over to
+        the next request handled by the thread.
+        """
+        try:
+            if routers.has_written():
+                pin_seconds = getattr(
+                    settings, 'HELPCENTER_REPLICA_PIN_SECONDS', 15)
+
+                response.set_cookie(
+                    self.cookie_name,
+                    str(time.time() + pin_seconds),
+                    max_age=pin_seconds,
+                    httponly=True)
+        finally:
+            routers.reset_state()
+
+        return response
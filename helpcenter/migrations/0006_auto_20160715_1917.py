@@ -9,11 +9,11 @@ def add_edit_time(apps, schema_editor):
     """ Add edit_time to all existing Article instances """
     Article = apps.get_model('helpcenter', 'Article')
 
-    for article in Article.objects.all():
+    for article in Article.objects.using(schema_editor.connection.alias):
         if not article.time_edited:
             article.time_edited = article.time_published
 
-        article.save()
+        article.save(using=schema_editor.connection.alias)
 
 
 class Migration(migrations.Migration):
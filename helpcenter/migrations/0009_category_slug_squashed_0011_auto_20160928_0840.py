@@ -11,10 +11,10 @@ def create_slugs(apps, schema_editor):
     """Create slugs for existing categories."""
     Category = apps.get_model("helpcenter", "Category")
 
-    for category in Category.objects.all():
+    for category in Category.objects.using(schema_editor.connection.alias):
         slug = slugify(category.title)[:50]
         category.slug = slug
-        category.save()
+        category.save(using=schema_editor.connection.alias)
 
 
 class Migration(migrations.Migration):
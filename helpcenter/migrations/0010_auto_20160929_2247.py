@@ -10,10 +10,10 @@ def create_article_slugs(apps, schema_editor):
     """Create slugs for existing articles."""
     Article = apps.get_model("helpcenter", "Article")
 
-    for article in Article.objects.all():
+    for article in Article.objects.using(schema_editor.connection.alias):
         slug = slugify(article.title)[:50]
         article.slug = slug
-        article.save()
+        article.save(using=schema_editor.connection.alias)
 
 
 class Migration(migrations.Migration):
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 21:43
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('helpcenter', '0011_article_derived_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleRevision',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.BinaryField(verbose_name='compressed body or changes')),
+                ('is_snapshot', models.BooleanField(default=False, help_text='Snapshots contain the full body of the article.', verbose_name='revision is a snapshot')),
+                ('number', models.PositiveIntegerField(verbose_name='revision number')),
+                ('time_created', models.DateTimeField(default=django.utils.timezone.now, verbose_name='time created')),
+                ('title', models.CharField(max_length=200, verbose_name='article title')),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='helpcenter.Article', verbose_name='article')),
+            ],
+            options={
+                'ordering': ('article', 'number'),
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='articlerevision',
+            unique_together=set([('article', 'number')]),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 21:46
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('helpcenter', '0012_articlerevision'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='article',
+            options={'ordering': ('-time_published', '-id')},
+        ),
+        migrations.AlterIndexTogether(
+            name='article',
+            index_together=set([('draft', 'time_edited'), ('category', 'draft', 'time_published', 'id')]),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 21:48
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('helpcenter', '0013_article_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='article',
+            index_together=set([('draft', 'time_edited'), ('category', 'draft', 'time_published', 'id'), ('draft', 'time_published')]),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from helpcenter import slugs
+
+
+def deduplicate_slugs(apps, schema_editor):
+    """Give duplicate slugs a numeric suffix.
+
+    Category slugs must be unique, and article slugs must be unique
+    within their category.
+    """
+    Article = apps.get_model("helpcenter", "Article")
+    Category = apps.get_model("helpcenter", "Category")
+    alias = schema_editor.connection.alias
+
+    used = set()
+
+    for category in Category.objects.using(alias).order_by('pk'):
+        if not category.slug or category.slug in used:
+            category.slug = slugs.make_slug(category.title, used)
+            category.save(update_fields=['slug'], using=alias)
+
+        used.add(category.slug)
+
+    used = {}
+
+    for article in Article.objects.using(alias).order_by('pk'):
+        taken = used.setdefault(article.category_id, set())
+
+        if not article.slug or article.slug in taken:
+            article.slug = slugs.make_slug(article.title, taken)
+            article.save(update_fields=['slug'], using=alias)
+
+        taken.add(article.slug)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('helpcenter', '0014_article_publish_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            code=deduplicate_slugs,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 21:52
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('helpcenter', '0015_deduplicate_slugs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlugHistory',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(db_index=False, verbose_name='previous slug')),
+                ('time_changed', models.DateTimeField(default=django.utils.timezone.now, verbose_name='time changed')),
+            ],
+            options={
+                'verbose_name_plural': 'slug history',
+            },
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='slug',
+            field=models.SlugField(unique=True, verbose_name='Category URL Slug'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='article',
+            unique_together=set([('category', 'slug')]),
+        ),
+        migrations.AddField(
+            model_name='slughistory',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slug_history', to='helpcenter.Article', verbose_name='article'),
+        ),
+        migrations.AddField(
+            model_name='slughistory',
+            name='category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='helpcenter.Category', verbose_name='previous category'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='slughistory',
+            unique_together=set([('category', 'slug')]),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 22:01
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('helpcenter', '0016_unique_slugs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleViewDay',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='day')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='views')),
+            ],
+            options={
+                'ordering': ('-day',),
+            },
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='view count'),
+        ),
+        migrations.AddField(
+            model_name='articleviewday',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_days', to='helpcenter.Article', verbose_name='article'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='articleviewday',
+            unique_together=set([('article', 'day')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='articleviewday',
+            index_together=set([('day', 'article')]),
+        ),
+    ]
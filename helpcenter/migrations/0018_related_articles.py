@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 22:05
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('helpcenter', '0017_article_view_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedArticle',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveIntegerField(verbose_name='rank')),
+                ('score', models.FloatField(verbose_name='similarity score')),
+                ('time_computed', models.DateTimeField(default=django.utils.timezone.now, verbose_name='time computed')),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_articles', to='helpcenter.Article', verbose_name='article')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_from', to='helpcenter.Article', verbose_name='related article')),
+            ],
+            options={
+                'ordering': ('rank',),
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='relatedarticle',
+            unique_together=set([('article', 'rank')]),
+        ),
+    ]
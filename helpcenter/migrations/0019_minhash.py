@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 22:08
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from helpcenter import content, minhash
+
+
+def compute_signatures(apps, schema_editor):
+    """Compute the signatures and buckets of existing articles."""
+    Article = apps.get_model("helpcenter", "Article")
+    MinHashBucket = apps.get_model("helpcenter", "MinHashBucket")
+    alias = schema_editor.connection.alias
+
+    for article in Article.objects.using(alias).only('body'):
+        signature = minhash.get_signature(
+            content.process_body(article.body).text)
+
+        article.minhash = minhash.pack(signature)
+        article.save(using=alias, update_fields=['minhash'])
+
+        MinHashBucket.objects.using(alias).bulk_create([
+            MinHashBucket(article=article, key=key)
+            for key in minhash.get_bucket_keys(signature)])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('helpcenter', '0018_related_articles'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MinHashBucket',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.BigIntegerField(db_index=True, verbose_name='bucket key')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='minhash',
+            field=models.BinaryField(blank=True, default=b'', verbose_name='MinHash signature'),
+        ),
+        migrations.AddField(
+            model_name='minhashbucket',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='minhash_buckets', to='helpcenter.Article', verbose_name='article'),
+        ),
+        migrations.RunPython(
+            code=compute_signatures,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
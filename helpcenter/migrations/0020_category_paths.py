@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 22:18
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def compute_paths(apps, schema_editor):
+    """Compute the paths and depths of existing categories.
+
+    Categories that are their own ancestor, which used to be allowed,
+    are made top level categories to break the cycle.
+    """
+    Category = apps.get_model("helpcenter", "Category")
+    alias = schema_editor.connection.alias
+    categories = Category.objects.using(alias)
+
+    parents = dict(categories.values_list('pk', 'parent_id'))
+    children = {}
+
+    for pk, parent_id in parents.items():
+        children.setdefault(parent_id, []).append(pk)
+
+    paths = {}
+    roots = sorted(children.get(None, []))
+
+    while True:
+        stack = [(pk, '') for pk in roots]
+
+        while stack:
+            pk, parent_path = stack.pop()
+            paths[pk] = '{}{}/'.format(parent_path, pk)
+            stack.extend(
+                (child, paths[pk]) for child in children.get(pk, []))
+
+        remaining = sorted(set(parents) - set(paths))
+
+        if not remaining:
+            break
+
+        roots = remaining[:1]
+        children[parents[roots[0]]].remove(roots[0])
+        categories.filter(pk=roots[0]).update(parent=None)
+
+    for pk, path in paths.items():
+        categories.filter(pk=pk).update(
+            depth=path.count('/') - 1, path=path)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('helpcenter', '0019_minhash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='depth'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=255, verbose_name='materialized path'),
+        ),
+        migrations.RunPython(
+            code=compute_paths,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 22:31
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from helpcenter import fulltext
+
+
+def index_terms(apps, schema_editor):
+    """Store the terms of existing articles."""
+    Article = apps.get_model("helpcenter", "Article")
+    ArticleTerm = apps.get_model("helpcenter", "ArticleTerm")
+    alias = schema_editor.connection.alias
+
+    for pk, title, body_html in Article.objects.using(alias).values_list(
+            'pk', 'title', 'body_html').iterator():
+        ArticleTerm.objects.using(alias).bulk_create([
+            ArticleTerm(article_id=pk, term=term)
+            for term in sorted(fulltext.get_article_terms(title, body_html))])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('helpcenter', '0020_category_paths'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleTerm',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(db_index=True, max_length=50, verbose_name='term')),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='helpcenter.Article', verbose_name='article')),
+            ],
+        ),
+        migrations.RunPython(
+            code=index_terms,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 22:36
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def compute_labels(apps, schema_editor):
+    """Compute the labels of existing categories from their paths."""
+    Category = apps.get_model("helpcenter", "Category")
+    alias = schema_editor.connection.alias
+    categories = Category.objects.using(alias)
+
+    titles = dict(categories.values_list('pk', 'title'))
+
+    for pk, path in categories.values_list('pk', 'path'):
+        categories.filter(pk=pk).update(label=' > '.join(
+            titles[int(part)] for part in path.split('/')[:-1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('helpcenter', '0021_article_terms'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='label',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='label'),
+        ),
+        migrations.RunPython(
+            code=compute_labels,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
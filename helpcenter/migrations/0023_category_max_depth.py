@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 22:53
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('helpcenter', '0022_category_labels'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='parent',
+            field=models.ForeignKey(blank=True, help_text='Categories can be nested up to 20 levels deep.', null=True, on_delete=django.db.models.deletion.SET_NULL, to='helpcenter.Category', verbose_name='Parent Category'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 22:55
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def copy_category_slugs(apps, schema_editor):
+    """Store the slug of each history record's category."""
+    Category = apps.get_model("helpcenter", "Category")
+    SlugHistory = apps.get_model("helpcenter", "SlugHistory")
+    alias = schema_editor.connection.alias
+
+    for pk, slug in Category.objects.using(alias).values_list('pk', 'slug'):
+        SlugHistory.objects.using(alias).filter(category_id=pk).update(
+            category_slug=slug)
+
+
+def copy_categories(apps, schema_editor):
+    """Link each history record to the category with its slug."""
+    Category = apps.get_model("helpcenter", "Category")
+    SlugHistory = apps.get_model("helpcenter", "SlugHistory")
+    alias = schema_editor.connection.alias
+
+    SlugHistory.objects.using(alias).exclude(category_slug='').exclude(
+        category_slug__in=Category.objects.using(alias).values('slug'),
+    ).delete()
+
+    for pk, slug in Category.objects.using(alias).values_list('pk', 'slug'):
+        SlugHistory.objects.using(alias).filter(category_slug=slug).update(
+            category_id=pk)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('helpcenter', '0023_category_max_depth'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='slughistory',
+            name='category_slug',
+            field=models.SlugField(blank=True, db_index=False, default='', verbose_name='previous category slug'),
+        ),
+        migrations.RunPython(
+            code=copy_category_slugs,
+            reverse_code=copy_categories,
+        ),
+        migrations.AlterUniqueTogether(
+            name='slughistory',
+            unique_together=set([('category_slug', 'slug')]),
+        ),
+        migrations.RemoveField(
+            model_name='slughistory',
+            name='category',
+        ),
+    ]
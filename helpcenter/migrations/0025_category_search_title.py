@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 22:58
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def compute_search_titles(apps, schema_editor):
+    """Store the lowercase titles of existing categories."""
+    Category = apps.get_model("helpcenter", "Category")
+    alias = schema_editor.connection.alias
+    categories = Category.objects.using(alias)
+
+    for pk, title in categories.values_list('pk', 'title'):
+        categories.filter(pk=pk).update(search_title=title.lower())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('helpcenter', '0024_slug_history_category_slug'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='search_title',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=200, verbose_name='lowercase title'),
+        ),
+        migrations.RunPython(
+            code=compute_search_titles,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
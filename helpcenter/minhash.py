@@ -0,0 +1,160 @@
+"""MinHash signatures of article text.
+
+A MinHash signature is a short summary of a set of shingles (runs of
+consecutive words) such that the fraction of positions where two
+signatures agree estimates the Jaccard similarity of the two sets.
+
+Signatures are split into bands, and each band is hashed into a bucket
+key. Two texts with a high similarity are very likely to share at least
+one bucket, while dissimilar texts rarely do, so near-duplicates can be
+found by looking up the articles in the same buckets instead of
+comparing every pair of articles. With `BANDS` bands of `ROWS` rows,
+texts with a similarity of 0.8 share a bucket over 99.9% of the time,
+while texts with a similarity of 0.3 do so about 12% of the time.
+
+Signatures only depend on the text, so they are computed when an
+article is saved. See `helpcenter.duplicates` for how they are used.
+"""
+
+import hashlib
+import struct
+import zlib
+
+from helpcenter import content
+
+
+BANDS = 16
+
+ROWS = 4
+
+NUM_PERMUTATIONS = BANDS * ROWS
+
+# The number of words in each shingle
+SHINGLE_SIZE = 3
+
+# A Mersenne prime larger than any shingle hash
+PRIME = (1 << 61) - 1
+
+
+def _make_permutations():
+    """Generate the coefficients of the hash permutations.
+
+    The coefficients are derived from a fixed hash rather than a random
+    number generator so signatures are the same across processes and
+    Python versions.
+    """
+    permutations = []
+
+    for i in range(NUM_PERMUTATIONS):
+        digest = hashlib.sha1(
+            'helpcenter-minhash-{}'.format(i).encode('ascii')).digest()
+        a, b = struct.unpack('<QQ', digest[:16])
+        permutations.append((a % (PRIME - 1) + 1, b % PRIME))
+
+    return permutations
+
+
+PERMUTATIONS = _make_permutations()
+
+
+def get_bucket_keys(signature):
+    """Get the bucket keys of a signature.
+
+    Args:
+        signature (tuple):
+            The signature returned by `get_signature`.
+
+    Returns:
+        list:
+            A signed 64 bit key for each band of the signature, or an
+            empty list if the signature is empty.
+    """
+    if not signature:
+        return []
+
+    keys = []
+
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.md5(
+            struct.pack('<I{}Q'.format(ROWS), band, *rows)).digest()
+        keys.append(struct.unpack('<q', digest[:8])[0])
+
+    return keys
+
+
+def get_shingles(text):
+    """Get the set of shingles in a text.
+
+    Args:
+        text (str):
+            The plain text to get the shingles of.
+
+    Returns:
+        set:
+            Each run of `SHINGLE_SIZE` lowercase words in the text.
+            Texts with fewer words are a single shingle.
+    """
+    words = content.WORD_RE.findall(text.lower())
+
+    if not words:
+        return set()
+
+    if len(words) < SHINGLE_SIZE:
+        return {' '.join(words)}
+
+    return set(
+        ' '.join(words[i:i + SHINGLE_SIZE])
+        for i in range(len(words) - SHINGLE_SIZE + 1))
+
+
+def get_signature(text):
+    """Get the MinHash signature of a text.
+
+    Args:
+        text (str):
+            The plain text to get the signature of.
+
+    Returns:
+        tuple:
+            The `NUM_PERMUTATIONS` values of the signature, or an empty
+            tuple if the text has no words.
+    """
+    hashes = [
+        zlib.crc32(shingle.encode('utf-8')) & 0xffffffff
+        for shingle in get_shingles(text)]
+
+    if not hashes:
+        return ()
+
+    return tuple(
+        min((a * value + b) % PRIME for value in hashes)
+        for a, b in PERMUTATIONS)
+
+
+def get_similarity(signature, other):
+    """Estimate the similarity of the texts of two signatures.
+
+    Returns:
+        float:
+            The estimated Jaccard similarity of the two texts' shingles,
+            between 0 and 1.
+    """
+    if not signature or not other:
+        return 0.0
+
+    matches = sum(1 for a, b in zip(signature, other) if a == b)
+
+    return float(matches) / NUM_PERMUTATIONS
+
+
+def pack(signature):
+    """Pack a signature into bytes for storage."""
+    return struct.pack('<{}Q'.format(len(signature)), *signature)
+
+
+def unpack(data):
+    """Unpack a signature packed by `pack`."""
+    data = bytes(data or b'')
+
+    return struct.unpack('<{}Q'.format(len(data) // 8), data)
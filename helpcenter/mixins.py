@@ -1,7 +1,155 @@
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
 
-from helpcenter import utils
+from helpcenter import (
+    cache, instrumentation, profiling, utils, viewcounts)
+
+
+class CachedResponseMixin(object):
+    """Mixin that caches the responses served to anonymous users.
+
+    If the `HELPCENTER_CACHE_PAGES` setting is true, successful GET
+    requests from anonymous users are served from the cache for up to
+    `HELPCENTER_CACHE_TIMEOUT` seconds, allowing the request to be
+    answered without touching the database. Cached responses are
+    invalidated as soon as any article or category changes.
+
+    Authenticated users always receive a fresh response, since what
+    they see depends on their permissions.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        """Serve the response from the cache if possible."""
+        if not self.is_cacheable(request):
+            return super(CachedResponseMixin, self).dispatch(
+                request, *args, **kwargs)
+
+        page_cache = cache.get_cache()
+        key = cache.make_key('page', request.build_absolute_uri())
+
+        response = page_cache.get(key)
+        instrumentation.record_cache_access(response is not None)
+
+        if response is not None:
+            return response
+
+        response = super(CachedResponseMixin, self).dispatch(
+            request, *args, **kwargs)
+
+        if response.status_code == 200 and not response.streaming:
+            timeout = self.get_cache_timeout()
+
+            def store(response):
+                page_cache.set(key, response, timeout)
+
+            if hasattr(response, 'render') and callable(response.render):
+                response.add_post_render_callback(store)
+            else:
+                store(response)
+
+        return response
+
+    def get_cache_timeout(self):
+        """Get the number of seconds to cache a response for.
+
+        Returns:
+            int:
+                The value of the `HELPCENTER_CACHE_TIMEOUT` setting, or
+                the number of seconds until the next scheduled article
+                is published if that is sooner.
+        """
+        timeout = getattr(settings, 'HELPCENTER_CACHE_TIMEOUT', 300)
+        publish_time = cache.get_next_publish_time()
+
+        if publish_time is not None:
+            timeout = min(timeout, cache.seconds_until(publish_time))
+
+        return timeout
+
+    def is_cacheable(self, request):
+        """Determine if the response to a request can be cached.
+
+        Args:
+            request:
+                The request being handled.
+
+        Returns:
+            bool:
+                True if page caching is enabled and the request is an
+                anonymous GET or HEAD request.
+        """
+        return (getattr(settings, 'HELPCENTER_CACHE_PAGES', False) and
+                request.method in ('GET', 'HEAD') and
+                not request.user.is_authenticated())
+
+
+class InstrumentedViewMixin(object):
+    """Mixin recording metrics about each request to a view.
+
+    See `helpcenter.instrumentation` for details on what is recorded.
+    The response is rendered inside the view so the queries and time
+    spent rendering templates are attributed to the view.
+
+    Attributes:
+        query_budget (int or dict):
+            The maximum number of queries the view should make. For
+            view sets, this may be a dictionary mapping action names to
+            budgets.
+    """
+    query_budget = None
+
+    def dispatch(self, request, *args, **kwargs):
+        """Dispatch the request and record metrics about it."""
+        if not instrumentation.is_enabled():
+            return super(InstrumentedViewMixin, self).dispatch(
+                request, *args, **kwargs)
+
+        with instrumentation.instrument() as metrics:
+            response = super(InstrumentedViewMixin, self).dispatch(
+                request, *args, **kwargs)
+
+            if (callable(getattr(response, 'render', None)) and
+                    not response.is_rendered):
+                with metrics.time_render():
+                    response.render()
+
+        metrics.budget = self.get_query_budget()
+        metrics.name = self.get_instrumentation_name()
+
+        instrumentation.view_instrumented.send(
+            sender=self.__class__, metrics=metrics)
+        instrumentation.check_budget(metrics)
+
+        return response
+
+    def get_instrumentation_name(self):
+        """Get the name the view's metrics are recorded under.
+
+        Returns:
+            str:
+                The name of the view's class, followed by the action
+                being performed for view sets.
+        """
+        action = getattr(self, 'action', None)
+
+        if action:
+            return '{}.{}'.format(self.__class__.__name__, action)
+
+        return self.__class__.__name__
+
+    def get_query_budget(self):
+        """Get the query budget for the current request.
+
+        Returns:
+            int:
+                The view's query budget, or `None` if the view has no
+                budget.
+        """
+        if isinstance(self.query_budget, dict):
+            return self.query_budget.get(getattr(self, 'action', None))
+
+        return self.query_budget
 
 
 class OptionalFormMixin(object):
@@ -63,3 +211,77 @@ class PermissionsMixin(object):
             raise PermissionDenied()
 
         return super(PermissionsMixin, self).dispatch(request, *args, **kwargs)
+
+
+class ProfilingMixin(object):
+    """Mixin allowing staff to profile requests to the view.
+
+    If a staff member adds `_profile=cprofile` or `_profile=sql` to
+    the query string, a plain text report from
+    `helpcenter.profiling` is returned instead of the view's normal
+    response. The ordering of a `cProfile` report can be changed with
+    the `_profile_sort` parameter.
+
+    Profiling can be disabled entirely by setting
+    `HELPCENTER_PROFILING` to `False`.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        """Profile the request if requested by a staff member."""
+        mode = request.GET.get('_profile')
+
+        if mode not in ('cprofile', 'sql') or not self.can_profile(request):
+            return super(ProfilingMixin, self).dispatch(
+                request, *args, **kwargs)
+
+        def handle():
+            return super(ProfilingMixin, self).dispatch(
+                request, *args, **kwargs)
+
+        if mode == 'sql':
+            report = profiling.profile_sql(handle)
+        else:
+            sort = request.GET.get('_profile_sort')
+
+            if sort not in profiling.SORT_KEYS:
+                sort = 'cumulative'
+
+            report = profiling.profile_cprofile(
+                self.__class__.__name__, handle, sort=sort)
+
+        return HttpResponse(report, content_type='text/plain; charset=utf-8')
+
+    def can_profile(self, request):
+        """Determine if the user may profile the request.
+
+        Returns:
+            bool:
+                True if profiling is enabled and the user is a staff
+                member.
+        """
+        return (getattr(settings, 'HELPCENTER_PROFILING', True) and
+                request.user.is_staff)
+
+
+class ViewCountMixin(object):
+    """Mixin counting the views of articles.
+
+    Views using the mixin mark the response showing an article by
+    setting its `viewed_article_pk` attribute. The attribute is kept
+    when a response is cached, so responses served by
+    `CachedResponseMixin` are counted as well as long as this mixin
+    comes first. See `helpcenter.viewcounts` for how views are stored.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        """Dispatch the request and count the article it shows."""
+        response = super(ViewCountMixin, self).dispatch(
+            request, *args, **kwargs)
+
+        pk = getattr(response, 'viewed_article_pk', None)
+
+        if (pk is not None and request.method == 'GET' and
+                response.status_code == 200):
+            viewcounts.record_view(pk)
+
+        return response
@@ -1,16 +1,131 @@
+import json
+
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.core.urlresolvers import reverse
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models.functions import Concat, Substr
 from django.utils import timezone
-from django.utils.text import slugify
+
+from helpcenter import content, minhash, slugs
+
+
+class ArticleQuerySet(models.QuerySet):
+    """Custom queryset for articles."""
+    # The fields needed to display an article in a listing
+    LISTING_FIELDS = (
+        'category__id', 'category__parent_id', 'category__slug',
+        'category__title', 'draft', 'excerpt', 'id', 'slug',
+        'time_published', 'title',
+    )
+
+    def for_listing(self):
+        """Only load the fields used to list articles.
+
+        An article's body and the fields derived from it can be much
+        larger than the rest of the article, so they are not loaded.
+        The article's category is fetched in the same query.
+
+        Returns:
+            ArticleQuerySet:
+                The articles with only their listing fields loaded.
+        """
+        return self.select_related('category').only(*self.LISTING_FIELDS)
+
+    def edited_since(self, time):
+        """Get the published articles edited after a certain time.
+
+        Args:
+            time (datetime):
+                The time to get changes since.
+
+        Returns:
+            ArticleQuerySet:
+                The articles edited after the given time, in the order
+                they were edited.
+        """
+        return self.filter(
+            draft=False, time_edited__gt=time).order_by('time_edited', 'id')
+
+    def published(self, now=None):
+        """Get the articles that are visible to the public.
+
+        Articles are published once they are no longer drafts and
+        their publish time has passed.
+
+        Args:
+            now (datetime):
+                The time to check against. Defaults to the current
+                time.
+
+        Returns:
+            ArticleQuerySet:
+                The published articles.
+        """
+        return self.filter(
+            draft=False, time_published__lte=now or timezone.now())
+
+    def scheduled(self, now=None):
+        """Get the articles that are scheduled to be published.
+
+        Args:
+            now (datetime):
+                The time to check against. Defaults to the current
+                time.
+
+        Returns:
+            ArticleQuerySet:
+                The articles that aren't drafts but have a publish time
+                in the future.
+        """
+        return self.filter(
+            draft=False, time_published__gt=now or timezone.now())
+
+    def visible_to(self, user):
+        """Get the articles a user is allowed to see.
+
+        Users who can change articles can see drafts and scheduled
+        articles. Everyone else can only see published articles.
+
+        Args:
+            user:
+                The user viewing the articles.
+
+        Returns:
+            ArticleQuerySet:
+                The articles visible to the user.
+        """
+        if user.has_perm('helpcenter.change_article'):
+            return self
+
+        return self.published()
 
 
 class Article(models.Model):
     """ Model to represent a help article """
+    # Fields incremented in place by `helpcenter.viewcounts`, which are
+    # never written back when the article is saved.
+    COUNTER_FIELDS = ('view_count',)
+
+    # Fields that the article's indexes and revisions are built from
+    CONTENT_FIELDS = ('body', 'title')
+
+    # Fields deciding whether the article is published
+    PUBLISHING_FIELDS = ('draft', 'time_published')
+
+    # Fields computed from the body whenever it changes
+    DERIVED_FIELDS = ('body_html', 'excerpt', 'minhash', 'reading_time',
+                      'toc', 'word_count')
+
     body = models.TextField(
         help_text="The body of an article can contain HTML as well as text.",
         verbose_name="Article Body Content")
 
+    body_html = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name="sanitized body")
+
     category = models.ForeignKey(
         'Category',
         on_delete=models.SET_NULL,
@@ -24,6 +139,23 @@ class Article(models.Model):
         help_text="Marking an article as a draft will hide it from users.",
         verbose_name="article is a draft")
 
+    excerpt = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name="plain text excerpt")
+
+    minhash = models.BinaryField(
+        blank=True,
+        default=b'',
+        editable=False,
+        verbose_name="MinHash signature")
+
+    reading_time = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="The estimated reading time in minutes.",
+        verbose_name="reading time")
+
     slug = models.SlugField(
         verbose_name='Article URL Slug')
 
@@ -43,19 +175,85 @@ class Article(models.Model):
         help_text="An article title is restricted to 200 characters.",
         verbose_name="Article Title")
 
+    toc = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name="table of contents")
+
+    view_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="view count")
+
+    word_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="word count")
+
+    objects = ArticleQuerySet.as_manager()
+
+    class Meta:
+        """ Meta options for the Article model """
+        index_together = (
+            # Listing articles in a category, newest first
+            ('category', 'draft', 'time_published', 'id'),
+            # Finding recently edited articles
+            ('draft', 'time_edited'),
+            # Finding published and scheduled articles
+            ('draft', 'time_published'),
+        )
+        ordering = ('-time_published', '-id')
+        unique_together = ('category', 'slug')
+
     def __str__(self):
         """ Return the Article's title """
         return self.title
 
-    def get_absolute_url(self):
-        """ Get the url of the instance's detail view """
+    @staticmethod
+    def make_url(pk, category_slug, slug):
+        """Get the canonical URL of an article.
+
+        If the `HELPCENTER_SLUG_URLS` setting is true, articles are
+        identified by their category's slug and their own slug.
+        Otherwise, their primary key is included in the URL.
+
+        Args:
+            pk (int):
+                The article's primary key.
+            category_slug (str):
+                The slug of the article's category, or None if it
+                doesn't have one.
+            slug (str):
+                The article's slug.
+
+        Returns:
+            str:
+                The URL of the article's detail view.
+        """
+        if getattr(settings, 'HELPCENTER_SLUG_URLS', False):
+            kwargs = {'article_slug': slug}
+
+            if category_slug is not None:
+                kwargs['category_slug'] = category_slug
+
+            return reverse('helpcenter:article-slug-detail', kwargs=kwargs)
+
         kwargs = {
-            'article_pk': self.pk,
-            'article_slug': self.slug,
+            'article_pk': pk,
+            'article_slug': slug,
         }
 
         return reverse('helpcenter:article-detail', kwargs=kwargs)
 
+    def get_absolute_url(self):
+        """ Get the url of the instance's detail view """
+        category_slug = None
+
+        if getattr(settings, 'HELPCENTER_SLUG_URLS', False) and self.category:
+            category_slug = self.category.slug
+
+        return self.make_url(self.pk, category_slug, self.slug)
+
     def get_delete_url(self):
         """ Get the url of the instance's delete view """
         kwargs = {
@@ -81,6 +279,33 @@ class Article(models.Model):
 
         return reverse('helpcenter:article-update', kwargs=kwargs)
 
+    @property
+    def table_of_contents(self):
+        """list: The headings in the article's body.
+
+        Each heading is a dictionary containing the `id` of the heading
+        element, the heading's `level`, and its `title`.
+        """
+        if not self.toc:
+            return []
+
+        return json.loads(self.toc)
+
+    def update_derived_fields(self):
+        """Compute the fields derived from the article's body.
+
+        This is called whenever the article is saved, but has to be
+        called explicitly when saving articles in bulk.
+        """
+        processed = content.process_body(self.body)
+
+        self.body_html = processed.html
+        self.excerpt = content.get_excerpt(processed.text)
+        self.minhash = minhash.pack(minhash.get_signature(processed.text))
+        self.reading_time = content.get_reading_time(processed.word_count)
+        self.toc = json.dumps(processed.toc) if processed.toc else ''
+        self.word_count = processed.word_count
+
     def save(self, *args, **kwargs):
         """Save the article instance to the database.
 
@@ -88,8 +313,13 @@ class Article(models.Model):
         the instance's `time_published` attribute if the instance is
         being converted from a draft to a normal article.
 
-        It also generates the article's slug if it is being created for
-        the first time.
+        It also generates the article's slug when the article is
+        created or its title changes, and records the previous slug so
+        old links can be redirected. The fields derived from the
+        article's body are only updated when the body changes, and
+        an existing article's title, body, draft state, and publish
+        time are only written when they change, so its indexes and
+        revisions are left alone otherwise.
 
         Args:
             *args: Passed to the default implementation.
@@ -98,20 +328,250 @@ class Article(models.Model):
         Returns:
             Article: The new saved instance.
         """
-        if self.pk and not self.draft:
-            old_obj = Article.objects.get(pk=self.pk)
+        # Read the previous state from the database being written to,
+        # since a replica may not have the latest version yet.
+        using = kwargs.get('using') or router.db_for_write(
+            Article, instance=self)
+        old_obj = None
 
-            if old_obj.draft:
-                self.time_published = timezone.now()
+        if self.pk:
+            old_obj = Article.objects.using(using).only(
+                'body', 'category', 'draft', 'slug', 'time_published',
+                'title').filter(
+                    pk=self.pk).first()
 
-        if not self.id:
-            self.slug = slugify(self.title)[:50]
+        if old_obj is not None and old_obj.draft and not self.draft:
+            self.time_published = timezone.now()
+
+        if (old_obj is None or old_obj.title != self.title or
+                old_obj.category_id != self.category_id):
+            # Articles moved to another category keep their slug if
+            # it's available.
+            title = self.title
+
+            if old_obj is not None and old_obj.title == self.title:
+                title = old_obj.slug
+
+            self.slug = slugs.unique_slug(
+                title,
+                Article.objects.using(using).filter(
+                    category_id=self.category_id).exclude(pk=self.pk))
+
+        update_fields = kwargs.get('update_fields')
+        tracked = self.CONTENT_FIELDS + self.PUBLISHING_FIELDS
+        changed = set(tracked)
+
+        if old_obj is not None:
+            changed = set(
+                name for name in tracked
+                if getattr(old_obj, name) != getattr(self, name))
+
+        if update_fields is not None:
+            changed &= set(update_fields)
+
+        if 'body' in changed:
+            self.update_derived_fields()
+
+        if update_fields is None and old_obj is not None:
+            # Saving counters would overwrite views counted since the
+            # article was loaded. Leaving out unchanged content and
+            # publishing fields lets the signal handlers skip
+            # re-indexing the article and invalidating its terms.
+            unchanged = set(tracked) - changed
+
+            if 'body' in unchanged:
+                unchanged.update(self.DERIVED_FIELDS)
+
+            update_fields = kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and
+                field.name not in self.COUNTER_FIELDS and
+                field.name not in unchanged]
+
+        if update_fields is not None and 'body' in changed:
+            kwargs['update_fields'] = (
+                set(update_fields) | set(self.DERIVED_FIELDS))
+
+        result = super(Article, self).save(*args, **kwargs)
+
+        if old_obj is not None:
+            SlugHistory.record(
+                [(self, old_obj.category_id, old_obj.slug)], using=using)
+
+        return result
+
+
+class ArticleRevision(models.Model):
+    """Model to represent a past version of an article.
+
+    To save space, only some revisions store the article's full body.
+    Every other revision stores the changes between the most recent
+    full revision and itself. See `helpcenter.revisions`.
+    """
+    article = models.ForeignKey(
+        'Article',
+        on_delete=models.CASCADE,
+        related_name='revisions',
+        verbose_name="article")
+
+    data = models.BinaryField(
+        verbose_name="compressed body or changes")
+
+    is_snapshot = models.BooleanField(
+        default=False,
+        help_text="Snapshots contain the full body of the article.",
+        verbose_name="revision is a snapshot")
+
+    number = models.PositiveIntegerField(
+        verbose_name="revision number")
+
+    time_created = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="time created")
+
+    title = models.CharField(
+        max_length=200,
+        verbose_name="article title")
+
+    class Meta:
+        """ Meta options for the ArticleRevision model """
+        ordering = ('article', 'number')
+        unique_together = ('article', 'number')
+
+    def __str__(self):
+        """ Return the revision's title and number """
+        return "{} (revision {})".format(self.title, self.number)
+
+
+class ArticleTerm(models.Model):
+    """Model to represent a word appearing in an article.
+
+    The terms of every article form an inverted index of their titles
+    and bodies, which is used to search articles in the admin. See
+    `helpcenter.fulltext`.
+    """
+    article = models.ForeignKey(
+        'Article',
+        on_delete=models.CASCADE,
+        related_name='terms',
+        verbose_name="article")
+
+    term = models.CharField(
+        max_length=50,
+        db_index=True,
+        verbose_name="term")
+
+    def __str__(self):
+        """ Return the term """
+        return self.term
+
+
+class ArticleViewDay(models.Model):
+    """Model to represent the number of times an article was viewed
+    on a single day.
+
+    Views are added in batches. See `helpcenter.viewcounts`.
+    """
+    article = models.ForeignKey(
+        'Article',
+        on_delete=models.CASCADE,
+        related_name='view_days',
+        verbose_name="article")
+
+    day = models.DateField(
+        verbose_name="day")
+
+    views = models.PositiveIntegerField(
+        default=0,
+        verbose_name="views")
+
+    class Meta:
+        """ Meta options for the ArticleViewDay model """
+        index_together = (
+            # Summing recent views across articles
+            ('day', 'article'),
+        )
+        ordering = ('-day',)
+        unique_together = ('article', 'day')
+
+    def __str__(self):
+        """ Return the number of views and the day """
+        return "{} views on {}".format(self.views, self.day.isoformat())
+
+
+class CategoryQuerySet(models.QuerySet):
+    """Custom queryset for categories."""
 
-        return super(Article, self).save(*args, **kwargs)
+    def delete(self):
+        """Delete the categories according to the deletion policy.
+
+        See `helpcenter.categories`.
+        """
+        # Imported here since the module depends on the models
+        from helpcenter import categories
+
+        return categories.delete_categories(self)
+
+    delete.alters_data = True
+    delete.queryset_only = True
 
 
 class Category(models.Model):
-    """ Model to represent a category to contain articles """
+    """Model to represent a category to contain articles.
+
+    Each category stores its materialized path, the ids of its ancestors
+    and itself separated by slashes, and its depth in the tree. The path
+    lets a category's descendants be found with a single query, and
+    moving a category rewrites the paths of its whole subtree with a
+    single update.
+
+    Categories can be nested at most `MAX_DEPTH` levels deep, which
+    keeps the longest possible path within the length of its column.
+
+    The category's label, the titles of its ancestors and itself like
+    ``Parent > Child``, is stored as well so categories can be listed
+    without looking up their ancestors. It is kept up to date along
+    with the paths.
+
+    A lowercase copy of the title is stored in an indexed column, so
+    categories can be found by a prefix of their title regardless of
+    case using the index.
+    """
+    # Separates the titles in a category's label
+    LABEL_SEPARATOR = ' > '
+
+    # The maximum number of levels categories can be nested in. With ids
+    # of up to 10 digits, the path of the deepest category still fits in
+    # 255 characters.
+    MAX_DEPTH = 20
+
+    depth = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="depth")
+
+    label = models.TextField(
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="label")
+
+    path = models.CharField(
+        blank=True,
+        db_index=True,
+        default='',
+        editable=False,
+        max_length=255,
+        verbose_name="materialized path")
+
+    search_title = models.CharField(
+        blank=True,
+        db_index=True,
+        default='',
+        editable=False,
+        max_length=200,
+        verbose_name="lowercase title")
+
     title = models.CharField(
         max_length=200,
         db_index=True,
@@ -123,22 +583,22 @@ class Category(models.Model):
         on_delete=models.SET_NULL,
         null=True,
         blank=True,
-        help_text="Categories can be nested as deep as you would like.",
+        help_text="Categories can be nested up to 20 levels deep.",
         verbose_name="Parent Category")
 
     slug = models.SlugField(
+        unique=True,
         verbose_name="Category URL Slug")
 
+    objects = CategoryQuerySet.as_manager()
+
     class Meta:
         """ Meta options for the Category model """
         verbose_name_plural = 'categories'
 
     def __str__(self):
         """ Return the Category's hierarchy in string form """
-        if self.parent:
-            return "{} > {}".format(self.parent, self.title)
-
-        return self.title
+        return self.label or self.title
 
     @property
     def article_list(self):
@@ -149,14 +609,62 @@ class Category(models.Model):
         categories as well.
         """
         if getattr(settings, 'HELPCENTER_EXPANDED_ARTICLE_LIST', False):
-            articles = self.article_set.all()
+            return Article.objects.filter(
+                category__path__startswith=self.path)
+
+        return self.article_set.all()
+
+    def clean(self):
+        """Ensure the category can be moved to its parent.
 
-            for category in self.category_set.all():
-                articles |= category.article_list
+        Raises:
+            ValidationError:
+                If the category's parent is the category itself or one
+                of its descendants, or the category would be nested more
+                than `MAX_DEPTH` levels deep.
+        """
+        if self.parent_id is None:
+            return
 
-            return articles
+        if self.creates_cycle(self.parent.path):
+            raise ValidationError({
+                'parent': "A category can't be moved into itself or one of "
+                          "its subcategories.",
+            })
 
-        return self.article_set.all()
+        if self.is_too_deep(self.parent.path, self.path or None):
+            raise ValidationError({
+                'parent': self.get_max_depth_message(),
+            })
+
+    def creates_cycle(self, parent_path):
+        """Determine if moving the category would create a cycle.
+
+        This takes time proportional to the depth of the new parent.
+
+        Args:
+            parent_path (str):
+                The path of the category's new parent.
+
+        Returns:
+            bool:
+                True if the category is in the given path, meaning the
+                new parent is the category itself or one of its
+                descendants.
+        """
+        return (self.pk is not None and
+                str(self.pk) in parent_path.split('/'))
+
+    def delete(self, using=None, keep_parents=False):
+        """Delete the category according to the deletion policy.
+
+        See `helpcenter.categories`.
+        """
+        using = using or router.db_for_write(Category, instance=self)
+        result = Category.objects.using(using).filter(pk=self.pk).delete()
+        self.pk = None
+
+        return result
 
     def get_absolute_url(self):
         """ Get the url of the instance's detail view """
@@ -192,22 +700,332 @@ class Category(models.Model):
 
         return reverse('helpcenter:category-update', kwargs=kwargs)
 
-    @property
-    def num_articles(self):
-        """int: Return the number of articles in the category."""
-        articles = self.article_set.exclude(draft=True).count()
+    @classmethod
+    def get_max_depth_message(cls):
+        """Get the error message for categories nested too deeply."""
+        return "Categories can't be nested more than {} levels deep.".format(
+            cls.MAX_DEPTH)
+
+    @staticmethod
+    def get_path_segment(pk):
+        """Get the part of a path identifying a category.
+
+        Args:
+            pk (int):
+                The id of the category.
+
+        Returns:
+            str:
+                The id followed by the path separator.
+        """
+        return '{}/'.format(pk)
+
+    @classmethod
+    def is_too_deep(cls, parent_path, path=None, using=None):
+        """Determine if moving a category would nest it too deeply.
 
-        for category in self.category_set.all():
-            articles += category.num_articles
+        Args:
+            parent_path (str):
+                The path of the category's new parent.
+            path (str):
+                The stored path of the category, or None if it is being
+                created.
+            using (str):
+                The database the category is stored in.
+
+        Returns:
+            bool:
+                True if the category or one of its descendants would be
+                nested more than `MAX_DEPTH` levels deep.
+        """
+        depth = parent_path.count('/')
+        height = 0
+
+        if path:
+            if path[:path.rstrip('/').rfind('/') + 1] == parent_path:
+                # The category isn't moving.
+                return False
+
+            deepest = Category.objects.using(using).filter(
+                path__startswith=path).aggregate(
+                    models.Max('depth'))['depth__max']
+            height = (deepest or 0) - (path.count('/') - 1)
+
+        return depth + height >= cls.MAX_DEPTH
+
+    @classmethod
+    def make_label(cls, parent_label, title):
+        """Get the label of a category.
 
-        return articles
+        Args:
+            parent_label (str):
+                The label of the category's parent, or an empty string
+                if it is a top level category.
+            title (str):
+                The category's title.
+
+        Returns:
+            str:
+                The parent's label followed by the category's title.
+        """
+        if not parent_label:
+            return title
+
+        return parent_label + cls.LABEL_SEPARATOR + title
+
+    @property
+    def num_articles(self):
+        """int: Return the number of published articles in the category."""
+        return Article.objects.published().filter(
+            category__path__startswith=self.path).count()
 
     def save(self, *args, **kwargs):
         """Save the category to the database.
 
-        If the category is being created, its slug is generated.
+        If the category is being created, a unique slug is generated.
+
+        The category's path, depth, and label are updated from its
+        parent. If the category has moved to a new parent or been
+        renamed, the paths, depths, and labels of all its descendants
+        are updated with a single query.
+
+        Raises:
+            ValidationError:
+                If the category's parent is the category itself or one
+                of its descendants, or the category would be nested more
+                than `MAX_DEPTH` levels deep.
         """
+        using = kwargs.get('using') or router.db_for_write(
+            Category, instance=self)
+        categories = Category.objects.using(using)
+
         if not self.id:
-            self.slug = slugify(self.title)[:50]
+            self.slug = slugs.unique_slug(self.title, categories)
+
+        with transaction.atomic(using=using):
+            # The stored paths are used rather than the paths of the
+            # instances, which could be stale.
+            stored = dict(
+                (pk, (path, label)) for pk, path, label in categories.filter(
+                    pk__in=[pk for pk in (self.pk, self.parent_id)
+                            if pk is not None],
+                ).order_by().values_list('pk', 'path', 'label'))
+            parent_path, parent_label = stored.get(self.parent_id, ('', ''))
+
+            if self.parent_id is not None and self.creates_cycle(
+                    parent_path):
+                raise ValidationError(
+                    "A category can't be moved into itself or one of its "
+                    "subcategories.")
+
+            old_path, old_label = stored.get(self.pk, (None, None))
+
+            if self.is_too_deep(parent_path, old_path, using):
+                raise ValidationError(self.get_max_depth_message())
+
+            self.label = self.make_label(parent_label, self.title)
+            self.search_title = self.title.lower()
+
+            if old_path is not None:
+                self._set_path(parent_path)
+
+                update_fields = kwargs.get('update_fields')
+
+                if update_fields is not None:
+                    update_fields = set(update_fields)
+
+                    if 'parent' in update_fields:
+                        update_fields |= {'depth', 'label', 'path'}
+
+                    if 'title' in update_fields:
+                        update_fields |= {'label', 'search_title'}
+
+                    kwargs['update_fields'] = update_fields
+
+            result = super(Category, self).save(*args, **kwargs)
+
+            if old_path is None:
+                # The path of a new category includes its id, which isn't
+                # known until it is inserted.
+                self._set_path(parent_path)
+                categories.filter(pk=self.pk).update(
+                    depth=self.depth, path=self.path)
+
+                # Links into a deleted category with the same slug now
+                # belong to this category, so they aren't redirected.
+                SlugHistory.objects.using(using).filter(
+                    category_slug=self.slug).delete()
+            elif old_path != self.path or old_label != self.label:
+                categories.filter(path__startswith=old_path).exclude(
+                    pk=self.pk).update(
+                        depth=models.F('depth') + (
+                            self.depth - old_path.count('/') + 1),
+                        label=Concat(
+                            models.Value(self.label + self.LABEL_SEPARATOR),
+                            Substr('label', len(
+                                old_label + self.LABEL_SEPARATOR) + 1)),
+                        path=Concat(
+                            models.Value(self.path),
+                            Substr('path', len(old_path) + 1)))
+
+        return result
+
+    def _set_path(self, parent_path):
+        """Set the category's path and depth below its parent's path."""
+        self.path = parent_path + self.get_path_segment(self.pk)
+        self.depth = parent_path.count('/')
+
+
+class MinHashBucket(models.Model):
+    """Model to represent a bucket an article's text hashes into.
+
+    Articles sharing a bucket are likely to be near-duplicates. See
+    `helpcenter.duplicates`.
+    """
+    article = models.ForeignKey(
+        'Article',
+        on_delete=models.CASCADE,
+        related_name='minhash_buckets',
+        verbose_name="article")
+
+    key = models.BigIntegerField(
+        db_index=True,
+        verbose_name="bucket key")
+
+    def __str__(self):
+        """ Return the bucket key """
+        return str(self.key)
+
+
+class RelatedArticle(models.Model):
+    """Model to represent an article similar to another article.
+
+    The related articles of every article are precomputed. See
+    `helpcenter.related`.
+    """
+    article = models.ForeignKey(
+        'Article',
+        on_delete=models.CASCADE,
+        related_name='related_articles',
+        verbose_name="article")
+
+    rank = models.PositiveIntegerField(
+        verbose_name="rank")
+
+    related = models.ForeignKey(
+        'Article',
+        on_delete=models.CASCADE,
+        related_name='related_from',
+        verbose_name="related article")
+
+    score = models.FloatField(
+        verbose_name="similarity score")
+
+    time_computed = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="time computed")
+
+    class Meta:
+        """ Meta options for the RelatedArticle model """
+        ordering = ('rank',)
+        unique_together = ('article', 'rank')
+
+    def __str__(self):
+        """ Return the rank and score """
+        return "#{} ({:.3f})".format(self.rank, self.score)
+
+
+class SlugHistory(models.Model):
+    """Model to represent a slug an article used to have.
+
+    Links using an old slug are redirected to the article's current
+    URL. See `helpcenter.redirects`.
+
+    The slug of the article's previous category is stored rather than
+    a reference to the category, so links into a category are still
+    redirected after the category is deleted.
+    """
+    article = models.ForeignKey(
+        'Article',
+        on_delete=models.CASCADE,
+        related_name='slug_history',
+        verbose_name="article")
+
+    category_slug = models.SlugField(
+        blank=True,
+        db_index=False,
+        default='',
+        verbose_name="previous category slug")
+
+    slug = models.SlugField(
+        db_index=False,
+        verbose_name="previous slug")
+
+    time_changed = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="time changed")
+
+    class Meta:
+        """ Meta options for the SlugHistory model """
+        unique_together = ('category_slug', 'slug')
+        verbose_name_plural = 'slug history'
+
+    def __str__(self):
+        """ Return the old slug """
+        return self.slug
+
+    @classmethod
+    def record(cls, changes, using=None):
+        """Record the previous slugs of articles.
+
+        Only articles whose slug or category actually changed are
+        recorded. An old slug can only point to one article, so any
+        previous record of the same slug is replaced. Records of the
+        articles' new slugs are removed, since those slugs are in use
+        again.
+
+        Args:
+            changes (list):
+                A tuple for each saved article containing the article,
+                its previous category id, and its previous slug. The
+                previous categories must still exist.
+            using (str):
+                The database to write to.
+        """
+        changes = [
+            (article, category_id, slug)
+            for article, category_id, slug in changes
+            if (category_id, slug) != (article.category_id, article.slug)]
+
+        if not changes:
+            return
+
+        using = using or router.db_for_write(cls)
+
+        category_ids = set()
+
+        for article, category_id, slug in changes:
+            category_ids.update((article.category_id, category_id))
+
+        category_ids.discard(None)
+        category_slugs = {}
+
+        if category_ids:
+            category_slugs = dict(Category.objects.using(using).filter(
+                pk__in=category_ids).values_list('pk', 'slug'))
+
+        stale = models.Q()
+
+        for article, category_id, slug in changes:
+            stale |= models.Q(
+                category_slug=category_slugs.get(category_id, ''), slug=slug)
+            stale |= models.Q(
+                category_slug=category_slugs.get(article.category_id, ''),
+                slug=article.slug)
 
-        return super(Category, self).save(*args, **kwargs)
+        cls.objects.using(using).filter(stale).delete()
+        cls.objects.using(using).bulk_create([
+            cls(article=article,
+                category_slug=category_slugs.get(category_id, ''),
+                slug=slug)
+            for article, category_id, slug in changes])
@@ -0,0 +1,125 @@
+"""On-demand profiling of help center views.
+
+Staff members can profile a single request to a help center view by
+adding a `_profile` query parameter to it. With `_profile=cprofile`,
+the request is run under `cProfile` and the sorted statistics are
+returned instead of the normal response. With `_profile=sql`, every
+query made by the request is returned in the order it was executed.
+"""
+
+import cProfile
+import os
+import pstats
+import time
+import timeit
+from collections import Counter
+
+from django.conf import settings
+from django.utils.six import StringIO
+
+from helpcenter.instrumentation import capture_queries
+
+
+# The orderings accepted by the `_profile_sort` query parameter
+SORT_KEYS = ('calls', 'cumulative', 'ncalls', 'time', 'tottime')
+
+
+def _render(response):
+    """Render a response if it hasn't been rendered yet."""
+    render = getattr(response, 'render', None)
+
+    if callable(render) and not response.is_rendered:
+        response.render()
+
+    return response
+
+
+def profile_cprofile(name, func, sort='cumulative', limit=100):
+    """Profile a function using `cProfile`.
+
+    If the `HELPCENTER_PROFILE_DIR` setting is given, the raw profile
+    is also saved to a `.prof` file in that directory.
+
+    Args:
+        name (str):
+            The name of the view being profiled. This is used to name
+            the saved profile.
+        func:
+            A function returning the response to profile.
+        sort (str):
+            The ordering of the statistics. See `SORT_KEYS`.
+        limit (int):
+            The maximum number of functions to include in the report.
+
+    Returns:
+        str:
+            The report containing the statistics of the profile.
+    """
+    profiler = cProfile.Profile()
+    profiler.runcall(lambda: _render(func()))
+
+    stream = StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(sort).print_stats(limit)
+
+    report = stream.getvalue()
+
+    profile_dir = getattr(settings, 'HELPCENTER_PROFILE_DIR', None)
+
+    if profile_dir:
+        path = os.path.join(
+            profile_dir, '{}-{}.prof'.format(name, int(time.time() * 1000)))
+        profiler.dump_stats(path)
+
+        report = 'Profile saved to {}\n\n{}'.format(path, report)
+
+    return report
+
+
+def profile_sql(func):
+    """Capture every query made by a function.
+
+    Args:
+        func:
+            A function returning the response to profile.
+
+    Returns:
+        str:
+            A report listing each query in the order it was made, along
+            with its duration and the cumulative time spent in the
+            database, followed by the queries that were repeated.
+    """
+    start = timeit.default_timer()
+
+    with capture_queries() as queries:
+        _render(func())
+
+    total_time = timeit.default_timer() - start
+
+    lines = []
+    db_time = 0.0
+
+    for i, (alias, query) in enumerate(queries, 1):
+        duration = float(query['time'])
+        db_time += duration
+
+        lines.append('{:>4} {:>9.2f}ms {:>9.2f}ms [{}] {}'.format(
+            i, duration * 1000, db_time * 1000, alias, query['sql']))
+
+    header = '{} queries in {:.2f}ms of {:.2f}ms total.\n'.format(
+        len(queries), db_time * 1000, total_time * 1000)
+    columns = '{:>4} {:>11} {:>11} Query'.format('#', 'Time', 'Cumulative')
+
+    repeated = [
+        (count, sql) for sql, count in
+        Counter(query['sql'] for _, query in queries).most_common()
+        if count > 1]
+
+    report = [header, columns] + lines
+
+    if repeated:
+        report.extend(['', 'Repeated queries:'])
+        report.extend(
+            '{:>4}x {}'.format(count, sql) for count, sql in repeated)
+
+    return '\n'.join(report) + '\n'
@@ -0,0 +1,176 @@
+"""Precomputed rankings of popular and trending articles.
+
+Ranking articles by their views on every request would mean sorting
+the whole article table, so the rankings are computed periodically by
+the ``computerankings`` management command and stored in the help
+center cache as lists of article ids. Requests only fetch the few
+ranked articles by primary key.
+
+Each article's score is the sum of its daily views from the rollup in
+`ArticleViewDay`, where each day's views are weighted by how long ago
+they happened. A day's weight halves every half-life, so the popular
+ranking uses a long half-life while the trending ranking uses a short
+one to favor articles that are getting attention right now.
+
+Rankings are computed for all articles and for the subtree of each
+category, so a category's ranking includes articles in its
+descendants.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import router
+
+from helpcenter import cache, models, viewcounts
+
+
+RANKINGS_KEY = 'helpcenter:rankings'
+
+# Views older than this many half-lives are given a weight of less than
+# 1%, so they are ignored.
+HALF_LIVES = 7
+
+
+def compute_rankings(today=None, using=None):
+    """Compute the article rankings and store them in the cache.
+
+    Args:
+        today (date):
+            The day to compute the rankings for. Defaults to the
+            current day.
+        using (str):
+            The database to read from.
+
+    Returns:
+        dict:
+            The computed rankings. See `get_rankings`.
+    """
+    using = using or router.db_for_read(models.ArticleViewDay)
+    today = today or viewcounts.get_today()
+    half_lives = get_half_lives()
+    start = today - timedelta(days=max(half_lives.values()) * HALF_LIVES)
+
+    categories = dict(models.Category.objects.using(using).order_by(
+    ).values_list('pk', 'parent_id'))
+    articles = dict(models.Article.objects.using(using).published(
+    ).order_by().values_list('pk', 'category_id'))
+
+    scores = dict((kind, defaultdict(float)) for kind in half_lives)
+    views = models.ArticleViewDay.objects.using(using).filter(
+        day__gte=start, day__lte=today).order_by().values_list(
+            'article', 'day', 'views')
+
+    for pk, day, count in views:
+        if pk not in articles:
+            continue
+
+        age = (today - day).days
+
+        for kind, half_life in half_lives.items():
+            scores[kind][pk] += count * 0.5 ** (float(age) / half_life)
+
+    size = get_ranking_size()
+    rankings = {}
+
+    for kind, kind_scores in scores.items():
+        # Sorting by score and then by id keeps ties stable
+        ranked = sorted(kind_scores, key=lambda pk: (-kind_scores[pk], pk))
+        kind_rankings = defaultdict(list)
+
+        for pk in ranked:
+            for category_id in _ancestors(articles[pk], categories):
+                if len(kind_rankings[category_id]) < size:
+                    kind_rankings[category_id].append(pk)
+
+        rankings[kind] = dict(kind_rankings)
+
+    cache.get_cache().set(RANKINGS_KEY, rankings, None)
+
+    return rankings
+
+
+def get_half_lives():
+    """Get the half-life in days of the score of each ranking."""
+    return {
+        'popular': getattr(settings, 'HELPCENTER_POPULAR_HALF_LIFE', 30),
+        'trending': getattr(settings, 'HELPCENTER_TRENDING_HALF_LIFE', 1),
+    }
+
+
+def get_ranked_articles(category_id=None):
+    """Get the ranked articles.
+
+    The articles in every ranking are fetched with a single query.
+    Articles that are no longer published are left out.
+
+    Args:
+        category_id (int):
+            The category to get the rankings of. Defaults to the
+            rankings of all articles.
+
+    Returns:
+        dict:
+            A dictionary mapping each kind of ranking to its list of
+            articles, in order.
+    """
+    rankings = get_rankings()
+    ids = dict(
+        (kind, kind_rankings.get(category_id, []))
+        for kind, kind_rankings in rankings.items())
+    all_ids = set(pk for kind_ids in ids.values() for pk in kind_ids)
+
+    articles = {}
+
+    if all_ids:
+        articles = models.Article.objects.published().for_listing(
+        ).order_by().in_bulk(all_ids)
+
+    return dict(
+        (kind, [articles[pk] for pk in kind_ids if pk in articles])
+        for kind, kind_ids in ids.items())
+
+
+def get_ranking_size():
+    """Get the maximum number of articles in each ranking."""
+    return getattr(settings, 'HELPCENTER_RANKING_SIZE', 10)
+
+
+def get_rankings():
+    """Get the stored article rankings.
+
+    Returns:
+        dict:
+            A dictionary mapping each kind of ranking to a dictionary
+            of rankings. Those map a category's id, or None for all
+            articles, to a list of article ids in order. Every kind of
+            ranking is included, even if the rankings haven't been
+            computed yet.
+    """
+    rankings = cache.get_cache().get(RANKINGS_KEY) or {}
+
+    return dict((kind, rankings.get(kind, {})) for kind in get_half_lives())
+
+
+def _ancestors(category_id, categories):
+    """Get the ids of the rankings an article in a category belongs to.
+
+    Args:
+        category_id (int):
+            The id of the article's category, or None.
+        categories (dict):
+            A mapping of each category's id to its parent's id.
+
+    Yields:
+        The id of the category and each of its ancestors, followed by
+        None for the overall ranking.
+    """
+    seen = set()
+
+    while category_id is not None and category_id not in seen:
+        seen.add(category_id)
+        yield category_id
+        category_id = categories.get(category_id)
+
+    yield None
@@ -0,0 +1,124 @@
+"""Redirects from the old URLs of articles.
+
+When an article's slug changes, its previous slug is recorded in
+`SlugHistory`. Every process keeps a map of those old slugs to the
+articles' current URLs, so links using an old slug can be redirected
+without querying the database.
+
+The map is tied to the current content generation (see
+`helpcenter.cache`). Since the generation changes whenever an article
+is written, the map is rebuilt with a single query the first time it
+is used after a write.
+"""
+
+import threading
+
+from helpcenter import cache, models
+
+
+class RedirectMap(object):
+    """Map of old article slugs to the articles' current URLs.
+
+    Attributes:
+        by_pk (dict):
+            Maps an article's primary key and an old slug to its
+            current URL.
+        by_slug (dict):
+            Maps the slug of an article's old category and an old slug
+            to the article's current URL. The category slug is None for
+            articles without a category.
+        generation (int):
+            The content generation the map was built for.
+    """
+
+    def __init__(self, generation=None, by_pk=None, by_slug=None):
+        """Create a new redirect map."""
+        self.by_pk = by_pk or {}
+        self.by_slug = by_slug or {}
+        self.generation = generation
+
+    @classmethod
+    def build(cls, generation):
+        """Build the redirect map from the recorded slug history.
+
+        Args:
+            generation (int):
+                The content generation the map is built for.
+
+        Returns:
+            RedirectMap:
+                A map containing every recorded old slug.
+        """
+        rows = models.SlugHistory.objects.values_list(
+            'article_id', 'article__category__slug', 'article__slug',
+            'category_slug', 'slug')
+        by_pk, by_slug = {}, {}
+
+        for pk, category_slug, slug, old_category_slug, old_slug in rows:
+            url = models.Article.make_url(pk, category_slug, slug)
+            by_pk[(pk, old_slug)] = url
+            by_slug[(old_category_slug or None, old_slug)] = url
+
+        return cls(generation, by_pk, by_slug)
+
+
+_lock = threading.Lock()
+_map = RedirectMap()
+
+
+def get_map():
+    """Get the redirect map for the current content generation.
+
+    Returns:
+        RedirectMap:
+            The current redirect map, which is rebuilt if content has
+            changed since it was last built.
+    """
+    global _map
+
+    generation = cache.get_generation()
+    current = _map
+
+    if current.generation == generation:
+        return current
+
+    with _lock:
+        if _map.generation != generation:
+            _map = RedirectMap.build(generation)
+
+        return _map
+
+
+def get_pk_redirect(pk, slug):
+    """Get the URL an article's old primary key URL redirects to.
+
+    Args:
+        pk (int):
+            The primary key in the requested URL.
+        slug (str):
+            The slug in the requested URL.
+
+    Returns:
+        str:
+            The article's current URL, or None if the slug isn't one of
+            the article's old slugs.
+    """
+    return get_map().by_pk.get((pk, slug))
+
+
+def get_slug_redirect(category_slug, slug):
+    """Get the URL an old slug-only article URL redirects to.
+
+    Args:
+        category_slug (str):
+            The category slug in the requested URL, or None if the URL
+            doesn't include a category.
+        slug (str):
+            The article slug in the requested URL.
+
+    Returns:
+        str:
+            The article's current URL, or None if no article used to
+            have the given slug.
+    """
+    return get_map().by_slug.get((category_slug, slug))
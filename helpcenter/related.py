@@ -0,0 +1,265 @@
+"""Precomputed related articles.
+
+Articles are related by the similarity of their text. Each published
+article's title and body are turned into a TF-IDF vector, and an
+article's related articles are the ones whose vectors have the highest
+cosine similarity with its own. The title is counted twice, so words
+in the title carry more weight than words in the body.
+
+Comparing every pair of articles is too slow to do while serving a
+request, so the related articles are computed by the ``computerelated``
+management command and stored in `RelatedArticle`. Showing them only
+takes one query.
+
+Computing related articles requires NumPy and SciPy, which can be
+installed with ``pip install django_helpcenter[related]``. The vectors
+of all articles are stored in a sparse matrix, and the similarities are
+computed with sparse matrix products over blocks of articles, so memory
+usage depends on the number of similar pairs in a block rather than the
+square of the number of articles.
+"""
+
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import router, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from helpcenter import content, models
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = sparse = None
+
+
+# The number of articles whose similarities are computed at once
+BLOCK_SIZE = 256
+
+
+def build_matrix(documents):
+    """Build the TF-IDF matrix of a set of documents.
+
+    Term frequencies are scaled logarithmically, and each row is
+    normalized to unit length so the product of two rows is their cosine
+    similarity.
+
+    Args:
+        documents (list):
+            The list of terms in each document.
+
+    Returns:
+        A sparse matrix with a row for each document and a column for
+        each distinct term.
+    """
+    vocabulary = {}
+    data, indices, indptr = [], [], [0]
+
+    for terms in documents:
+        for term, count in Counter(terms).items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            data.append(count)
+
+        indptr.append(len(indices))
+
+    num_documents = len(documents)
+    matrix = sparse.csr_matrix(
+        (np.array(data, dtype=np.float64), indices, indptr),
+        shape=(num_documents, len(vocabulary)))
+    matrix.data = 1 + np.log(matrix.data)
+
+    document_frequencies = np.bincount(
+        matrix.indices, minlength=len(vocabulary))
+    idf = np.log((1.0 + num_documents) / (1.0 + document_frequencies)) + 1
+    matrix = matrix.dot(sparse.diags(idf))
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+
+    return sparse.diags(1 / norms).dot(matrix).tocsr()
+
+
+def compute_related(incremental=False, using=None):
+    """Compute the related articles of published articles.
+
+    Args:
+        incremental (bool):
+            If true, only articles edited since their related articles
+            were last computed are updated. Other articles keep their
+            related articles even if a newly edited article would now
+            be among them, so a full computation should still be run
+            occasionally.
+        using (str):
+            The database to use. Defaults to the database related
+            articles are written to.
+
+    Returns:
+        int:
+            The number of articles whose related articles were
+            computed.
+
+    Raises:
+        ImproperlyConfigured:
+            If NumPy or SciPy aren't installed.
+    """
+    if not is_available():
+        raise ImproperlyConfigured(
+            'Computing related articles requires NumPy and SciPy.')
+
+    using = using or router.db_for_write(models.RelatedArticle)
+    published = models.Article.objects.using(using).published().order_by(
+        'pk')
+
+    pks, documents = [], []
+
+    for pk, title, body_html in published.values_list(
+            'pk', 'title', 'body_html').iterator():
+        pks.append(pk)
+        documents.append(get_terms(title, body_html))
+
+    related = models.RelatedArticle.objects.using(using)
+    rows = list(range(len(pks)))
+
+    if incremental:
+        times = dict(
+            (pk, (time_edited, last_computed))
+            for pk, time_edited, last_computed in published.annotate(
+                last_computed=Max('related_articles__time_computed'),
+            ).values_list('pk', 'time_edited', 'last_computed'))
+        rows = [
+            row for row, pk in enumerate(pks)
+            if times[pk][1] is None or times[pk][0] > times[pk][1]]
+
+    now = timezone.now()
+    created = []
+
+    if rows:
+        matrix = build_matrix(documents)
+
+        for row, neighbours in get_neighbours(
+                matrix, rows, get_num_related()):
+            created.extend(
+                models.RelatedArticle(
+                    article_id=pks[row],
+                    rank=rank,
+                    related_id=pks[column],
+                    score=score,
+                    time_computed=now)
+                for rank, (column, score) in enumerate(neighbours, 1))
+
+    with transaction.atomic(using=using):
+        if incremental:
+            # Articles that are no longer published lose their related
+            # articles.
+            related.exclude(article__in=published.values('pk')).delete()
+            related.filter(article__in=[pks[row] for row in rows]).delete()
+        else:
+            related.all().delete()
+
+        related.bulk_create(created, batch_size=500)
+
+    return len(rows)
+
+
+def get_neighbours(matrix, rows, count):
+    """Find the most similar rows of a matrix.
+
+    Similarities are computed for blocks of `BLOCK_SIZE` rows at a
+    time.
+
+    Args:
+        matrix:
+            The normalized sparse matrix returned by `build_matrix`.
+        rows (list):
+            The indices of the rows to find neighbours for.
+        count (int):
+            The maximum number of neighbours of each row.
+
+    Yields:
+        A tuple for each row containing the row's index and a list of
+        its neighbours. Each neighbour is a tuple containing its index
+        and its similarity, from most to least similar. Rows without any
+        terms in common are never neighbours.
+    """
+    transposed = matrix.T.tocsr()
+
+    for start in range(0, len(rows), BLOCK_SIZE):
+        block = rows[start:start + BLOCK_SIZE]
+        similarities = matrix[block].dot(transposed).tocsr()
+
+        for i, row in enumerate(block):
+            begin, end = similarities.indptr[i], similarities.indptr[i + 1]
+            columns = similarities.indices[begin:end]
+            scores = similarities.data[begin:end]
+
+            keep = (columns != row) & (scores > 0)
+            columns, scores = columns[keep], scores[keep]
+
+            if len(scores) > count:
+                top = np.argpartition(-scores, count - 1)[:count]
+                columns, scores = columns[top], scores[top]
+
+            # Most similar first, with ties broken by position
+            order = np.lexsort((columns, -scores))
+
+            yield row, [
+                (int(columns[j]), float(scores[j])) for j in order]
+
+
+def get_num_related():
+    """Get the number of related articles stored for each article."""
+    return getattr(settings, 'HELPCENTER_RELATED_ARTICLES', 5)
+
+
+def get_related_articles(article, now=None):
+    """Get the published articles related to an article.
+
+    Args:
+        article:
+            The article to get the related articles of.
+        now (datetime):
+            The time to check if related articles are published
+            against. Defaults to the current time.
+
+    Returns:
+        list:
+            The related articles, from most to least similar, with only
+            their listing fields loaded.
+    """
+    return list(models.Article.objects.published(now).filter(
+        related_from__article=article,
+    ).for_listing().order_by('related_from__rank'))
+
+
+def get_terms(title, body_html):
+    """Get the terms of an article's text.
+
+    Args:
+        title (str):
+            The article's title.
+        body_html (str):
+            The article's sanitized HTML body.
+
+    Returns:
+        list:
+            The lowercase words of the article, with the words of the
+            title included twice.
+    """
+    title_terms = content.WORD_RE.findall(title.lower())
+    body_terms = content.WORD_RE.findall(strip_tags(body_html).lower())
+
+    return title_terms * 2 + body_terms
+
+
+def is_available():
+    """Determine if related articles can be computed.
+
+    Returns:
+        bool:
+            True if NumPy and SciPy are installed.
+    """
+    return np is not None
@@ -0,0 +1,323 @@
+"""Compact storage of article revisions.
+
+A revision is recorded every time an article's title or body changes.
+Storing the full body in every revision would make the history many
+times larger than the articles themselves, so most revisions only
+store the changes between the article's most recent snapshot and the
+revision. A snapshot containing the full body is stored every
+`HELPCENTER_REVISION_SNAPSHOT_INTERVAL` revisions, or whenever the
+changes would be larger than the body itself.
+
+Since changes are relative to a snapshot rather than the previous
+revision, any revision can be rebuilt from at most two rows.
+"""
+
+import difflib
+import json
+import zlib
+
+from django.conf import settings
+from django.db import router
+from django.db.models import Case, F, IntegerField, Max, Q, When
+
+from helpcenter import models
+
+
+def apply_delta(base, data):
+    """Rebuild a body from a snapshot and a set of changes.
+
+    Args:
+        base (str):
+            The body of the snapshot the changes were made from.
+        data (bytes):
+            The compressed changes produced by `make_delta`.
+
+    Returns:
+        str:
+            The rebuilt body.
+    """
+    lines = base.splitlines(True)
+    body = []
+
+    for op in json.loads(_decompress(data)):
+        if isinstance(op, list):
+            body.extend(lines[op[0]:op[1]])
+        else:
+            body.append(op)
+
+    return ''.join(body)
+
+
+def compact(article, keep, using=None):
+    """Remove old revisions of an article.
+
+    The oldest kept revision is turned into a snapshot, and kept
+    revisions that relied on a removed snapshot are stored again
+    relative to the new one.
+
+    Args:
+        article:
+            The article to remove the revisions of.
+        keep (int):
+            The number of most recent revisions to keep. At least one
+            revision is always kept.
+        using (str):
+            The database to use. Defaults to the database articles are
+            written to.
+
+    Returns:
+        int:
+            The number of revisions removed.
+    """
+    using = using or router.db_for_write(models.ArticleRevision)
+    keep = max(keep, 1)
+
+    revisions = list(models.ArticleRevision.objects.using(using).filter(
+        article=article).order_by('number'))
+
+    if len(revisions) <= keep:
+        return 0
+
+    bodies = []
+    snapshot_body = None
+
+    for revision in revisions:
+        if revision.is_snapshot:
+            snapshot_body = _decompress(revision.data)
+            bodies.append(snapshot_body)
+        else:
+            bodies.append(apply_delta(snapshot_body, revision.data))
+
+    removed, kept = revisions[:-keep], revisions[-keep:]
+
+    models.ArticleRevision.objects.using(using).filter(
+        pk__in=[revision.pk for revision in removed]).delete()
+
+    snapshot = None
+
+    for revision, body in zip(kept, bodies[-keep:]):
+        is_snapshot, data = _encode(revision.number, body, snapshot)
+
+        if is_snapshot:
+            snapshot = (revision.number, body)
+
+        if (is_snapshot, data) != (revision.is_snapshot, bytes(revision.data)):
+            revision.data = data
+            revision.is_snapshot = is_snapshot
+            revision.save(update_fields=['data', 'is_snapshot'], using=using)
+
+    return len(removed)
+
+
+def get_revision(article, number, using=None):
+    """Get a revision of an article along with its body.
+
+    The revision and its snapshot are fetched in a single query.
+
+    Args:
+        article:
+            The article to get the revision of.
+        number (int):
+            The number of the revision to get.
+        using (str):
+            The database to read from.
+
+    Returns:
+        tuple:
+            The revision and its body.
+
+    Raises:
+        ArticleRevision.DoesNotExist:
+            If the article has no revision with the given number.
+    """
+    queryset = models.ArticleRevision.objects.filter(
+        Q(number=number) | Q(is_snapshot=True),
+        article=article,
+        number__lte=number).order_by('-number')
+
+    if using:
+        queryset = queryset.using(using)
+
+    rows = list(queryset[:2])
+
+    if not rows or rows[0].number != number:
+        raise models.ArticleRevision.DoesNotExist(
+            'Article {} has no revision {}.'.format(article.pk, number))
+
+    revision = rows[0]
+
+    if revision.is_snapshot:
+        return revision, _decompress(revision.data)
+
+    return revision, apply_delta(_decompress(rows[1].data), revision.data)
+
+
+def get_snapshot_interval():
+    """Get the maximum number of revisions between snapshots."""
+    return getattr(settings, 'HELPCENTER_REVISION_SNAPSHOT_INTERVAL', 10)
+
+
+def make_delta(base, body):
+    """Get the compressed changes between a snapshot and a body.
+
+    The changes are stored as a list of operations. Each operation is
+    either a pair of line numbers to copy from the snapshot, or a
+    string of new text.
+
+    Args:
+        base (str):
+            The body of the snapshot.
+        body (str):
+            The body to get the changes to.
+
+    Returns:
+        bytes:
+            The compressed changes.
+    """
+    base_lines = base.splitlines(True)
+    lines = body.splitlines(True)
+    matcher = difflib.SequenceMatcher(None, base_lines, lines, autojunk=False)
+    ops = []
+
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([i1, i2])
+        elif j1 != j2:
+            ops.append(''.join(lines[j1:j2]))
+
+    return _compress(json.dumps(ops, separators=(',', ':')))
+
+
+def make_diff(old, new, old_label='', new_label=''):
+    """Get a unified diff between two bodies."""
+    return ''.join(difflib.unified_diff(
+        old.splitlines(True),
+        new.splitlines(True),
+        fromfile=old_label,
+        tofile=new_label))
+
+
+def record_revisions(articles, using=None):
+    """Record a revision for each changed article.
+
+    A revision is only recorded if an article's title or body differ
+    from its latest revision. The latest revisions and snapshots of
+    every article are fetched together, and the new revisions are
+    inserted in bulk.
+
+    Args:
+        articles (list):
+            The saved articles to record revisions for.
+        using (str):
+            The database to use. Defaults to the database articles are
+            written to.
+
+    Returns:
+        list:
+            The recorded revisions.
+    """
+    articles = [article for article in articles if article.pk is not None]
+
+    if not articles:
+        return []
+
+    using = using or router.db_for_write(models.ArticleRevision)
+    revisions = models.ArticleRevision.objects.using(using)
+
+    latest = revisions.filter(
+        article__in=[article.pk for article in articles],
+    ).order_by().values('article').annotate(
+        last=Max('number'),
+        snapshot=Max(Case(
+            When(is_snapshot=True, then=F('number')),
+            output_field=IntegerField())))
+    numbers = dict(
+        (row['article'], (row['last'], row['snapshot'])) for row in latest)
+
+    rows = {}
+
+    if numbers:
+        query = Q()
+
+        for pk, row_numbers in numbers.items():
+            query |= Q(article_id=pk, number__in=row_numbers)
+
+        for revision in revisions.filter(query):
+            rows[(revision.article_id, revision.number)] = revision
+
+    created = []
+
+    for article in articles:
+        body = article.body or ''
+        number, snapshot = 1, None
+
+        if article.pk in numbers:
+            last_number, snapshot_number = numbers[article.pk]
+            last = rows[(article.pk, last_number)]
+            snapshot_body = _decompress(
+                rows[(article.pk, snapshot_number)].data)
+            snapshot = (snapshot_number, snapshot_body)
+
+            if last.is_snapshot:
+                last_body = snapshot_body
+            else:
+                last_body = apply_delta(snapshot_body, last.data)
+
+            if last.title == article.title and last_body == body:
+                continue
+
+            number = last_number + 1
+
+        is_snapshot, data = _encode(number, body, snapshot)
+
+        created.append(models.ArticleRevision(
+            article=article,
+            data=data,
+            is_snapshot=is_snapshot,
+            number=number,
+            title=article.title))
+
+    revisions.bulk_create(created)
+
+    return created
+
+
+def _compress(text):
+    """Compress a string."""
+    return zlib.compress(text.encode('utf-8'), 9)
+
+
+def _decompress(data):
+    """Decompress a string compressed by `_compress`."""
+    return zlib.decompress(bytes(data)).decode('utf-8')
+
+
+def _encode(number, body, snapshot):
+    """Encode the body of a revision.
+
+    Args:
+        number (int):
+            The number of the revision.
+        body (str):
+            The body of the revision.
+        snapshot (tuple):
+            The number and body of the latest snapshot before the
+            revision, or None if there is no snapshot.
+
+    Returns:
+        tuple:
+            A boolean indicating if the revision is a snapshot, and
+            the compressed data to store.
+    """
+    full = _compress(body)
+
+    if snapshot is None or number - snapshot[0] >= get_snapshot_interval():
+        return True, full
+
+    delta = make_delta(snapshot[1], body)
+
+    # Small bodies may compress better than their changes
+    if len(delta) >= len(full):
+        return True, full
+
+    return False, delta
@@ -0,0 +1,124 @@
+"""Database routing for help center content.
+
+`ReplicaRouter` sends reads of help center models to one of the
+databases in `HELPCENTER_REPLICA_DATABASES` and writes to
+`HELPCENTER_PRIMARY_DATABASE`. Since replicas lag behind the primary,
+a user who has just made a change would otherwise be likely to see the
+content from before the change. To prevent that, every write pins the
+current thread to the primary database, and
+`helpcenter.middleware.ReplicaStickinessMiddleware` carries that pin
+over to the user's subsequent requests for
+`HELPCENTER_REPLICA_PIN_SECONDS`.
+
+Writes are recorded with `record_write` once they have been made, by
+the signal handlers of saved and deleted content and by the functions
+changing content in bulk. Routing a write only chooses the database, so
+code that looks up the database it would write to without writing
+anything doesn't pin the thread. The pin lasts until `reset_state` is
+called, which the middleware does at the end of every request.
+"""
+
+import random
+import threading
+
+from django.conf import settings
+
+
+_state = threading.local()
+
+
+def get_primary_database():
+    """Get the alias of the primary database.
+
+    Returns:
+        str:
+            The value of the `HELPCENTER_PRIMARY_DATABASE` setting.
+    """
+    return getattr(settings, 'HELPCENTER_PRIMARY_DATABASE', 'default')
+
+
+def get_replica_databases():
+    """Get the aliases of the replica databases.
+
+    Returns:
+        list:
+            The value of the `HELPCENTER_REPLICA_DATABASES` setting.
+    """
+    return getattr(settings, 'HELPCENTER_REPLICA_DATABASES', [])
+
+
+def has_written():
+    """Determine if the current thread has written help center content.
+
+    Returns:
+        bool:
+            True if a write has been routed since the state was last
+            reset.
+    """
+    return getattr(_state, 'written', False)
+
+
+def is_pinned():
+    """Determine if reads on the current thread must use the primary.
+
+    Returns:
+        bool:
+            True if the current thread is pinned to the primary.
+    """
+    return getattr(_state, 'pinned', False)
+
+
+def pin_to_primary():
+    """Send all help center reads on this thread to the primary."""
+    _state.pinned = True
+
+
+def record_write():
+    """Record that help center content was written on this thread.
+
+    Reads on the thread are sent to the primary from then on.
+    """
+    _state.written = True
+    pin_to_primary()
+
+
+def reset_state():
+    """Forget any writes and pins for the current thread."""
+    _state.pinned = False
+    _state.written = False
+
+
+class ReplicaRouter(object):
+    """Router sending help center reads to replicas.
+
+    Models from other apps are not routed, leaving the decision to the
+    other routers in `DATABASE_ROUTERS`.
+    """
+    app_label = 'helpcenter'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Allow relations between help center models."""
+        if (obj1._meta.app_label == self.app_label and
+                obj2._meta.app_label == self.app_label):
+            return True
+
+        return None
+
+    def db_for_read(self, model, **hints):
+        """Send reads to a random replica unless pinned to the primary."""
+        if model._meta.app_label != self.app_label:
+            return None
+
+        replicas = get_replica_databases()
+
+        if is_pinned() or not replicas:
+            return get_primary_database()
+
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        """Send writes to the primary."""
+        if model._meta.app_label != self.app_label:
+            return None
+
+        return get_primary_database()
@@ -0,0 +1,458 @@
+"""Searching help center articles.
+
+Articles are matched by the words of a query. Every word has to start
+a word in an article's title or body, which is looked up in the term
+index of articles (see `helpcenter.fulltext`), and articles are ranked
+by how many of the words appear in their title, then by how recently
+they were published.
+
+Search traffic is dominated by a small number of popular queries, so
+the ranked ids of each query's results are cached. Results are first
+looked up in a small LRU cache local to the process, then in the help
+center cache shared between processes, and are only ranked by the
+database if neither has them. The cache keys include the content
+generation (see `helpcenter.cache`), which changes whenever an article
+is published, edited, or deleted, so cached results never outlive the
+articles they were ranked from.
+
+Searches tolerate typos. Query terms that don't appear in any published
+article are expanded to the most similar words that do, using a trigram
+index of the words in article titles and bodies (see
+`helpcenter.trigrams`), and the same index is used to suggest a
+corrected query. The index is built from the term index once per terms
+generation, which only changes when the terms of articles are indexed
+or articles are published, unpublished, or deleted, and kept in each
+process.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Case, Count, IntegerField, Q, Value, When
+
+from helpcenter import (
+    cache, content, fulltext, instrumentation, metrics, models, trigrams)
+
+
+# The maximum number of words a misspelled term is expanded to
+MAX_EXPANSIONS = 3
+
+# The number of words stored in each cache entry of the vocabulary. The
+# vocabulary is split so no single entry outgrows the size limit of
+# caches like memcached.
+VOCABULARY_CHUNK_SIZE = 5000
+
+
+class LRUCache(object):
+    """A thread safe cache keeping the most recently used values.
+
+    Attributes:
+        max_size (int):
+            The maximum number of values kept.
+    """
+
+    def __init__(self, max_size):
+        """Create a new empty cache."""
+        self.max_size = max_size
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Get the number of values in the cache."""
+        return len(self._entries)
+
+    def clear(self):
+        """Remove every value from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key):
+        """Get a value from the cache.
+
+        Args:
+            key:
+                The key of the value.
+
+        Returns:
+            The cached value, or None if there is no value for the key
+            or it has expired.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+
+            if entry is None or entry[0] <= time.time():
+                return None
+
+            # Re-inserting the entry marks it as the most recently used
+            self._entries[key] = entry
+
+            return entry[1]
+
+    def set(self, key, value, timeout):
+        """Store a value in the cache.
+
+        The least recently used value is removed if the cache is full.
+
+        Args:
+            key:
+                The key of the value.
+            value:
+                The value to store.
+            timeout (int):
+                The number of seconds to keep the value for.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time() + timeout, value)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+_local_cache = LRUCache(
+    getattr(settings, 'HELPCENTER_SEARCH_LRU_SIZE', 500))
+
+_local_index = LRUCache(1)
+
+
+def expand(terms, index):
+    """Expand misspelled terms to similar words in the vocabulary.
+
+    Args:
+        terms (tuple):
+            The terms returned by `get_terms`.
+        index:
+            The `TrigramIndex` of the vocabulary.
+
+    Returns:
+        list:
+            A tuple for each term containing the words it matches. Terms
+            in the vocabulary only match themselves, while other terms
+            also match the words most similar to them.
+    """
+    threshold = get_similarity_threshold()
+    expanded = []
+
+    for term in terms:
+        if term in index:
+            expanded.append((term,))
+        else:
+            expanded.append((term,) + tuple(
+                index.suggest(term, threshold, MAX_EXPANSIONS)))
+
+    return expanded
+
+
+def get_cache_timeout():
+    """Get the number of seconds to cache search results for.
+
+    Returns:
+        int:
+            The value of the `HELPCENTER_CACHE_TIMEOUT` setting, or the
+            number of seconds until the next scheduled article is
+            published if that is sooner.
+    """
+    timeout = getattr(settings, 'HELPCENTER_CACHE_TIMEOUT', 300)
+    publish_time = cache.get_next_publish_time()
+
+    if publish_time is not None:
+        timeout = min(timeout, cache.seconds_until(publish_time))
+
+    return timeout
+
+
+def get_index():
+    """Get the trigram index of the words in published articles.
+
+    The index is kept in the current process until the terms
+    generation changes. The vocabulary it is built from is stored in the
+    shared cache in chunks of `VOCABULARY_CHUNK_SIZE` words, so it is
+    only read from the database once per generation. Edits that don't
+    change the terms of published articles don't rebuild it.
+
+    Returns:
+        The `TrigramIndex` of the vocabulary.
+    """
+    key = get_vocabulary_key()
+    index = _local_index.get(key)
+
+    if index is not None:
+        return index
+
+    timeout = get_cache_timeout()
+    frequencies = get_cached_vocabulary(key)
+
+    if frequencies is None:
+        frequencies = get_vocabulary()
+        set_cached_vocabulary(key, frequencies, timeout)
+
+    index = trigrams.TrigramIndex(frequencies)
+    _local_index.set(key, index, timeout)
+
+    return index
+
+
+def get_cached_vocabulary(key):
+    """Get the vocabulary stored in the shared cache.
+
+    Args:
+        key (str):
+            The cache key of the vocabulary.
+
+    Returns:
+        dict:
+            The cached vocabulary, or None if it or any of its chunks
+            isn't cached.
+    """
+    shared_cache = cache.get_cache()
+    num_chunks = shared_cache.get(key)
+
+    if num_chunks is None:
+        return None
+
+    chunk_keys = ['{}:{}'.format(key, i) for i in range(num_chunks)]
+    chunks = shared_cache.get_many(chunk_keys)
+
+    if len(chunks) < num_chunks:
+        return None
+
+    frequencies = {}
+
+    for chunk_key in chunk_keys:
+        frequencies.update(chunks[chunk_key])
+
+    return frequencies
+
+
+def get_max_results():
+    """Get the maximum number of results returned by a search."""
+    return getattr(settings, 'HELPCENTER_SEARCH_RESULTS', 50)
+
+
+def get_results(query, category_id=None):
+    """Get the articles matching a query.
+
+    Args:
+        query (str):
+            The text searched for.
+        category_id (int):
+            If given, only articles in the category are searched.
+
+    Returns:
+        list:
+            The published articles matching the query, from best to
+            worst match, with only their listing fields loaded.
+    """
+    start = time.time()
+    ids = search(query, category_id)
+
+    articles = {}
+
+    if ids:
+        articles = models.Article.objects.published().for_listing(
+        ).order_by().in_bulk(ids)
+
+    results = [articles[pk] for pk in ids if pk in articles]
+    metrics.SEARCH_LATENCY.observe(time.time() - start)
+
+    return results
+
+
+def get_similarity_threshold():
+    """Get the minimum similarity of a word to a misspelled term."""
+    return getattr(settings, 'HELPCENTER_SEARCH_SIMILARITY', 0.3)
+
+
+def get_suggestion(query):
+    """Suggest a correction of a query.
+
+    Args:
+        query (str):
+            The text searched for.
+
+    Returns:
+        str:
+            The lowercase words of the query with each word that doesn't
+            appear in any published article replaced by the most similar
+            word that does, or None if no words could be corrected.
+    """
+    words = content.WORD_RE.findall(query.lower())
+
+    if not words:
+        return None
+
+    index = get_index()
+    threshold = get_similarity_threshold()
+    corrected = []
+
+    for word in words:
+        suggestions = [] if word in index else index.suggest(
+            word, threshold, 1)
+        corrected.append(suggestions[0] if suggestions else word)
+
+    if corrected == words:
+        return None
+
+    return ' '.join(corrected)
+
+
+def get_terms(query):
+    """Normalize a query into the terms searched for.
+
+    Args:
+        query (str):
+            The text searched for.
+
+    Returns:
+        tuple:
+            The distinct lowercase words of the query, sorted so queries
+            differing only in case, punctuation, or word order share
+            the same terms.
+    """
+    return tuple(sorted(set(content.WORD_RE.findall(query.lower()))))
+
+
+def get_vocabulary():
+    """Get the words in published articles.
+
+    Returns:
+        dict:
+            A mapping of each term of a published article to the number
+            of articles it appears in.
+    """
+    terms = models.ArticleTerm.objects.filter(
+        article__in=models.Article.objects.published().order_by(
+        ).values('pk'))
+
+    return dict(terms.order_by().values_list('term').annotate(Count('pk')))
+
+
+def get_vocabulary_key():
+    """Get the cache key of the vocabulary of published articles.
+
+    Returns:
+        str:
+            A cache key that is only valid until the terms generation
+            changes.
+    """
+    return 'helpcenter:search-vocabulary:{}'.format(
+        cache.get_generation(cache.TERMS_GENERATION_KEY))
+
+
+def rank(terms, category_id=None):
+    """Rank the articles matching a set of terms.
+
+    Args:
+        terms (list):
+            The terms returned by `expand`. Every term has to be
+            matched by an article term starting with one of its words.
+        category_id (int):
+            If given, only articles in the category are ranked.
+
+    Returns:
+        list:
+            The ids of the best matching published articles, from best
+            to worst match.
+    """
+    if not terms:
+        return []
+
+    articles = models.Article.objects.published()
+    article_terms = models.ArticleTerm.objects.all()
+
+    if category_id is not None:
+        articles = articles.filter(category_id=category_id)
+
+    title_matches = Value(0)
+
+    for words in terms:
+        in_title = Q()
+        in_terms = Q()
+
+        for word in words:
+            in_title |= Q(title__icontains=word)
+            in_terms |= Q(term__startswith=word[:fulltext.MAX_LENGTH])
+
+        articles = articles.filter(
+            pk__in=article_terms.filter(in_terms).values('article'))
+        title_matches = title_matches + Case(
+            When(in_title, then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField())
+
+    articles = articles.annotate(title_matches=title_matches).order_by(
+        '-title_matches', '-time_published', '-id')
+
+    return list(articles.values_list('pk', flat=True)[:get_max_results()])
+
+
+def set_cached_vocabulary(key, frequencies, timeout):
+    """Store the vocabulary in the shared cache.
+
+    Args:
+        key (str):
+            The cache key of the vocabulary.
+        frequencies (dict):
+            The vocabulary returned by `get_vocabulary`.
+        timeout (int):
+            The number of seconds to cache the vocabulary for.
+    """
+    words = sorted(frequencies)
+    chunks = {}
+
+    for i, start in enumerate(range(0, len(words), VOCABULARY_CHUNK_SIZE)):
+        chunks['{}:{}'.format(key, i)] = dict(
+            (word, frequencies[word])
+            for word in words[start:start + VOCABULARY_CHUNK_SIZE])
+
+    shared_cache = cache.get_cache()
+
+    # The chunks are stored before the number of chunks, so the
+    # vocabulary is never read while its chunks are missing.
+    shared_cache.set_many(chunks, timeout)
+    shared_cache.set(key, len(chunks), timeout)
+
+
+def search(query, category_id=None):
+    """Get the ranked ids of the articles matching a query.
+
+    Args:
+        query (str):
+            The text searched for.
+        category_id (int):
+            If given, only articles in the category are searched.
+
+    Returns:
+        list:
+            The ids of the matching articles, from best to worst match.
+    """
+    terms = get_terms(query)
+
+    if not terms:
+        return []
+
+    key = cache.make_key('search', category_id, *terms)
+
+    ids = _local_cache.get(key)
+
+    if ids is not None:
+        instrumentation.record_cache_access(True)
+
+        return ids
+
+    shared_cache = cache.get_cache()
+    ids = shared_cache.get(key)
+    instrumentation.record_cache_access(ids is not None)
+
+    timeout = get_cache_timeout()
+
+    if ids is None:
+        ids = rank(expand(terms, get_index()), category_id)
+        shared_cache.set(key, ids, timeout)
+
+    _local_cache.set(key, ids, timeout)
+
+    return ids
@@ -0,0 +1,100 @@
+"""Signal handlers for the helpcenter app."""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from helpcenter import (
+    cache, duplicates, fulltext, metrics, models, revisions, routers)
+from helpcenter.instrumentation import view_instrumented
+
+
+@receiver(post_delete, sender=models.Article)
+@receiver(post_delete, sender=models.Category)
+@receiver(post_save, sender=models.Article)
+@receiver(post_save, sender=models.Category)
+def invalidate_cache(sender, using=None, **kwargs):
+    """Invalidate cached content when an article or category changes."""
+    cache.invalidate(using=using)
+
+
+def _saves_any(update_fields, names):
+    """Determine if a save writes any of the given fields.
+
+    Args:
+        update_fields (frozenset):
+            The fields that were saved, or None if every field was.
+        names (iterable):
+            The names of the fields to check.
+
+    Returns:
+        bool:
+            True if any of the fields were saved.
+    """
+    return update_fields is None or not update_fields.isdisjoint(names)
+
+
+@receiver(post_delete, sender=models.Article)
+def invalidate_deleted_terms(sender, using=None, **kwargs):
+    """Invalidate the vocabulary of published articles on deletion."""
+    cache.invalidate_terms(using=using)
+
+
+@receiver(post_save, sender=models.Article)
+def invalidate_published_terms(sender, raw=False, using=None,
+                               update_fields=None, **kwargs):
+    """Invalidate the vocabulary when an article's publishing changes.
+
+    Saves writing the article's title or body re-index its terms, which
+    already invalidates the vocabulary.
+    """
+    if (raw or
+            _saves_any(update_fields, models.Article.CONTENT_FIELDS) or
+            not _saves_any(update_fields, models.Article.PUBLISHING_FIELDS)):
+        return
+
+    cache.invalidate_terms(using=using)
+
+
+@receiver(post_save, sender=models.Article)
+def index_article_signature(sender, instance, raw=False, using=None,
+                            update_fields=None, **kwargs):
+    """Store the buckets of an article's MinHash signature."""
+    if raw or not _saves_any(update_fields, ['body']):
+        return
+
+    duplicates.index_articles([instance], using=using)
+
+
+@receiver(post_save, sender=models.Article)
+def index_article_terms(sender, instance, raw=False, using=None,
+                        update_fields=None, **kwargs):
+    """Store the terms of an article's title and body."""
+    if raw or not _saves_any(update_fields, models.Article.CONTENT_FIELDS):
+        return
+
+    fulltext.index_articles([instance], using=using)
+
+
+@receiver(post_save, sender=models.Article)
+def record_article_revision(sender, instance, raw=False, using=None,
+                            update_fields=None, **kwargs):
+    """Record a revision when an article's title or body changes."""
+    if raw or not _saves_any(update_fields, models.Article.CONTENT_FIELDS):
+        return
+
+    revisions.record_revisions([instance], using=using)
+
+
+@receiver(view_instrumented)
+def record_view_metrics(sender, **kwargs):
+    """Record the metrics of each instrumented view."""
+    metrics.record_view(kwargs['metrics'])
+
+
+@receiver(post_delete, sender=models.Article)
+@receiver(post_delete, sender=models.Category)
+@receiver(post_save, sender=models.Article)
+@receiver(post_save, sender=models.Category)
+def record_write(sender, **kwargs):
+    """Keep reads on the primary after an article or category changes."""
+    routers.record_write()
@@ -0,0 +1,122 @@
+"""Generation of unique URL slugs."""
+
+from django.utils.text import slugify
+
+
+# The maximum length of a slug, matching Django's default for
+# `SlugField`
+MAX_LENGTH = 50
+
+# Slugs are shortened by up to this many characters to make room for a
+# numeric suffix.
+SUFFIX_LENGTH = 10
+
+
+def get_prefix(title):
+    """Get the prefix shared by every slug `make_slug` could generate.
+
+    Args:
+        title (str):
+            The title the slug is generated from.
+
+    Returns:
+        str:
+            The prefix of any slug generated from the title.
+    """
+    return (slugify(title) or 'untitled')[:MAX_LENGTH - SUFFIX_LENGTH]
+
+
+def make_slug(title, used):
+    """Generate a slug that isn't in a set of used slugs.
+
+    If the slug generated from the title is already used, a numeric
+    suffix is added to it.
+
+    Args:
+        title (str):
+            The title to generate the slug from.
+        used (set):
+            The slugs that can't be used. Only slugs starting with the
+            prefix returned by `get_prefix` need to be included.
+
+    Returns:
+        str:
+            A slug of at most `MAX_LENGTH` characters that isn't used.
+    """
+    base = slugify(title)[:MAX_LENGTH] or 'untitled'
+    slug = base
+    number = 1
+
+    while slug in used:
+        number += 1
+        suffix = '-{}'.format(number)
+        slug = base[:MAX_LENGTH - len(suffix)] + suffix
+
+    return slug
+
+
+def rename_conflicts(moving, destination):
+    """Give instances moving into a group slugs that are free there.
+
+    Slugs only have to be unique within a group, such as the articles in
+    a category, so instances moved into another group can clash with
+    its instances or with each other. Clashes are found with two
+    queries, and only the clashing instances are renamed.
+
+    Args:
+        moving:
+            A queryset of the instances being moved.
+        destination:
+            A queryset of the instances already in the group.
+
+    Returns:
+        dict:
+            A mapping of the id of each renamed instance to its new
+            slug.
+    """
+    used = set(destination.filter(
+        slug__in=moving.order_by().values('slug'),
+    ).values_list('slug', flat=True))
+    renamed = []
+
+    for pk, slug in moving.order_by('pk').values_list('pk', 'slug'):
+        if slug in used:
+            renamed.append((pk, slug))
+
+        used.add(slug)
+
+    taken = set()
+    new_slugs = {}
+
+    for pk, slug in renamed:
+        new_slug = unique_slug(slug, destination | moving, taken)
+        taken.add(new_slug)
+        new_slugs[pk] = new_slug
+        moving.filter(pk=pk).update(slug=new_slug)
+
+    return new_slugs
+
+
+def unique_slug(title, queryset, taken=()):
+    """Generate a slug that isn't used by any instance in a queryset.
+
+    The slugs in use are found with a single query.
+
+    Args:
+        title (str):
+            The title to generate the slug from.
+        queryset:
+            The instances whose slugs can't be reused.
+        taken (set):
+            Additional slugs that can't be used, such as slugs given to
+            other instances that haven't been saved yet.
+
+    Returns:
+        str:
+            A slug of at most `MAX_LENGTH` characters that isn't in use.
+    """
+    used = set(queryset.filter(
+        slug__startswith=get_prefix(title)).values_list('slug', flat=True))
+    used.update(taken)
+
+    return make_slug(title, used)
@@ -0,0 +1,68 @@
+/*
+ * Suggest categories as the user types in a category autocomplete
+ * widget, and keep the id of the chosen category in the widget's
+ * hidden input.
+ */
+(function () {
+    'use strict';
+
+    function setUp(input) {
+        var hidden = document.getElementById(input.getAttribute('data-target'));
+        var list = document.getElementById(input.getAttribute('list'));
+        var url = input.getAttribute('data-url');
+        var ids = {};
+        var pending = null;
+
+        input.addEventListener('input', function () {
+            if (ids.hasOwnProperty(input.value)) {
+                hidden.value = ids[input.value];
+
+                return;
+            }
+
+            hidden.value = '';
+
+            if (pending !== null) {
+                pending.abort();
+                pending = null;
+            }
+
+            if (!input.value) {
+                return;
+            }
+
+            var request = new XMLHttpRequest();
+
+            request.open('GET', url + '?q=' + encodeURIComponent(input.value));
+            request.setRequestHeader('Accept', 'application/json');
+            request.onload = function () {
+                if (request.status !== 200) {
+                    return;
+                }
+
+                list.innerHTML = '';
+                ids = {};
+
+                JSON.parse(request.responseText).forEach(function (category) {
+                    var option = document.createElement('option');
+
+                    option.value = category.label;
+                    ids[category.label] = category.id;
+                    list.appendChild(option);
+                });
+            };
+            request.send();
+
+            pending = request;
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        var inputs = document.querySelectorAll(
+            'input[data-category-autocomplete]');
+
+        for (var i = 0; i < inputs.length; i++) {
+            setUp(inputs[i]);
+        }
+    });
+}());
@@ -1,7 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Permission
 
-from helpcenter import models
+from helpcenter import instrumentation, models
 
 
 # Default Values
@@ -45,7 +45,9 @@ def create_category(title=CATEGORY_TITLE, parent=None):
 
 def instance_to_queryset_string(instance):
     """ Return a django queryset representation of an instance """
-    str_type = str(type(instance)).strip("<>'").split('.')[-1]
+    # The concrete model is used so instances with deferred fields are
+    # represented the same way as complete instances.
+    str_type = instance._meta.concrete_model.__name__
 
     return "<{}: {}>".format(str_type, str(instance))
 
@@ -84,3 +86,35 @@ class AuthTestMixin(object):
         self.client.logout()
 
         super(AuthTestMixin, self).tearDown(*args, **kwargs)
+
+
+class QueryBudgetTestMixin(object):
+    """ Mixin for checking the query budgets of help center views """
+
+    def assertWithinQueryBudget(self, func, *args, **kwargs):
+        """Assert that views stay within their query budgets.
+
+        Args:
+            func:
+                A callable, such as `self.client.get`, that causes one or
+                more help center views to run.
+            *args:
+                Positional arguments passed to `func`.
+            **kwargs:
+                Keyword arguments passed to `func`.
+
+        Returns:
+            The return value of `func`.
+        """
+        with instrumentation.capture_metrics() as captured:
+            result = func(*args, **kwargs)
+
+        self.assertTrue(captured, 'No instrumented views were run.')
+
+        for metrics in captured:
+            self.assertFalse(
+                metrics.over_budget,
+                '{} made {} queries, exceeding its budget of {}.'.format(
+                    metrics.name, metrics.queries, metrics.budget))
+
+        return result
@@ -0,0 +1,196 @@
+from django.contrib.admin import helpers
+from django.contrib.auth import get_user_model
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from helpcenter import admin, models
+from helpcenter.testing_utils import create_article, create_category
+
+
+class AdminTestMixin(object):
+    """Mixin for tests of the admin."""
+
+    def setUp(self):
+        """Log in as a superuser."""
+        user = get_user_model().objects.create_superuser(
+            email='admin@example.com', password='password', username='admin')
+        self.client.force_login(user)
+
+    def count_queries(self, url):
+        """Count the queries made to get a page.
+
+        Returns:
+            int:
+                The number of queries made.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(200, response.status_code)
+
+        return len(queries)
+
+
+class TestArticleAdmin(AdminTestMixin, TestCase):
+    """Test cases for the article admin."""
+    url = reverse('admin:helpcenter_article_changelist')
+
+    def test_changelist_labels(self):
+        """Test the category labels in the changelist.
+
+        Each article's category should be labelled with its ancestors.
+        """
+        parent = create_category(title='Parent')
+        child = create_category(title='Child', parent=parent)
+        create_article(category=child)
+
+        response = self.client.get(self.url)
+
+        self.assertContains(response, 'Parent &gt; Child')
+
+    def test_changelist_queries(self):
+        """Test the number of queries made by the changelist.
+
+        The number of queries should not depend on the number of
+        articles or how deeply their categories are nested.
+        """
+        category = create_category()
+        create_article(category=category)
+
+        expected = self.count_queries(self.url)
+
+        for i in range(10):
+            category = create_category(parent=category)
+            create_article(category=category)
+
+        self.assertEqual(expected, self.count_queries(self.url))
+
+    def test_change_form_queries(self):
+        """Test the number of queries made by the change form.
+
+        The category field shouldn't list every category.
+        """
+        article = create_article(category=create_category())
+        url = reverse(
+            'admin:helpcenter_article_change', args=(article.pk,))
+
+        # The first request also caches the admin's content types.
+        self.count_queries(url)
+        expected = self.count_queries(url)
+
+        for i in range(10):
+            create_category()
+
+        self.assertEqual(expected, self.count_queries(url))
+
+    def test_move_action(self):
+        """Test moving articles with the admin action.
+
+        The category should be chosen on an intermediate page before
+        the articles are moved.
+        """
+        category = create_category()
+        article = create_article()
+        data = {
+            'action': 'move_articles',
+            helpers.ACTION_CHECKBOX_NAME: [article.pk],
+        }
+
+        response = self.client.post(self.url, data)
+
+        self.assertContains(response, 'data-category-autocomplete')
+
+        data.update(apply='Move articles', category=category.pk)
+        response = self.client.post(self.url, data)
+        article.refresh_from_db()
+
+        self.assertRedirects(response, self.url)
+        self.assertEqual(category, article.category)
+
+    def test_publish_action(self):
+        """Test publishing articles with the admin action."""
+        article = create_article(draft=True)
+
+        self.client.post(self.url, {
+            'action': 'publish_articles',
+            helpers.ACTION_CHECKBOX_NAME: [article.pk],
+        })
+        article.refresh_from_db()
+
+        self.assertFalse(article.draft)
+
+    def test_search(self):
+        """Test searching articles in the changelist.
+
+        Articles should be matched by the words in their body.
+        """
+        create_article(title='Foo', body='Reset your password')
+        create_article(title='Bar', body='Something else')
+
+        response = self.client.get(self.url, {'q': 'passw'})
+
+        self.assertContains(response, 'Foo')
+        self.assertNotContains(response, 'Bar')
+
+    def test_unpublish_action(self):
+        """Test unpublishing articles with the admin action."""
+        article = create_article()
+
+        self.client.post(self.url, {
+            'action': 'unpublish_articles',
+            helpers.ACTION_CHECKBOX_NAME: [article.pk],
+        })
+        article.refresh_from_db()
+
+        self.assertTrue(article.draft)
+
+
+class TestCategoryAdmin(AdminTestMixin, TestCase):
+    """Test cases for the category admin."""
+    url = reverse('admin:helpcenter_category_changelist')
+
+    def test_changelist_labels(self):
+        """Test the parent labels in the changelist.
+
+        Each category's parent should be labelled with its ancestors.
+        """
+        parent = create_category(title='Parent')
+        child = create_category(title='Child', parent=parent)
+        create_category(title='Grandchild', parent=child)
+
+        response = self.client.get(self.url)
+
+        self.assertContains(response, 'Parent &gt; Child')
+
+    def test_changelist_queries(self):
+        """Test the number of queries made by the changelist.
+
+        The number of queries should not depend on the number of
+        categories or how deeply they are nested.
+        """
+        category = create_category(parent=create_category())
+
+        expected = self.count_queries(self.url)
+
+        for i in range(10):
+            category = create_category(parent=category)
+
+        self.assertEqual(expected, self.count_queries(self.url))
+
+
+class TestEstimatedCountPaginator(TestCase):
+    """Test cases for the estimated count paginator."""
+
+    def test_exact_count(self):
+        """Test counting objects without an estimate.
+
+        Databases without an estimate should be counted exactly.
+        """
+        create_article()
+        articles = models.Article.objects.all()
+
+        self.assertIsNone(admin.get_estimated_count(articles))
+        self.assertEqual(
+            1, admin.EstimatedCountPaginator(articles, 10).count)
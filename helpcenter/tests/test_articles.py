@@ -0,0 +1,162 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from helpcenter import articles, cache, models
+from helpcenter.testing_utils import create_article, create_category
+
+
+class TestMoveArticles(TestCase):
+    """Test cases for moving articles in bulk."""
+
+    def setUp(self):
+        """Start each test with an empty cache."""
+        cache.get_cache().clear()
+
+    def test_invalidate_once(self):
+        """Test the cache invalidation of a move.
+
+        The content generation should only be bumped once.
+        """
+        category = create_category()
+        create_article(title='Foo')
+        create_article(title='Bar')
+        generation = cache.get_generation()
+
+        articles.move_articles(models.Article.objects.all(), category.pk)
+
+        self.assertEqual(generation + 1, cache.get_generation())
+
+    def test_move(self):
+        """Test moving articles to a category."""
+        category = create_category()
+        article = create_article()
+
+        self.assertEqual(
+            1, articles.move_articles(
+                models.Article.objects.all(), category.pk))
+
+        article.refresh_from_db()
+
+        self.assertEqual(category, article.category)
+
+    def test_queries(self):
+        """Test the number of queries used to move articles.
+
+        The number of queries should not depend on the number of
+        articles moved.
+        """
+        category = create_category()
+
+        for i in range(10):
+            create_article(title='Article {}'.format(i))
+
+        # Listing the articles, checking for slug clashes, moving the
+        # articles, looking up the category slugs, and recording their
+        # slug history, inside a savepoint
+        with self.assertNumQueries(9):
+            articles.move_articles(models.Article.objects.all(), category.pk)
+
+    def test_slug_clash(self):
+        """Test moving an article to a category using its slug.
+
+        The article should be given an unused slug, and its old slug
+        should be recorded.
+        """
+        category = create_category()
+        existing = create_article(title='Foo', category=category)
+        article = create_article(title='Foo')
+
+        articles.move_articles(
+            models.Article.objects.filter(pk=article.pk), category.pk)
+
+        article.refresh_from_db()
+
+        self.assertNotEqual(existing.slug, article.slug)
+        self.assertTrue(models.SlugHistory.objects.filter(
+            article=article, category_slug='', slug=existing.slug).exists())
+
+    def test_unchanged(self):
+        """Test moving articles to the category they are in.
+
+        Nothing should be changed.
+        """
+        category = create_category()
+        create_article(category=category)
+
+        # Only listing the articles, inside a savepoint
+        with self.assertNumQueries(3):
+            self.assertEqual(
+                0, articles.move_articles(
+                    models.Article.objects.all(), category.pk))
+
+
+class TestPublishArticles(TestCase):
+    """Test cases for publishing articles in bulk."""
+
+    def test_invalidate_terms(self):
+        """Test publishing articles used by searches.
+
+        The vocabulary of published articles should be invalidated.
+        """
+        create_article(draft=True)
+        generation = cache.get_generation(cache.TERMS_GENERATION_KEY)
+
+        articles.publish_articles(models.Article.objects.all())
+
+        self.assertEqual(
+            generation + 1, cache.get_generation(cache.TERMS_GENERATION_KEY))
+
+    def test_publish(self):
+        """Test publishing draft articles.
+
+        The articles should be published with a single query, and their
+        publish time should be the current time.
+        """
+        now = timezone.now()
+        draft = create_article(
+            draft=True, time_published=now - timedelta(days=1))
+        create_article()
+
+        # Only updating the articles, inside a savepoint
+        with self.assertNumQueries(3):
+            self.assertEqual(
+                1, articles.publish_articles(
+                    models.Article.objects.all(), now=now))
+
+        draft.refresh_from_db()
+
+        self.assertFalse(draft.draft)
+        self.assertEqual(now, draft.time_published)
+
+
+class TestUnpublishArticles(TestCase):
+    """Test cases for unpublishing articles in bulk."""
+
+    def test_invalidate_terms(self):
+        """Test unpublishing articles used by searches.
+
+        The vocabulary of published articles should be invalidated.
+        """
+        create_article()
+        generation = cache.get_generation(cache.TERMS_GENERATION_KEY)
+
+        articles.unpublish_articles(models.Article.objects.all())
+
+        self.assertEqual(
+            generation + 1, cache.get_generation(cache.TERMS_GENERATION_KEY))
+
+    def test_unpublish(self):
+        """Test turning articles back into drafts."""
+        article = create_article()
+        create_article(draft=True)
+
+        # Only updating the articles, inside a savepoint
+        with self.assertNumQueries(3):
+            self.assertEqual(
+                1, articles.unpublish_articles(models.Article.objects.all()))
+
+        article.refresh_from_db()
+
+        self.assertTrue(article.draft)
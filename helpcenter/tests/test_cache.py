@@ -0,0 +1,260 @@
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from helpcenter import cache
+from helpcenter.testing_utils import create_article, create_category
+from helpcenter.views import IndexView
+
+
+class TestGeneration(TestCase):
+    """Test cases for the content generation number."""
+
+    def setUp(self):
+        """Start each test with an empty cache."""
+        cache.get_cache().clear()
+
+    def test_batch_invalidation(self):
+        """Test invalidating content inside a batch.
+
+        The generation should only be bumped once the outermost batch
+        ends.
+        """
+        generation = cache.get_generation()
+
+        with cache.batch_invalidation():
+            cache.invalidate()
+
+            with cache.batch_invalidation():
+                cache.invalidate()
+
+            self.assertEqual(generation, cache.get_generation())
+
+        self.assertEqual(generation + 1, cache.get_generation())
+
+    def test_bump(self):
+        """Test bumping the generation.
+
+        Bumping the generation should increase the generation number.
+        """
+        generation = cache.get_generation()
+
+        self.assertEqual(generation + 1, cache.bump_generation())
+        self.assertEqual(generation + 1, cache.get_generation())
+
+    def test_bump_missing(self):
+        """Test bumping the generation when it isn't in the cache.
+
+        A new generation should be started.
+        """
+        self.assertIsNotNone(cache.bump_generation())
+
+    def test_bump_terms(self):
+        """Test invalidating the vocabulary of published articles.
+
+        Only the terms generation should be bumped.
+        """
+        generation = cache.get_generation()
+        terms_generation = cache.get_generation(cache.TERMS_GENERATION_KEY)
+
+        cache.invalidate_terms()
+
+        self.assertEqual(generation, cache.get_generation())
+        self.assertEqual(
+            terms_generation + 1,
+            cache.get_generation(cache.TERMS_GENERATION_KEY))
+
+    def test_get_stable(self):
+        """Test getting the generation multiple times.
+
+        The generation should not change unless it is bumped.
+        """
+        self.assertEqual(cache.get_generation(), cache.get_generation())
+
+    def test_save_article(self):
+        """Test saving an article.
+
+        Saving an article should bump the generation.
+        """
+        generation = cache.get_generation()
+
+        create_article()
+
+        self.assertNotEqual(generation, cache.get_generation())
+
+    def test_delete_category(self):
+        """Test deleting a category.
+
+        Deleting a category should bump the generation.
+        """
+        category = create_category()
+        generation = cache.get_generation()
+
+        category.delete()
+
+        self.assertNotEqual(generation, cache.get_generation())
+
+
+class TestInvalidateOnCommit(TransactionTestCase):
+    """Test cases for invalidating content changed in a transaction."""
+
+    def setUp(self):
+        """Start each test with an empty cache."""
+        cache.get_cache().clear()
+
+    @skipUnless(hasattr(transaction, 'on_commit'),
+                'Requires commit callbacks')
+    def test_atomic(self):
+        """Test invalidating content inside a transaction.
+
+        The generation should be bumped again once the transaction
+        commits, so content cached before the commit isn't used.
+        """
+        generation = cache.get_generation()
+
+        with transaction.atomic():
+            cache.invalidate()
+
+            self.assertEqual(generation + 1, cache.get_generation())
+
+        self.assertEqual(generation + 2, cache.get_generation())
+
+    def test_atomic_without_on_commit(self):
+        """Test invalidating content without commit callbacks.
+
+        On versions of Django that can't run callbacks on commit, the
+        generation should only be bumped immediately.
+        """
+        generation = cache.get_generation()
+        on_commit = getattr(transaction, 'on_commit', None)
+
+        if on_commit is not None:
+            del transaction.on_commit
+
+        try:
+            with transaction.atomic():
+                cache.invalidate()
+        finally:
+            if on_commit is not None:
+                transaction.on_commit = on_commit
+
+        self.assertEqual(generation + 1, cache.get_generation())
+
+    def test_batch_outside_atomic(self):
+        """Test a batch wrapping a transaction.
+
+        The generation should be bumped once when the batch ends, after
+        the transaction has committed.
+        """
+        generation = cache.get_generation()
+
+        with cache.batch_invalidation(), transaction.atomic():
+            cache.invalidate()
+            cache.invalidate()
+
+        self.assertEqual(generation + 1, cache.get_generation())
+
+    def test_rollback(self):
+        """Test invalidating content in a transaction that is rolled back.
+
+        The generation should only be bumped once.
+        """
+        generation = cache.get_generation()
+
+        try:
+            with transaction.atomic():
+                cache.invalidate()
+                raise ValueError
+        except ValueError:
+            pass
+
+        self.assertEqual(generation + 1, cache.get_generation())
+
+
+class TestNextPublishTime(TestCase):
+    """Test cases for finding the next scheduled publish time."""
+
+    def setUp(self):
+        """Start each test with an empty cache."""
+        cache.get_cache().clear()
+
+    def test_cached(self):
+        """Test getting the next publish time repeatedly.
+
+        The time should only be looked up once.
+        """
+        create_article(time_published=timezone.now() + timedelta(hours=1))
+        publish_time = cache.get_next_publish_time()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(publish_time, cache.get_next_publish_time())
+
+    def test_nothing_scheduled(self):
+        """Test getting the next publish time with no scheduled articles.
+
+        Drafts and published articles should be ignored.
+        """
+        create_article()
+        create_article(
+            draft=True, time_published=timezone.now() + timedelta(hours=1))
+
+        self.assertIsNone(cache.get_next_publish_time())
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(cache.get_next_publish_time())
+
+    def test_scheduled(self):
+        """Test getting the next publish time.
+
+        The earliest publish time in the future should be returned.
+        """
+        now = timezone.now()
+        article = create_article(time_published=now + timedelta(hours=1))
+        create_article(time_published=now + timedelta(hours=2))
+
+        self.assertEqual(
+            article.time_published, cache.get_next_publish_time())
+
+    @override_settings(HELPCENTER_CACHE_TIMEOUT=300)
+    def test_page_timeout(self):
+        """Test the cache timeout of pages.
+
+        Pages should only be cached until the next article is
+        published.
+        """
+        create_article(time_published=timezone.now() + timedelta(seconds=30))
+
+        self.assertTrue(0 < IndexView().get_cache_timeout() <= 30)
+
+    @override_settings(HELPCENTER_CACHE_TIMEOUT=300)
+    def test_page_timeout_nothing_scheduled(self):
+        """Test the cache timeout of pages without scheduled articles.
+
+        Pages should be cached for the configured timeout.
+        """
+        self.assertEqual(300, IndexView().get_cache_timeout())
+
+
+class TestMakeKey(TestCase):
+    """Test cases for creating cache keys."""
+
+    def test_different_parts(self):
+        """Test creating keys from different values.
+
+        Different values should produce different keys.
+        """
+        self.assertNotEqual(
+            cache.make_key('page', 'foo'), cache.make_key('page', 'bar'))
+
+    def test_new_generation(self):
+        """Test creating a key after the generation changes.
+
+        Keys from the old generation should no longer be produced.
+        """
+        key = cache.make_key('page', 'foo')
+        cache.bump_generation()
+
+        self.assertNotEqual(key, cache.make_key('page', 'foo'))
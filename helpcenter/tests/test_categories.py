@@ -0,0 +1,273 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+
+from helpcenter import cache, categories, models, redirects
+from helpcenter.testing_utils import create_article, create_category
+
+
+class TestAutocomplete(TestCase):
+    """Test cases for finding categories to autocomplete."""
+
+    def test_autocomplete(self):
+        """Test finding categories by the beginning of their title.
+
+        The categories should be found with one query, ignoring case,
+        and returned with their labels.
+        """
+        parent = create_category(title='Account')
+        child = create_category(title='Passwords', parent=parent)
+        create_category(title='Billing')
+
+        with self.assertNumQueries(1):
+            results = categories.autocomplete('pass')
+
+        self.assertEqual(
+            [{'id': child.pk, 'label': 'Account > Passwords'}], results)
+
+    def test_empty(self):
+        """Test autocompleting an empty query.
+
+        No categories should be returned.
+        """
+        create_category()
+
+        with self.assertNumQueries(0):
+            self.assertEqual([], categories.autocomplete('  '))
+
+    @override_settings(HELPCENTER_AUTOCOMPLETE_RESULTS=1)
+    def test_limit(self):
+        """Test limiting the number of categories returned."""
+        create_category(title='Foo')
+        create_category(title='Foo bar')
+
+        self.assertEqual(1, len(categories.autocomplete('foo')))
+
+    def test_renamed(self):
+        """Test autocompleting a category after it is renamed.
+
+        The category should be found by its new title.
+        """
+        category = create_category(title='Foo')
+        category.title = 'Bar'
+        category.save(update_fields=['title'])
+
+        self.assertEqual(
+            [{'id': category.pk, 'label': 'Bar'}],
+            categories.autocomplete('BA'))
+        self.assertEqual([], categories.autocomplete('foo'))
+
+
+class TestDeleteCategories(TestCase):
+    """Test cases for deleting categories."""
+
+    def setUp(self):
+        """Create a small category tree.
+
+        The tree is ``root > category > child > grandchild``, with an
+        article in ``category`` and ``child``.
+        """
+        cache.get_cache().clear()
+
+        self.root = create_category(title='Root')
+        self.category = create_category(title='Category', parent=self.root)
+        self.child = create_category(title='Child', parent=self.category)
+        self.grandchild = create_category(
+            title='Grandchild', parent=self.child)
+
+        self.article = create_article(category=self.category)
+        self.child_article = create_article(category=self.child)
+
+    def assertPath(self, category, *ancestors):
+        """Assert that a category's path, depth, and label match its
+        ancestors.
+        """
+        category.refresh_from_db()
+        expected = ''.join(
+            '{}/'.format(ancestor.pk) for ancestor in ancestors + (category,))
+
+        self.assertEqual(expected, category.path)
+        self.assertEqual(len(ancestors), category.depth)
+        self.assertEqual(
+            ' > '.join(ancestor.title for ancestor in ancestors + (category,)),
+            category.label)
+
+    def test_cascade(self):
+        """Test deleting a category with the cascade policy.
+
+        The category's whole subtree should be deleted, including its
+        articles.
+        """
+        categories.delete_categories(
+            models.Category.objects.filter(pk=self.category.pk), 'cascade')
+
+        self.assertEqual(
+            [self.root], list(models.Category.objects.all()))
+        self.assertFalse(models.Article.objects.exists())
+
+    def test_invalidate_once(self):
+        """Test the cache invalidation of a deletion.
+
+        The content generation should only be bumped once.
+        """
+        generation = cache.get_generation()
+
+        categories.delete_categories(
+            models.Category.objects.filter(pk=self.category.pk), 'cascade')
+
+        self.assertEqual(generation + 1, cache.get_generation())
+
+    @override_settings(HELPCENTER_CATEGORY_DELETE_POLICY='foo')
+    def test_invalid_policy(self):
+        """Test deleting a category with an invalid policy setting."""
+        with self.assertRaises(ImproperlyConfigured):
+            self.category.delete()
+
+    def test_orphan(self):
+        """Test deleting a category with the orphan policy.
+
+        The category's articles and subcategories should become top
+        level content.
+        """
+        categories.delete_categories(
+            models.Category.objects.filter(pk=self.category.pk), 'orphan')
+
+        self.article.refresh_from_db()
+        self.child.refresh_from_db()
+
+        self.assertIsNone(self.article.category)
+        self.assertIsNone(self.child.parent)
+        self.assertPath(self.child)
+        self.assertPath(self.grandchild, self.child)
+
+    def test_queries(self):
+        """Test the number of queries used to delete a category.
+
+        The number of queries should not depend on the size of the
+        category's subtree.
+        """
+        parent = self.grandchild
+
+        for i in range(10):
+            parent = create_category(title='Deep', parent=parent)
+            create_article(category=parent)
+
+        # Looking up the categories and the label of their new parent,
+        # moving the subtree, listing and moving the articles, checking
+        # for slug clashes, moving the subcategories, recording the
+        # articles' slug history, and deleting the category, inside a
+        # savepoint
+        with self.assertNumQueries(17):
+            categories.delete_categories(
+                models.Category.objects.filter(pk=self.category.pk),
+                'reparent')
+
+        parent.refresh_from_db()
+
+        self.assertEqual(12, parent.depth)
+        self.assertTrue(parent.path.startswith(
+            '{}/{}/{}/'.format(self.root.pk, self.child.pk,
+                               self.grandchild.pk)))
+
+    def test_reparent(self):
+        """Test deleting a category with the reparent policy.
+
+        The category's articles and subcategories should be moved to its
+        parent.
+        """
+        categories.delete_categories(
+            models.Category.objects.filter(pk=self.category.pk), 'reparent')
+
+        self.article.refresh_from_db()
+        self.child.refresh_from_db()
+
+        self.assertEqual(self.root, self.article.category)
+        self.assertEqual(self.root, self.child.parent)
+        self.assertPath(self.child, self.root)
+        self.assertPath(self.grandchild, self.root, self.child)
+
+    def test_reparent_nested(self):
+        """Test deleting a category along with its subcategory.
+
+        Contents should be moved to the closest ancestor that isn't
+        deleted.
+        """
+        categories.delete_categories(
+            models.Category.objects.filter(
+                pk__in=[self.category.pk, self.child.pk]),
+            'reparent')
+
+        self.child_article.refresh_from_db()
+        self.grandchild.refresh_from_db()
+
+        self.assertEqual(self.root, self.child_article.category)
+        self.assertEqual(self.root, self.grandchild.parent)
+        self.assertPath(self.grandchild, self.root)
+
+    def test_reparent_slug_clash(self):
+        """Test moving articles into a category using their slugs.
+
+        The moved articles should be given unused slugs.
+        """
+        existing = create_article(category=self.root)
+
+        categories.delete_categories(
+            models.Category.objects.filter(
+                pk__in=[self.category.pk, self.child.pk]),
+            'reparent')
+
+        slugs = models.Article.objects.filter(
+            category=self.root).values_list('slug', flat=True)
+
+        self.assertEqual(3, len(set(slugs)))
+        self.assertIn(existing.slug, slugs)
+
+    @override_settings(HELPCENTER_SLUG_URLS=True)
+    def test_redirects(self):
+        """Test links to articles moved out of a deleted category.
+
+        The moved articles should be marked as edited, and links using
+        the deleted category's slug should be redirected.
+        """
+        existing = create_article(category=self.root)
+        time_edited = self.article.time_edited
+
+        categories.delete_categories(
+            models.Category.objects.filter(pk=self.category.pk),
+            'reparent')
+
+        self.article.refresh_from_db()
+
+        self.assertGreater(self.article.time_edited, time_edited)
+        self.assertNotEqual(existing.slug, self.article.slug)
+        self.assertEqual(
+            self.article.get_absolute_url(),
+            redirects.get_slug_redirect(self.category.slug, existing.slug))
+
+    def test_reused_slug(self):
+        """Test creating a category with a deleted category's slug.
+
+        Links into the new category should no longer be redirected.
+        """
+        slug = self.category.slug
+        categories.delete_categories(
+            models.Category.objects.filter(pk=self.category.pk), 'orphan')
+
+        self.assertTrue(models.SlugHistory.objects.filter(
+            category_slug=slug).exists())
+
+        create_category(title='Category')
+
+        self.assertFalse(models.SlugHistory.objects.filter(
+            category_slug=slug).exists())
+
+    @override_settings(HELPCENTER_CATEGORY_DELETE_POLICY='reparent')
+    def test_setting(self):
+        """Test deleting a category through the model.
+
+        The policy given by the setting should be used.
+        """
+        self.category.delete()
+        self.article.refresh_from_db()
+
+        self.assertEqual(self.root, self.article.category)
+        self.assertIsNone(self.category.pk)
@@ -0,0 +1,124 @@
+from django.test import SimpleTestCase, override_settings
+
+from helpcenter import content
+
+
+class TestExcerpt(SimpleTestCase):
+    """Test cases for getting the excerpt of an article."""
+
+    @override_settings(HELPCENTER_EXCERPT_LENGTH=10)
+    def test_long_text(self):
+        """Test getting the excerpt of a long text.
+
+        The excerpt should be cut off between words so it fits in the
+        configured length.
+        """
+        self.assertEqual(
+            'This is...', content.get_excerpt('This is too long.'))
+        self.assertEqual(
+            'Thisist...', content.get_excerpt('Thisistoolong.'))
+
+    def test_short_text(self):
+        """Test getting the excerpt of a short text.
+
+        Text shorter than the excerpt length should be unchanged.
+        """
+        self.assertEqual('Short.', content.get_excerpt('Short.'))
+
+
+class TestProcessBody(SimpleTestCase):
+    """Test cases for processing the body of an article."""
+
+    def test_collapse_whitespace(self):
+        """Test minifying the body.
+
+        Runs of whitespace should be collapsed, except in preformatted
+        text.
+        """
+        processed = content.process_body(
+            '<p>Foo\n\n   bar</p>\n<pre>a\n  b</pre>')
+
+        self.assertEqual('<p>Foo bar</p> <pre>a\n  b</pre>', processed.html)
+
+    def test_disallowed_tags(self):
+        """Test processing a body containing disallowed tags.
+
+        Disallowed tags should be removed while keeping their text,
+        except for scripts and styles which are removed entirely.
+        """
+        processed = content.process_body(
+            '<form>Hi <script>alert(1);</script><style>p {}</style></form>')
+
+        self.assertEqual('Hi', processed.html)
+        self.assertEqual('Hi', processed.text)
+
+    def test_disallowed_urls(self):
+        """Test processing a body containing javascript URLs.
+
+        Only URLs with safe schemes should be kept.
+        """
+        processed = content.process_body(
+            '<a href="java\tscript:alert(1)" title="t">x</a>'
+            '<a href="/docs/">y</a><img src="https://example.com/a.png">')
+
+        self.assertEqual(
+            '<a title="t">x</a><a href="/docs/">y</a>'
+            '<img src="https://example.com/a.png">',
+            processed.html)
+
+    def test_entities(self):
+        """Test processing a body containing entities.
+
+        Entities should be decoded in the text and escaped again in the
+        HTML.
+        """
+        processed = content.process_body('<p>Fish &amp; chips &lt;3</p>')
+
+        self.assertEqual('<p>Fish &amp; chips &lt;3</p>', processed.html)
+        self.assertEqual('Fish & chips <3', processed.text)
+
+    def test_table_of_contents(self):
+        """Test generating a table of contents.
+
+        Each heading should be given a unique id and listed in the
+        table of contents.
+        """
+        processed = content.process_body(
+            '<h2>Usage</h2><h3>Basic <em>usage</em></h3><h2>Usage</h2>')
+
+        self.assertEqual([
+            {'id': 'usage', 'level': 2, 'title': 'Usage'},
+            {'id': 'basic-usage', 'level': 3, 'title': 'Basic usage'},
+            {'id': 'usage-2', 'level': 2, 'title': 'Usage'},
+        ], processed.toc)
+        self.assertIn('<h3 id="basic-usage">', processed.html)
+
+    def test_unclosed_tags(self):
+        """Test processing a body with tags that are never closed.
+
+        The tags should be closed at the end of the body.
+        """
+        processed = content.process_body('<div><h2>Title<p>Text')
+
+        self.assertEqual(
+            '<div><h2 id="titletext">Title<p>Text</p></h2></div>',
+            processed.html)
+
+    def test_word_count(self):
+        """Test counting the words in a body."""
+        processed = content.process_body('<p>One two</p><p>three</p>')
+
+        self.assertEqual(3, processed.word_count)
+
+
+class TestReadingTime(SimpleTestCase):
+    """Test cases for estimating the reading time of an article."""
+
+    def test_empty(self):
+        """Test the reading time of an article without words."""
+        self.assertEqual(0, content.get_reading_time(0))
+
+    @override_settings(HELPCENTER_READING_SPEED=100)
+    def test_rounds_up(self):
+        """Test that the reading time is rounded up to a minute."""
+        self.assertEqual(2, content.get_reading_time(101))
@@ -0,0 +1,133 @@
+from django.contrib.auth import get_user_model
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+
+from helpcenter import duplicates, minhash, models
+from helpcenter.api.bulk import BulkArticleOperations
+from helpcenter.testing_utils import create_article
+
+
+BODY = ('To reset your password, open the account settings page and '
+        'click the reset password button. A link will be sent to the '
+        'email address on your account within a few minutes.')
+
+
+class TestDuplicates(TestCase):
+    """Test cases for finding near-duplicate articles."""
+
+    def test_find(self):
+        """Test finding the near-duplicates of an article.
+
+        Only articles with near-identical text should be found.
+        """
+        article = create_article(title='Foo', body=BODY)
+        duplicate = create_article(title='Bar', body=BODY + ' Thanks!')
+        create_article(title='Baz', body='Our office is open on weekdays.')
+
+        found = duplicates.find_duplicates(article)
+
+        self.assertEqual([duplicate], [other for other, _ in found])
+
+    def test_find_all(self):
+        """Test finding every pair of near-duplicate articles."""
+        article = create_article(title='Foo', body=BODY)
+        duplicate = create_article(title='Bar', body=BODY)
+        create_article(title='Baz', body='Our office is open on weekdays.')
+
+        self.assertEqual(
+            [(article, duplicate, 1.0)], duplicates.find_all_duplicates())
+
+    def test_index_bulk(self):
+        """Test the buckets of articles changed in bulk.
+
+        Changing an article's body should replace its buckets.
+        """
+        article = create_article(body='Our office is open on weekdays.')
+        duplicate = create_article(title='Bar', body=BODY)
+        operations = BulkArticleOperations([
+            {'action': 'update', 'id': article.pk, 'data': {'body': BODY}},
+        ])
+
+        self.assertTrue(operations.is_valid())
+
+        operations.save()
+        article.refresh_from_db()
+
+        self.assertEqual(
+            [duplicate],
+            [other for other, _ in duplicates.find_duplicates(article)])
+
+    def test_index_on_save(self):
+        """Test the buckets of a saved article.
+
+        Each band of the article's signature should be stored, and
+        saving the article again should replace them.
+        """
+        article = create_article(body=BODY)
+        article.body = 'Something else entirely.'
+        article.save()
+
+        self.assertEqual(minhash.BANDS, models.MinHashBucket.objects.filter(
+            article=article).count())
+        self.assertEqual([], duplicates.find_all_duplicates())
+
+    def test_warning(self):
+        """Test saving an article with a near-duplicate.
+
+        The user should be warned about the near-duplicate.
+        """
+        create_article(title='Reset your password', body=BODY)
+        user = get_user_model().objects.create_superuser(
+            email='admin@example.com', password='password', username='admin')
+        self.client.force_login(user)
+
+        response = self.client.post(
+            reverse('helpcenter:article-create'),
+            {'body': BODY, 'title': 'Password resets'},
+            follow=True)
+
+        self.assertContains(
+            response,
+            'This article is very similar to: &quot;Reset your password&quot;')
+
+
+class TestDuplicatesAdmin(TestCase):
+    """Test cases for the near-duplicate admin report."""
+
+    def setUp(self):
+        """Log in as a superuser."""
+        user = get_user_model().objects.create_superuser(
+            email='admin@example.com', password='password', username='admin')
+        self.client.force_login(user)
+
+    def test_report(self):
+        """Test the near-duplicate report.
+
+        Every near-duplicate pair should be listed.
+        """
+        create_article(title='Foo', body=BODY)
+        create_article(title='Bar', body=BODY)
+
+        response = self.client.get(
+            reverse('admin:helpcenter_article_duplicates'))
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(1, len(response.context['duplicates']))
+
+    def test_save_warning(self):
+        """Test saving a near-duplicate article in the admin."""
+        create_article(title='Reset your password', body=BODY)
+
+        response = self.client.post(
+            reverse('admin:helpcenter_article_add'),
+            {
+                'body': BODY,
+                'time_published_0': '2017-01-01',
+                'time_published_1': '00:00:00',
+                'title': 'Password resets',
+            },
+            follow=True)
+
+        self.assertIn(
+            'This article is very similar to: "Reset your password" (100%)',
+            [str(message) for message in response.context['messages']])
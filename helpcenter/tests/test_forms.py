@@ -0,0 +1,55 @@
+from django.test import TestCase
+
+from helpcenter import forms
+from helpcenter.testing_utils import create_article, create_category
+
+
+class TestArticleForm(TestCase):
+    """Test cases for the article form."""
+
+    def test_render_queries(self):
+        """Test the number of queries made to render the form.
+
+        Only the label of the article's category should be looked up,
+        no matter how many categories there are.
+        """
+        article = create_article(category=create_category())
+
+        for i in range(10):
+            create_category()
+
+        form = forms.ArticleForm(instance=article)
+
+        with self.assertNumQueries(1):
+            form.as_p()
+
+
+class TestCategoryAutocompleteWidget(TestCase):
+    """Test cases for the category autocomplete widget."""
+
+    def test_render(self):
+        """Test rendering the widget.
+
+        The selected category's id and label should be rendered.
+        """
+        parent = create_category(title='Parent')
+        category = create_category(title='Child', parent=parent)
+
+        html = forms.CategoryAutocompleteWidget().render(
+            'category', category.pk, {'id': 'id_category'})
+
+        self.assertInHTML(
+            '<input id="id_category" name="category" type="hidden" '
+            'value="{}" />'.format(category.pk),
+            html)
+        self.assertIn('value="Parent &gt; Child"', html)
+
+    def test_render_invalid(self):
+        """Test rendering the widget with an invalid id.
+
+        The label should be left empty.
+        """
+        html = forms.CategoryAutocompleteWidget().render(
+            'category', 'foo', {'id': 'id_category'})
+
+        self.assertIn('value=""', html)
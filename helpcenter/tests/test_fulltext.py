@@ -0,0 +1,75 @@
+from django.test import SimpleTestCase, TestCase
+
+from helpcenter import fulltext, models
+from helpcenter.testing_utils import create_article
+
+
+class TestFilterArticles(TestCase):
+    """Test cases for searching articles by their terms."""
+
+    def test_body(self):
+        """Test searching for a word in an article's body."""
+        article = create_article(title='Foo', body='<p>Reset password</p>')
+        create_article(title='Bar', body='Password')
+
+        self.assertEqual(
+            [article],
+            list(fulltext.filter_articles(
+                models.Article.objects.all(), 'reset PASSWORD')))
+
+    def test_empty(self):
+        """Test searching without any words.
+
+        Every article should be matched.
+        """
+        articles = models.Article.objects.all()
+
+        self.assertIs(articles, fulltext.filter_articles(articles, ' ?'))
+
+    def test_prefix(self):
+        """Test searching for the beginning of a word."""
+        article = create_article(title='Passwords')
+
+        self.assertEqual(
+            [article],
+            list(fulltext.filter_articles(
+                models.Article.objects.all(), 'pass')))
+
+    def test_reindexed(self):
+        """Test searching after an article changes.
+
+        The article's old terms should be replaced.
+        """
+        article = create_article(title='Foo', body='Bar')
+        article.title = 'Baz'
+        article.save()
+
+        articles = models.Article.objects.all()
+
+        self.assertEqual([], list(fulltext.filter_articles(articles, 'foo')))
+        self.assertEqual(
+            [article], list(fulltext.filter_articles(articles, 'baz')))
+
+
+class TestGetTerms(SimpleTestCase):
+    """Test cases for getting the terms of text."""
+
+    def test_get_terms(self):
+        """Test getting the terms of text.
+
+        The distinct words should be lowercased and truncated.
+        """
+        long_word = 'a' * (fulltext.MAX_LENGTH + 10)
+
+        self.assertEqual(
+            {'foo', 'bar', long_word[:fulltext.MAX_LENGTH]},
+            fulltext.get_terms('Foo bar, foo! {}'.format(long_word)))
+
+    def test_article_terms(self):
+        """Test getting the terms of an article.
+
+        Markup in the article's body should be ignored.
+        """
+        self.assertEqual(
+            {'foo', 'bar'},
+            fulltext.get_article_terms('Foo', '<strong>Bar</strong>'))
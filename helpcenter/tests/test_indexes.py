@@ -0,0 +1,97 @@
+from unittest import skipUnless
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.paginator import Paginator
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from helpcenter import models
+from helpcenter.testing_utils import create_article, create_category
+
+
+def explain(queryset):
+    """Get SQLite's query plan for a queryset."""
+    sql, params = queryset.query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN {}'.format(sql), params)
+
+        return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+
+
+def get_index_name(*columns):
+    """Get the name of the article index on the given columns."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, models.Article._meta.db_table)
+
+    for name, info in constraints.items():
+        if info['index'] and tuple(info['columns']) == columns:
+            return name
+
+    raise AssertionError('No index on {}.'.format(columns))
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Query plans are SQLite specific.')
+class TestArticleIndexes(TestCase):
+    """Test cases for the indexes used by article queries."""
+
+    def setUp(self):
+        """Create articles to query."""
+        self.category = create_category()
+
+        for i in range(5):
+            create_article(category=self.category, title=str(i))
+
+        self.listing_index = get_index_name(
+            'category_id', 'draft', 'time_published', 'id')
+
+    def assertUsesIndex(self, queryset, index):
+        """Assert a query uses an index without sorting its results."""
+        plan = explain(queryset)
+
+        self.assertIn(index, plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_edited_since(self):
+        """Test getting the articles edited since a certain time."""
+        queryset = models.Article.objects.edited_since(timezone.now())
+
+        self.assertUsesIndex(
+            queryset, get_index_name('draft', 'time_edited'))
+
+    def test_listing(self):
+        """Test listing the published articles in a category.
+
+        This is the query made by the category detail view.
+        """
+        queryset = self.category.article_list.for_listing().visible_to(
+            AnonymousUser())
+
+        self.assertUsesIndex(queryset, self.listing_index)
+
+    def test_listing_top_level(self):
+        """Test listing the published articles without a category.
+
+        This is the query made by the index view.
+        """
+        queryset = models.Article.objects.for_listing().visible_to(
+            AnonymousUser()).filter(category=None)
+
+        self.assertUsesIndex(queryset, self.listing_index)
+
+    def test_pagination(self):
+        """Test counting and paginating the articles in a category.
+
+        The category detail view counts the published articles in the
+        category, then fetches a page of them.
+        """
+        queryset = self.category.article_list.for_listing().visible_to(
+            AnonymousUser())
+        page = Paginator(queryset, 2).page(2)
+
+        self.assertUsesIndex(page.object_list, self.listing_index)
+        self.assertIn(
+            self.listing_index,
+            explain(queryset.values('pk').order_by()))
@@ -0,0 +1,248 @@
+import warnings
+
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from helpcenter import instrumentation, models, search
+from helpcenter.testing_utils import (
+    AuthTestMixin, QueryBudgetTestMixin, create_article, create_category)
+
+
+class TestCaptureMetrics(TestCase):
+    """Test cases for capturing the metrics of views."""
+
+    @override_settings(HELPCENTER_INSTRUMENT_VIEWS=False)
+    def test_capture(self):
+        """Test capturing the metrics of a view.
+
+        Views should be instrumented while metrics are being captured,
+        even if instrumentation is disabled.
+        """
+        create_article()
+
+        with instrumentation.capture_metrics() as captured:
+            self.client.get(reverse('helpcenter:index'))
+
+        self.assertEqual(1, len(captured))
+        self.assertEqual('IndexView', captured[0].name)
+        self.assertEqual(2, captured[0].queries)
+        self.assertFalse(instrumentation.is_enabled())
+
+    def test_view_set_action(self):
+        """Test capturing the metrics of a view set.
+
+        The metrics should be named after the view set and action, and
+        the budget for the action should be used.
+        """
+        with instrumentation.capture_metrics() as captured:
+            self.client.get(reverse('helpcenter:helpcenter-api:article-list'))
+
+        self.assertEqual('ArticleViewSet.list', captured[0].name)
+        self.assertEqual(5, captured[0].budget)
+
+
+class TestCaptureQueries(TestCase):
+    """Test cases for capturing the queries made on every connection."""
+
+    def test_nested(self):
+        """Test capturing queries inside another capture.
+
+        The outer capture should also include the inner capture's
+        queries, and every query should still be added to the
+        connection's log.
+        """
+        with instrumentation.capture_queries() as outer:
+            list(models.Article.objects.all())
+
+            with instrumentation.capture_queries() as inner:
+                list(models.Category.objects.all())
+
+        self.assertEqual(['default'], [alias for alias, _ in inner])
+        self.assertEqual(2, len(outer))
+        self.assertEqual(
+            [query for _, query in outer],
+            list(connection.queries_log)[-2:])
+
+
+class TestCheckBudget(TestCase):
+    """Test cases for warning about exceeded budgets."""
+
+    @override_settings(DEBUG=True)
+    def test_over_budget(self):
+        """Test checking metrics that exceed their budget.
+
+        A warning should be issued if DEBUG is true.
+        """
+        metrics = instrumentation.ViewMetrics(name='FooView', budget=1)
+        metrics.queries = 2
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            instrumentation.check_budget(metrics)
+
+        self.assertEqual(1, len(caught))
+        self.assertTrue(issubclass(
+            caught[0].category, instrumentation.QueryBudgetWarning))
+
+    @override_settings(DEBUG=False)
+    def test_over_budget_production(self):
+        """Test checking metrics that exceed their budget without DEBUG.
+
+        No warning should be issued.
+        """
+        metrics = instrumentation.ViewMetrics(name='FooView', budget=1)
+        metrics.queries = 2
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            instrumentation.check_budget(metrics)
+
+        self.assertEqual([], caught)
+
+    def test_no_budget(self):
+        """Test metrics for a view without a budget.
+
+        The view should never be over budget.
+        """
+        metrics = instrumentation.ViewMetrics(name='FooView')
+        metrics.queries = 100
+
+        self.assertFalse(metrics.over_budget)
+
+
+class TestInstrument(TestCase):
+    """Test cases for recording metrics."""
+
+    def test_cache_access(self):
+        """Test recording cache accesses.
+
+        Cache hits and misses should be recorded on the current
+        metrics.
+        """
+        with instrumentation.instrument() as metrics:
+            instrumentation.record_cache_access(True)
+            instrumentation.record_cache_access(False)
+            instrumentation.record_cache_access(False)
+
+        self.assertEqual(1, metrics.cache_hits)
+        self.assertEqual(2, metrics.cache_misses)
+
+    def test_cache_access_outside_view(self):
+        """Test recording a cache access outside of a view.
+
+        Nothing should happen.
+        """
+        instrumentation.record_cache_access(True)
+
+    def test_queries(self):
+        """Test counting queries.
+
+        Every query made inside the context should be counted.
+        """
+        with instrumentation.instrument() as metrics:
+            list(models.Article.objects.all())
+            list(models.Category.objects.all())
+
+        self.assertEqual(2, metrics.queries)
+        self.assertTrue(metrics.db_time >= 0)
+        self.assertTrue(metrics.total_time > 0)
+
+    def test_queries_full_log(self):
+        """Test counting queries once the connection's log is full.
+
+        Queries should still be counted, even though the log no longer
+        grows.
+        """
+        connection.queries_log.extend(
+            {'sql': '', 'time': '0.000'}
+            for _ in range(connection.queries_limit))
+
+        try:
+            with instrumentation.instrument() as metrics:
+                list(models.Article.objects.all())
+        finally:
+            connection.queries_log.clear()
+
+        self.assertEqual(1, metrics.queries)
+
+
+class TestQueryBudgets(AuthTestMixin, QueryBudgetTestMixin, TestCase):
+    """Test that each view stays within its query budget."""
+
+    def setUp(self, *args, **kwargs):
+        """Create content and log in a user with every permission."""
+        super(TestQueryBudgets, self).setUp(*args, **kwargs)
+
+        for permission in ('add_article', 'change_article', 'delete_article',
+                           'add_category', 'change_category',
+                           'delete_category'):
+            self.add_permission(permission)
+
+        self.login()
+
+        self.category = create_category()
+        self.article = create_article(category=self.category)
+
+    def test_article_create(self):
+        """Test the budget of the article create view."""
+        self.assertWithinQueryBudget(
+            self.client.get, reverse('helpcenter:article-create'))
+
+    def test_article_delete(self):
+        """Test the budget of the article delete view."""
+        self.assertWithinQueryBudget(
+            self.client.post, self.article.get_delete_url())
+
+    def test_article_detail(self):
+        """Test the budget of the article detail view."""
+        self.assertWithinQueryBudget(
+            self.client.get, self.article.get_absolute_url())
+
+    def test_article_update(self):
+        """Test the budget of the article update view."""
+        data = {
+            'body': 'Foo',
+            'category': self.category.pk,
+            'title': 'Foo',
+        }
+
+        self.assertWithinQueryBudget(
+            self.client.post, self.article.get_update_url(), data)
+
+    def test_category_create(self):
+        """Test the budget of the category create view."""
+        self.assertWithinQueryBudget(
+            self.client.post, reverse('helpcenter:category-create'),
+            {'title': 'Foo', 'parent': self.category.pk})
+
+    def test_category_delete(self):
+        """Test the budget of the category delete view."""
+        self.assertWithinQueryBudget(
+            self.client.post, self.category.get_delete_url())
+
+    def test_category_detail(self):
+        """Test the budget of the category detail view."""
+        create_category(parent=self.category)
+
+        self.assertWithinQueryBudget(
+            self.client.get, self.category.get_absolute_url())
+
+    def test_category_update(self):
+        """Test the budget of the category update view."""
+        self.assertWithinQueryBudget(
+            self.client.get, self.category.get_update_url())
+
+    def test_index(self):
+        """Test the budget of the index view."""
+        self.assertWithinQueryBudget(
+            self.client.get, reverse('helpcenter:index'))
+
+    def test_search(self):
+        """Test the budget of the search view."""
+        search._local_cache.clear()
+        search._local_index.clear()
+
+        self.assertWithinQueryBudget(
+            self.client.get, reverse('helpcenter:search'),
+            {'q': self.article.title})
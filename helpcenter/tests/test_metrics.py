@@ -0,0 +1,133 @@
+from django.test import TestCase, override_settings
+
+from helpcenter import cache, instrumentation, metrics
+
+
+class MetricsTestMixin(object):
+    """Mixin giving each test an empty metrics store."""
+
+    def setUp(self, *args, **kwargs):
+        """Clear buffered and stored samples."""
+        super(MetricsTestMixin, self).setUp(*args, **kwargs)
+
+        metrics.flush()
+        cache.get_cache().clear()
+
+
+class TestCounter(MetricsTestMixin, TestCase):
+    """Test cases for counters."""
+
+    def test_inc(self):
+        """Test incrementing a counter.
+
+        The total of every increment should be rendered.
+        """
+        metrics.DB_QUERIES.inc(2, view='FooView')
+        metrics.DB_QUERIES.inc(3, view='FooView')
+
+        self.assertIn(
+            'helpcenter_db_queries_total{view="FooView"} 5',
+            metrics.render())
+
+    def test_label_escaping(self):
+        """Test rendering a label containing special characters.
+
+        Quotes and backslashes should be escaped.
+        """
+        metrics.DB_QUERIES.inc(view='Foo"\\View')
+
+        self.assertIn(
+            'helpcenter_db_queries_total{view="Foo\\"\\\\View"} 1',
+            metrics.render())
+
+
+class TestFlush(MetricsTestMixin, TestCase):
+    """Test cases for flushing samples to the cache."""
+
+    def test_buffered(self):
+        """Test recording a sample before the flush interval.
+
+        The sample should stay in the thread's buffer.
+        """
+        metrics.DB_QUERIES.inc(view='FooView')
+
+        self.assertIsNone(cache.get_cache().get(metrics.SERIES_KEY))
+
+    @override_settings(HELPCENTER_METRICS_FLUSH_INTERVAL=0)
+    def test_interval(self):
+        """Test recording a sample after the flush interval.
+
+        The buffer should be flushed to the cache.
+        """
+        metrics.DB_QUERIES.inc(view='FooView')
+
+        self.assertEqual(
+            {('helpcenter_db_queries_total', (('view', 'FooView'),))},
+            cache.get_cache().get(metrics.SERIES_KEY))
+
+    def test_merge(self):
+        """Test flushing samples multiple times.
+
+        The samples from each flush should be added together.
+        """
+        metrics.DB_QUERIES.inc(view='FooView')
+        metrics.flush()
+        metrics.DB_QUERIES.inc(view='FooView')
+        metrics.flush()
+
+        self.assertIn(
+            'helpcenter_db_queries_total{view="FooView"} 2',
+            metrics.render())
+
+
+class TestHistogram(MetricsTestMixin, TestCase):
+    """Test cases for histograms."""
+
+    def test_observe(self):
+        """Test observing values.
+
+        The buckets should be cumulative, and the sum and count of the
+        observations should be rendered.
+        """
+        metrics.SEARCH_LATENCY.observe(0.001)
+        metrics.SEARCH_LATENCY.observe(0.2)
+
+        content = metrics.render()
+
+        self.assertIn(
+            'helpcenter_search_duration_seconds_bucket{le="0.005"} 1',
+            content)
+        self.assertIn(
+            'helpcenter_search_duration_seconds_bucket{le="0.25"} 2',
+            content)
+        self.assertIn(
+            'helpcenter_search_duration_seconds_bucket{le="+Inf"} 2',
+            content)
+        self.assertIn('helpcenter_search_duration_seconds_sum 0.201', content)
+        self.assertIn('helpcenter_search_duration_seconds_count 2', content)
+
+
+class TestRecordView(MetricsTestMixin, TestCase):
+    """Test cases for recording the metrics of a view."""
+
+    def test_record(self):
+        """Test recording view metrics.
+
+        The view's latency, queries, and cache accesses should be
+        recorded.
+        """
+        view_metrics = instrumentation.ViewMetrics(name='FooView')
+        view_metrics.cache_hits = 1
+        view_metrics.queries = 3
+        view_metrics.total_time = 0.1
+
+        metrics.record_view(view_metrics)
+        content = metrics.render()
+
+        self.assertIn(
+            'helpcenter_cache_hits_total{view="FooView"} 1', content)
+        self.assertIn(
+            'helpcenter_db_queries_total{view="FooView"} 3', content)
+        self.assertIn(
+            'helpcenter_request_duration_seconds_count{view="FooView"} 1',
+            content)
@@ -0,0 +1,101 @@
+import time
+
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from helpcenter import routers
+from helpcenter.middleware import ReplicaStickinessMiddleware
+
+
+class TestReplicaStickinessMiddleware(TestCase):
+    """Test cases for the replica stickiness middleware."""
+    cookie_name = ReplicaStickinessMiddleware.cookie_name
+
+    def setUp(self):
+        """Create a request factory and the middleware."""
+        routers.reset_state()
+        self.factory = RequestFactory()
+        self.middleware = ReplicaStickinessMiddleware()
+
+    def tearDown(self):
+        """Don't leak pinned state into other tests."""
+        routers.reset_state()
+
+    def test_expired_cookie(self):
+        """Test a request with an expired pin cookie.
+
+        The request should not be pinned to the primary.
+        """
+        request = self.factory.get('/')
+        request.COOKIES[self.cookie_name] = str(time.time() - 1)
+
+        self.middleware.process_request(request)
+
+        self.assertFalse(routers.is_pinned())
+
+    def test_invalid_cookie(self):
+        """Test a request with a malformed pin cookie.
+
+        The cookie should be ignored.
+        """
+        request = self.factory.get('/')
+        request.COOKIES[self.cookie_name] = 'foo'
+
+        self.middleware.process_request(request)
+
+        self.assertFalse(routers.is_pinned())
+
+    def test_no_write(self):
+        """Test a request that doesn't write anything.
+
+        No pin cookie should be set.
+        """
+        request = self.factory.get('/')
+
+        self.middleware.process_request(request)
+        response = self.middleware.process_response(request, HttpResponse())
+
+        self.assertNotIn(self.cookie_name, response.cookies)
+
+    def test_pinned(self):
+        """Test a request with a valid pin cookie.
+
+        The request should be pinned to the primary.
+        """
+        request = self.factory.get('/')
+        request.COOKIES[self.cookie_name] = str(time.time() + 10)
+
+        self.middleware.process_request(request)
+
+        self.assertTrue(routers.is_pinned())
+
+    def test_response_error(self):
+        """Test a request whose response can't be processed.
+
+        The thread's state should still be reset.
+        """
+        request = self.factory.post('/')
+
+        self.middleware.process_request(request)
+        routers.record_write()
+
+        with self.assertRaises(AttributeError):
+            self.middleware.process_response(request, None)
+
+        self.assertFalse(routers.is_pinned())
+
+    @override_settings(HELPCENTER_REPLICA_PIN_SECONDS=30)
+    def test_write(self):
+        """Test a request that writes help center content.
+
+        A pin cookie lasting for the configured time should be set,
+        and the thread's state should be reset afterwards.
+        """
+        request = self.factory.post('/')
+
+        self.middleware.process_request(request)
+        routers.record_write()
+        response = self.middleware.process_response(request, HttpResponse())
+
+        self.assertEqual(30, response.cookies[self.cookie_name]['max-age'])
+        self.assertFalse(routers.is_pinned())
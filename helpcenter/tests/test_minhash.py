@@ -0,0 +1,62 @@
+from django.test import SimpleTestCase
+
+from helpcenter import minhash
+
+
+TEXT = ('To reset your password, open the account settings page and '
+        'click the reset password button. A link will be sent to the '
+        'email address on your account.')
+
+
+class TestMinHash(SimpleTestCase):
+    """Test cases for MinHash signatures."""
+
+    def test_bucket_keys(self):
+        """Test getting the bucket keys of a signature.
+
+        Identical texts should share every bucket.
+        """
+        keys = minhash.get_bucket_keys(minhash.get_signature(TEXT))
+
+        self.assertEqual(minhash.BANDS, len(keys))
+        self.assertEqual(
+            keys, minhash.get_bucket_keys(minhash.get_signature(TEXT)))
+
+    def test_empty(self):
+        """Test the signature of a text without any words.
+
+        Empty texts should have no signature and no buckets.
+        """
+        signature = minhash.get_signature(' ... ')
+
+        self.assertEqual((), signature)
+        self.assertEqual([], minhash.get_bucket_keys(signature))
+        self.assertEqual(0, minhash.get_similarity(signature, signature))
+
+    def test_pack(self):
+        """Test packing and unpacking a signature."""
+        signature = minhash.get_signature(TEXT)
+
+        self.assertEqual(
+            signature, minhash.unpack(minhash.pack(signature)))
+
+    def test_shingles(self):
+        """Test getting the shingles of a text."""
+        self.assertEqual(
+            {'a b c', 'b c d'}, minhash.get_shingles('A b, c; D'))
+        self.assertEqual({'a b'}, minhash.get_shingles('A b'))
+
+    def test_similarity(self):
+        """Test estimating the similarity of texts.
+
+        Near-identical texts should be estimated as more similar than
+        unrelated texts.
+        """
+        signature = minhash.get_signature(TEXT)
+        edited = minhash.get_signature(TEXT.replace('button', 'link'))
+        unrelated = minhash.get_signature(
+            'Our office is open from nine to five on weekdays.')
+
+        self.assertEqual(1, minhash.get_similarity(signature, signature))
+        self.assertGreater(minhash.get_similarity(signature, edited), 0.6)
+        self.assertLess(minhash.get_similarity(signature, unrelated), 0.1)
@@ -1,5 +1,6 @@
 from datetime import timedelta
 
+from django.core.exceptions import ValidationError
 from django.core.urlresolvers import reverse
 from django.test import TestCase, override_settings
 from django.utils import timezone
@@ -59,6 +60,56 @@ class TestArticleModel(TestCase):
         self.assertTrue(start <= article.time_edited <= end)
         self.assertFalse(article.draft)
 
+    def test_derived_fields(self):
+        """Test the fields derived from an article's body.
+
+        The sanitized body, excerpt, word count, reading time, and table
+        of contents should be computed when the article is saved.
+        """
+        article = create_article(
+            body='<h2>Setup</h2><p onclick="x">Install the app.</p>')
+
+        self.assertEqual(
+            '<h2 id="setup">Setup</h2><p>Install the app.</p>',
+            article.body_html)
+        self.assertEqual('Setup Install the app.', article.excerpt)
+        self.assertEqual(4, article.word_count)
+        self.assertEqual(1, article.reading_time)
+        self.assertEqual(
+            [{'id': 'setup', 'level': 2, 'title': 'Setup'}],
+            article.table_of_contents)
+
+    def test_derived_fields_unchanged(self):
+        """Test saving an article without changing its content.
+
+        If the title and body are unchanged, the derived fields, term
+        and MinHash indexes, and revisions shouldn't be written.
+        """
+        article = create_article(body='<p>Install the app.</p>')
+        article.draft = True
+
+        # Fetch the previous version, then update the article. Nothing
+        # is re-indexed and no revision is recorded.
+        with self.assertNumQueries(2):
+            article.save()
+
+        self.assertEqual(1, article.revisions.count())
+
+    def test_derived_fields_update_fields(self):
+        """Test saving only an article's body.
+
+        If the body is saved using `update_fields`, the fields derived
+        from it should also be saved.
+        """
+        article = create_article(body='Old body')
+
+        article.body = 'A new body'
+        article.save(update_fields=['body'])
+        article.refresh_from_db()
+
+        self.assertEqual('A new body', article.excerpt)
+        self.assertEqual(3, article.word_count)
+
     def test_draft_publish(self):
         """Test publishing a draft.
 
@@ -92,6 +143,49 @@ class TestArticleModel(TestCase):
         # `time_published` should not have changed
         self.assertEqual(prev_time, article.time_published)
 
+    def test_for_listing(self):
+        """Test getting articles for a listing.
+
+        The article's body should not be loaded, and its category
+        should be fetched along with it.
+        """
+        category = create_category()
+        article = create_article(category=category)
+
+        with self.assertNumQueries(1):
+            listed = models.Article.objects.for_listing().get()
+
+            self.assertEqual(article.title, listed.title)
+            self.assertEqual(article.excerpt, listed.excerpt)
+            self.assertEqual(
+                article.get_absolute_url(), listed.get_absolute_url())
+            self.assertEqual(category.title, listed.category.title)
+
+        self.assertIn('body', listed.get_deferred_fields())
+        self.assertIn('body_html', listed.get_deferred_fields())
+
+    def test_published(self):
+        """Test getting the published articles.
+
+        Drafts and articles scheduled for the future should be left
+        out.
+        """
+        now = timezone.now()
+        article = create_article(time_published=now - timedelta(hours=1))
+        create_article(draft=True)
+        create_article(time_published=now + timedelta(hours=1))
+
+        self.assertEqual([article], list(models.Article.objects.published()))
+
+    def test_scheduled(self):
+        """Test getting the articles scheduled to be published."""
+        now = timezone.now()
+        create_article(time_published=now - timedelta(hours=1))
+        create_article(draft=True, time_published=now + timedelta(hours=1))
+        article = create_article(time_published=now + timedelta(hours=1))
+
+        self.assertEqual([article], list(models.Article.objects.scheduled()))
+
     def test_get_absolute_url(self):
         """ Test getting an Article instance's url.
 
@@ -171,18 +265,69 @@ class TestArticleModel(TestCase):
 
         self.assertEqual(slugify('Test Title'), article.slug)
 
+    def test_slug_category_change(self):
+        """Test an article's slug when it is moved to a new category.
+
+        The article should keep its slug if it isn't used in the new
+        category.
+        """
+        article = create_article(title='Test Title')
+
+        article.category = create_category()
+        article.save()
+
+        self.assertEqual(slugify('Test Title'), article.slug)
+        self.assertEqual(
+            [('', 'test-title')],
+            list(article.slug_history.values_list('category_slug', 'slug')))
+
+    def test_slug_duplicate(self):
+        """Test creating articles with the same title.
+
+        Slugs should be unique within a category, so a numeric suffix
+        should be added.
+        """
+        category = create_category()
+        article = create_article(title='Test Title', category=category)
+        article2 = create_article(title='Test Title', category=category)
+        article3 = create_article(title='Test Title')
+
+        self.assertEqual('test-title', article.slug)
+        self.assertEqual('test-title-2', article2.slug)
+        self.assertEqual('test-title', article3.slug)
+
     def test_slug_title_change(self):
         """Test an article's slug when its title is changed.
 
-        Changing the title after the initial save should not change the
-        slug.
+        The slug should follow the new title, and the old slug should
+        be recorded.
         """
         article = create_article(title='Test Title')
 
         article.title = 'New Title'
         article.save()
 
-        self.assertEqual(slugify('Test Title'), article.slug)
+        self.assertEqual(slugify('New Title'), article.slug)
+        self.assertEqual(
+            ['test-title'],
+            list(article.slug_history.values_list('slug', flat=True)))
+
+    def test_slug_title_change_back(self):
+        """Test changing an article's title back to a previous title.
+
+        The old slug should be reused and no longer redirect.
+        """
+        article = create_article(title='Test Title')
+
+        article.title = 'New Title'
+        article.save()
+        article.title = 'Test Title'
+        article.save()
+
+        self.assertEqual('test-title', article.slug)
+        self.assertEqual(
+            ['new-title'],
+            list(article.slug_history.values_list('slug', flat=True)))
 
     def test_string_conversion(self):
         """ Test converting an Article to a string.
@@ -266,6 +411,40 @@ class TestCategoryModel(TestCase):
         self.assertEqual(1, models.Category.objects.count())
         self.assertEqual('child', models.Category.objects.get().title)
 
+    def test_delete_parent_paths(self):
+        """Test the paths of subcategories after deleting their parent.
+
+        The subcategories should become top level categories.
+        """
+        parent = create_category(title='parent')
+        child = create_category(title='child', parent=parent)
+        grandchild = create_category(title='grandchild', parent=child)
+
+        parent.delete()
+        child.refresh_from_db()
+        grandchild.refresh_from_db()
+
+        self.assertEqual('{}/'.format(child.pk), child.path)
+        self.assertEqual(0, child.depth)
+        self.assertEqual(
+            '{}/{}/'.format(child.pk, grandchild.pk), grandchild.path)
+        self.assertEqual(1, grandchild.depth)
+
+    def test_delete_queryset_paths(self):
+        """Test deleting nested categories at once.
+
+        The remaining subcategories should become top level categories.
+        """
+        parent = create_category(title='parent')
+        child = create_category(title='child', parent=parent)
+        grandchild = create_category(title='grandchild', parent=child)
+
+        models.Category.objects.filter(pk__in=[parent.pk, child.pk]).delete()
+        grandchild.refresh_from_db()
+
+        self.assertEqual('{}/'.format(grandchild.pk), grandchild.path)
+        self.assertEqual(0, grandchild.depth)
+
     def test_get_absolute_url(self):
         """ Test getting a Category instance's absolute url.
 
@@ -337,6 +516,124 @@ class TestCategoryModel(TestCase):
 
         self.assertEqual(expected, category.get_update_url())
 
+    def test_move(self):
+        """Test moving a category to a new parent.
+
+        The paths, depths, and labels of the category and its
+        descendants should be updated.
+        """
+        category = create_category(title='category')
+        child = create_category(title='child', parent=category)
+        grandchild = create_category(title='grandchild', parent=child)
+        new_parent = create_category(title='new parent')
+
+        child.parent = new_parent
+        child.save()
+        grandchild.refresh_from_db()
+
+        self.assertEqual(
+            '{}/{}/'.format(new_parent.pk, child.pk), child.path)
+        self.assertEqual(1, child.depth)
+        self.assertEqual(
+            '{}/{}/{}/'.format(new_parent.pk, child.pk, grandchild.pk),
+            grandchild.path)
+        self.assertEqual(2, grandchild.depth)
+        self.assertEqual('new parent > child > grandchild', grandchild.label)
+
+    def test_move_bulk(self):
+        """Test moving a category with a large subtree.
+
+        The number of queries should not depend on the size of the
+        subtree.
+        """
+        category = create_category(title='category')
+        parent = category
+
+        for i in range(10):
+            parent = create_category(title='child', parent=parent)
+
+        category.parent = create_category(title='new parent')
+
+        # Saving the category, looking up the stored paths and the depth
+        # of the subtree, updating the descendants, and the savepoint
+        with self.assertNumQueries(6):
+            category.save()
+
+        parent.refresh_from_db()
+
+        self.assertEqual(11, parent.depth)
+
+    def test_move_into_descendant(self):
+        """Test moving a category into one of its descendants.
+
+        This would create a cycle, so it should be rejected.
+        """
+        category = create_category(title='category')
+        child = create_category(title='child', parent=category)
+        grandchild = create_category(title='grandchild', parent=child)
+
+        category.parent = grandchild
+
+        with self.assertRaises(ValidationError):
+            category.clean()
+
+        with self.assertRaises(ValidationError):
+            category.save()
+
+        category.refresh_from_db()
+
+        self.assertIsNone(category.parent)
+
+    def test_move_into_self(self):
+        """Test making a category its own parent.
+
+        This would create a cycle, so it should be rejected.
+        """
+        category = create_category()
+        category.parent = category
+
+        with self.assertRaises(ValidationError):
+            category.clean()
+
+        with self.assertRaises(ValidationError):
+            category.save()
+
+    def test_move_too_deep(self):
+        """Test moving a category so its subtree is nested too deeply.
+
+        The move should be rejected.
+        """
+        parent = None
+
+        for i in range(models.Category.MAX_DEPTH - 1):
+            parent = create_category(title='level', parent=parent)
+
+        category = create_category(title='category')
+        create_category(title='child', parent=category)
+
+        category.parent = parent
+
+        with self.assertRaises(ValidationError):
+            category.clean()
+
+        with self.assertRaises(ValidationError):
+            category.save()
+
+    def test_nested_too_deep(self):
+        """Test creating a category below the deepest level.
+
+        The category should be rejected.
+        """
+        parent = None
+
+        for i in range(models.Category.MAX_DEPTH):
+            parent = create_category(title='level', parent=parent)
+
+        self.assertEqual(models.Category.MAX_DEPTH - 1, parent.depth)
+
+        with self.assertRaises(ValidationError):
+            create_category(title='category', parent=parent)
+
     def test_num_articles(self):
         """ Test num_articles property with articles in category.
 
@@ -358,6 +655,19 @@ class TestCategoryModel(TestCase):
 
         self.assertEqual(0, category.num_articles)
 
+    def test_num_articles_scheduled(self):
+        """Test `num_articles` with articles scheduled to be published.
+
+        Articles that haven't been published yet should not be included
+        in the count.
+        """
+        category = create_category()
+        create_article(
+            category=category,
+            time_published=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual(0, category.num_articles)
+
     def test_num_articles_nested(self):
         """ Test num_articles property with nested categories.
 
@@ -370,6 +680,37 @@ class TestCategoryModel(TestCase):
 
         self.assertEqual(1, category.num_articles)
 
+    def test_path(self):
+        """Test the path of a new category.
+
+        The path should contain the ids of the category's ancestors and
+        the category itself.
+        """
+        parent = create_category(title='parent')
+        child = create_category(title='child', parent=parent)
+
+        self.assertEqual('{}/'.format(parent.pk), parent.path)
+        self.assertEqual(0, parent.depth)
+        self.assertEqual('{}/{}/'.format(parent.pk, child.pk), child.path)
+        self.assertEqual(1, child.depth)
+
+    def test_rename(self):
+        """Test renaming a category.
+
+        The labels of the category and its descendants should be
+        updated.
+        """
+        category = create_category(title='category')
+        child = create_category(title='child', parent=category)
+        grandchild = create_category(title='grandchild', parent=child)
+
+        category.title = 'renamed'
+        category.save()
+        grandchild.refresh_from_db()
+
+        self.assertEqual('renamed', category.label)
+        self.assertEqual('renamed > child > grandchild', grandchild.label)
+
     def test_slug_generation(self):
         """Test the creation of the category's slug.
 
@@ -380,6 +721,16 @@ class TestCategoryModel(TestCase):
 
         self.assertEqual(slugify('Test Title'), category.slug)
 
+    def test_slug_duplicate(self):
+        """Test the slug of a category with a duplicate title.
+
+        Category slugs should be unique, so a suffix should be added.
+        """
+        create_category(title='Test Title')
+        category = create_category(title='Test Title')
+
+        self.assertEqual('test-title-2', category.slug)
+
     def test_slug_title_change(self):
         """Test a category's slug when its title is changed.
 
@@ -407,11 +758,14 @@ class TestCategoryModel(TestCase):
         """Test converting a nested Category instance to a string.
 
         If a category has a parent category, it's string representation
-        should show that.
+        should show that. The stored label is used, so the parent isn't
+        fetched.
         """
         parent = create_category(title='parent')
-        category = create_category(parent=parent, title='child')
+        category = models.Category.objects.get(
+            pk=create_category(parent=parent, title='child').pk)
 
         expected = "{} > {}".format(parent.title, category.title)
 
-        self.assertEqual(expected, str(category))
+        with self.assertNumQueries(0):
+            self.assertEqual(expected, str(category))
@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+
+from django.core.urlresolvers import reverse
+from django.test import TestCase, override_settings
+
+from helpcenter import models
+from helpcenter.testing_utils import (
+    AuthTestMixin, create_article, create_category)
+
+
+class TestProfiling(AuthTestMixin, TestCase):
+    """Test cases for profiling views."""
+
+    def setUp(self):
+        """Create a staff member and an article to view."""
+        super(TestProfiling, self).setUp()
+
+        self.user.is_staff = True
+        self.user.save()
+
+        self.article = create_article()
+        self.url = self.article.get_absolute_url()
+
+    def test_api(self):
+        """Test profiling an API view.
+
+        API views should support profiling the same way as the regular
+        views.
+        """
+        self.login()
+
+        response = self.client.get(
+            reverse('helpcenter:helpcenter-api:article-list'),
+            {'_profile': 'sql'})
+
+        self.assertEqual(200, response.status_code)
+        self.assertIn(
+            models.Article._meta.db_table, response.content.decode('utf-8'))
+
+    def test_cprofile(self):
+        """Test profiling a view with cProfile.
+
+        The sorted statistics of the request should be returned as
+        plain text.
+        """
+        self.login()
+
+        response = self.client.get(
+            self.url, {'_profile': 'cprofile', '_profile_sort': 'tottime'})
+        content = response.content.decode('utf-8')
+
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn('function calls', content)
+        self.assertIn('internal time', content)
+
+    @override_settings(HELPCENTER_PROFILING=False)
+    def test_disabled(self):
+        """Test profiling a view while profiling is disabled.
+
+        The normal response should be returned.
+        """
+        self.login()
+
+        response = self.client.get(self.url, {'_profile': 'cprofile'})
+
+        self.assertTemplateUsed(response, 'helpcenter/article_detail.html')
+
+    def test_not_staff(self):
+        """Test profiling a view as a user who is not staff.
+
+        Only staff members may profile requests, so other users should
+        receive the normal response.
+        """
+        self.user.is_staff = False
+        self.user.save()
+        self.login()
+
+        response = self.client.get(self.url, {'_profile': 'sql'})
+
+        self.assertTemplateUsed(response, 'helpcenter/article_detail.html')
+
+    def test_save_profile(self):
+        """Test saving the profile of a request.
+
+        If a profile directory is configured, the raw profile should be
+        saved there.
+        """
+        profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, profile_dir)
+        self.login()
+
+        with self.settings(HELPCENTER_PROFILE_DIR=profile_dir):
+            response = self.client.get(self.url, {'_profile': 'cprofile'})
+
+        files = os.listdir(profile_dir)
+
+        self.assertEqual(1, len(files))
+        self.assertTrue(files[0].startswith('ArticleDetailView-'))
+        self.assertIn(files[0], response.content.decode('utf-8'))
+
+    def test_sql(self):
+        """Test listing the queries made by a view.
+
+        Each query should be listed, and repeated queries should be
+        summarized.
+        """
+        create_category(parent=create_category())
+        self.login()
+
+        response = self.client.get(
+            reverse('helpcenter:index'), {'_profile': 'sql'})
+        content = response.content.decode('utf-8')
+
+        self.assertEqual(200, response.status_code)
+        self.assertIn('queries in', content)
+        self.assertIn(models.Category._meta.db_table, content)
@@ -0,0 +1,167 @@
+from datetime import date, timedelta
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils.six import StringIO
+
+from helpcenter import cache, models, rankings, viewcounts
+from helpcenter.testing_utils import create_article, create_category
+
+
+TODAY = date(2017, 1, 31)
+
+
+def add_views(article, days_ago, views):
+    """Add views of an article to the daily rollup."""
+    models.ArticleViewDay.objects.create(
+        article=article, day=TODAY - timedelta(days=days_ago), views=views)
+
+
+class TestComputeRankings(TestCase):
+    """Test cases for computing article rankings."""
+
+    def setUp(self):
+        """Start each test with an empty cache."""
+        cache.get_cache().clear()
+
+    def test_category_subtree(self):
+        """Test the rankings of a category.
+
+        A category's rankings should include the articles in its
+        descendants, but not articles outside of it.
+        """
+        category = create_category()
+        child = create_category(title='Child', parent=category)
+        article = create_article(title='Foo', category=child)
+        other = create_article(title='Bar')
+        add_views(article, 0, 1)
+        add_views(other, 0, 5)
+
+        computed = rankings.compute_rankings(TODAY)
+
+        self.assertEqual([article.pk], computed['popular'][category.pk])
+        self.assertEqual([article.pk], computed['popular'][child.pk])
+        self.assertEqual([other.pk, article.pk], computed['popular'][None])
+
+    def test_command(self):
+        """Test computing the rankings with the management command."""
+        models.ArticleViewDay.objects.create(
+            article=create_article(), day=viewcounts.get_today(), views=1)
+        output = StringIO()
+
+        call_command('computerankings', stdout=output)
+
+        self.assertIn('Computed 1 popular rankings.', output.getvalue())
+        self.assertNotEqual({}, rankings.get_rankings()['popular'])
+
+    def test_decay(self):
+        """Test ranking articles with views of different ages.
+
+        Old views should count towards an article's popularity, while
+        trending articles should be those viewed recently.
+        """
+        old = create_article(title='Old')
+        recent = create_article(title='Recent')
+        add_views(old, 10, 100)
+        add_views(recent, 0, 10)
+
+        computed = rankings.compute_rankings(TODAY)
+
+        self.assertEqual([old.pk, recent.pk], computed['popular'][None])
+        self.assertEqual([recent.pk, old.pk], computed['trending'][None])
+
+    def test_drafts(self):
+        """Test ranking articles that aren't published.
+
+        Only published articles should be ranked.
+        """
+        article = create_article(draft=True)
+        add_views(article, 0, 1)
+
+        computed = rankings.compute_rankings(TODAY)
+
+        self.assertEqual({}, computed['popular'])
+
+    @override_settings(HELPCENTER_RANKING_SIZE=1)
+    def test_size(self):
+        """Test the number of articles in each ranking."""
+        article = create_article(title='Foo')
+        add_views(article, 0, 2)
+        add_views(create_article(title='Bar'), 0, 1)
+
+        computed = rankings.compute_rankings(TODAY)
+
+        self.assertEqual([article.pk], computed['popular'][None])
+
+    def test_stored(self):
+        """Test getting computed rankings.
+
+        The rankings should be read from the cache.
+        """
+        article = create_article()
+        add_views(article, 0, 1)
+        computed = rankings.compute_rankings(TODAY)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(computed, rankings.get_rankings())
+
+    def test_window(self):
+        """Test ranking articles with views older than the window.
+
+        Views whose weight would be negligible should be ignored.
+        """
+        add_views(create_article(), 30 * rankings.HALF_LIVES + 1, 1)
+
+        computed = rankings.compute_rankings(TODAY)
+
+        self.assertEqual({}, computed['popular'])
+
+
+class TestGetRankedArticles(TestCase):
+    """Test cases for getting the ranked articles."""
+
+    def setUp(self):
+        """Start each test with an empty cache."""
+        cache.get_cache().clear()
+
+    def test_get(self):
+        """Test getting the ranked articles.
+
+        The articles of every ranking should be fetched in one query
+        and returned in order.
+        """
+        article = create_article(title='Foo')
+        article2 = create_article(title='Bar')
+        add_views(article, 0, 1)
+        add_views(article2, 0, 2)
+        rankings.compute_rankings(TODAY)
+
+        with self.assertNumQueries(1):
+            ranked = rankings.get_ranked_articles()
+
+        self.assertEqual([article2, article], ranked['popular'])
+        self.assertEqual([article2, article], ranked['trending'])
+
+    def test_not_computed(self):
+        """Test getting the ranked articles before they are computed.
+
+        The rankings should be empty without querying the database.
+        """
+        with self.assertNumQueries(0):
+            ranked = rankings.get_ranked_articles()
+
+        self.assertEqual({'popular': [], 'trending': []}, ranked)
+
+    def test_unpublished(self):
+        """Test getting ranked articles that were unpublished.
+
+        Articles that are no longer published should be left out.
+        """
+        article = create_article()
+        add_views(article, 0, 1)
+        rankings.compute_rankings(TODAY)
+
+        article.draft = True
+        article.save()
+
+        self.assertEqual([], rankings.get_ranked_articles()['popular'])
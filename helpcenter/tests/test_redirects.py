@@ -0,0 +1,82 @@
+from django.test import TestCase, override_settings
+
+from helpcenter import cache, redirects
+from helpcenter.testing_utils import create_article, create_category
+
+
+class TestRedirectMap(TestCase):
+    """Test cases for the map of old article slugs."""
+
+    def setUp(self):
+        """Start each test with an empty cache."""
+        cache.get_cache().clear()
+
+    def test_build(self):
+        """Test building the redirect map.
+
+        Each of an article's old slugs should map to its current URL.
+        """
+        category = create_category()
+        article = create_article(category=category, title='Old Title')
+        article.title = 'New Title'
+        article.save()
+
+        redirect_map = redirects.RedirectMap.build(1)
+
+        self.assertEqual(
+            {(article.pk, 'old-title'): article.get_absolute_url()},
+            redirect_map.by_pk)
+        self.assertEqual(
+            {(category.slug, 'old-title'): article.get_absolute_url()},
+            redirect_map.by_slug)
+
+    def test_cached(self):
+        """Test getting a redirect from an up to date map.
+
+        Redirects should not query the database until content changes.
+        """
+        article = create_article(title='Old Title')
+        article.title = 'New Title'
+        article.save()
+
+        redirects.get_map()
+
+        with self.assertNumQueries(0):
+            url = redirects.get_pk_redirect(article.pk, 'old-title')
+
+        self.assertEqual(article.get_absolute_url(), url)
+
+    def test_refresh(self):
+        """Test getting a redirect after an article changes.
+
+        The map should be rebuilt to include the new old slug.
+        """
+        article = create_article(title='Old Title')
+        redirects.get_map()
+
+        article.title = 'New Title'
+        article.save()
+
+        self.assertEqual(
+            article.get_absolute_url(),
+            redirects.get_pk_redirect(article.pk, 'old-title'))
+
+    def test_unknown_slug(self):
+        """Test getting a redirect for a slug that was never used."""
+        article = create_article()
+
+        self.assertIsNone(redirects.get_pk_redirect(article.pk, 'foo'))
+        self.assertIsNone(redirects.get_slug_redirect(None, 'foo'))
+
+    @override_settings(HELPCENTER_SLUG_URLS=True)
+    def test_slug_urls(self):
+        """Test redirects when articles are linked to by slug.
+
+        The redirects should point to the articles' slug URLs.
+        """
+        article = create_article(title='Old Title')
+        article.title = 'New Title'
+        article.save()
+
+        self.assertEqual(
+            '/docs/new-title/', redirects.get_slug_redirect(None, 'old-title'))
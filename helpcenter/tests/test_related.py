@@ -0,0 +1,150 @@
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from django.utils.six import StringIO
+
+from helpcenter import models, related
+from helpcenter.testing_utils import create_article
+
+
+@skipUnless(related.is_available(), 'NumPy and SciPy are not installed.')
+class TestComputeRelated(TestCase):
+    """Test cases for computing related articles."""
+
+    def setUp(self):
+        """Create articles about a few topics."""
+        self.printer = create_article(
+            title='Printer setup', body='Connect the printer to the network.')
+        self.printer2 = create_article(
+            title='Printer jams', body='Clear paper jams from the printer.')
+        self.email = create_article(
+            title='Email setup', body='Add your email account.')
+        self.other = create_article(
+            title='Office hours', body='We are open weekdays.')
+
+    def test_build_matrix(self):
+        """Test building the TF-IDF matrix.
+
+        Each row should have unit length.
+        """
+        matrix = related.build_matrix([['a', 'b'], ['b', 'c', 'c'], []])
+        norms = matrix.multiply(matrix).sum(axis=1)
+
+        self.assertEqual((3, 3), matrix.shape)
+        self.assertAlmostEqual(1, norms[0, 0])
+        self.assertAlmostEqual(1, norms[1, 0])
+        self.assertAlmostEqual(0, norms[2, 0])
+
+    def test_command(self):
+        """Test computing related articles with the management command."""
+        output = StringIO()
+
+        call_command('computerelated', stdout=output)
+
+        self.assertIn('Computed related articles for 4 articles.',
+                      output.getvalue())
+
+    def test_compute(self):
+        """Test computing related articles.
+
+        Articles should be related to the articles they share the most
+        words with, and articles without any words in common should not
+        be related.
+        """
+        self.assertEqual(4, related.compute_related())
+
+        self.assertEqual(
+            [self.printer2, self.email],
+            related.get_related_articles(self.printer))
+        self.assertEqual([], related.get_related_articles(self.other))
+
+    def test_drafts(self):
+        """Test computing related articles when there are drafts.
+
+        Drafts should not be related to any article.
+        """
+        self.printer2.draft = True
+        self.printer2.save()
+
+        related.compute_related()
+
+        self.assertFalse(models.RelatedArticle.objects.filter(
+            related=self.printer2).exists())
+
+    def test_incremental(self):
+        """Test computing related articles incrementally.
+
+        Only articles edited since their related articles were computed
+        should be updated.
+        """
+        related.compute_related()
+        models.RelatedArticle.objects.filter(article=self.email).delete()
+
+        self.printer.body = 'Connect the printer to your email.'
+        self.printer.save()
+
+        self.assertEqual(3, related.compute_related(incremental=True))
+        self.assertTrue(models.RelatedArticle.objects.filter(
+            article=self.email).exists())
+        self.assertEqual(
+            [self.email, self.printer2],
+            related.get_related_articles(self.printer))
+
+    def test_incremental_unpublished(self):
+        """Test computing related articles after an article is unpublished.
+
+        The unpublished article's related articles should be removed.
+        """
+        related.compute_related()
+
+        self.printer.draft = True
+        self.printer.save()
+
+        related.compute_related(incremental=True)
+
+        self.assertFalse(models.RelatedArticle.objects.filter(
+            article=self.printer).exists())
+
+    def test_neighbours(self):
+        """Test finding the most similar rows of a matrix.
+
+        Only the given number of neighbours should be found, from most
+        to least similar.
+        """
+        matrix = related.build_matrix([
+            ['a', 'b', 'c'], ['a', 'b', 'c'], ['a', 'b'], ['a'], ['d']])
+
+        neighbours = dict(related.get_neighbours(matrix, [0, 4], 2))
+
+        self.assertEqual([1, 2], [row for row, _ in neighbours[0]])
+        self.assertAlmostEqual(1, neighbours[0][0][1])
+        self.assertEqual([], neighbours[4])
+
+
+class TestGetRelatedArticles(TestCase):
+    """Test cases for getting an article's related articles."""
+
+    def test_get(self):
+        """Test getting an article's related articles.
+
+        Only published articles should be returned, in order, using a
+        single query.
+        """
+        article = create_article(title='Foo')
+        first = create_article(title='First')
+        second = create_article(title='Second')
+        scheduled = create_article(
+            title='Scheduled',
+            time_published=timezone.now() + timedelta(hours=1))
+
+        for rank, other in enumerate((first, scheduled, second), 1):
+            models.RelatedArticle.objects.create(
+                article=article, rank=rank, related=other, score=1)
+
+        with self.assertNumQueries(1):
+            articles = related.get_related_articles(article)
+
+        self.assertEqual([first, second], articles)
@@ -0,0 +1,176 @@
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils.six import StringIO
+
+from helpcenter import models, revisions
+from helpcenter.testing_utils import create_article
+
+
+def edit(article, body):
+    """Save a new body for an article."""
+    article.body = body
+    article.save()
+
+
+def numbered_lines(count, changed=None):
+    """Get a body with the given number of lines.
+
+    If `changed` is given, that line is replaced.
+    """
+    lines = ['Line {}\n'.format(i) for i in range(count)]
+
+    if changed is not None:
+        lines[changed] = 'Changed line {}\n'.format(changed)
+
+    return ''.join(lines)
+
+
+class TestDeltas(TestCase):
+    """Test cases for storing the changes between bodies."""
+
+    def test_round_trip(self):
+        """Test rebuilding a body from its changes.
+
+        Applying the changes to the original body should produce the
+        new body.
+        """
+        base = 'First\nSecond\nThird\n'
+        body = 'First\nInserted\nThird\nFourth'
+
+        delta = revisions.make_delta(base, body)
+
+        self.assertEqual(body, revisions.apply_delta(base, delta))
+
+
+class TestRecordRevisions(TestCase):
+    """Test cases for recording the revisions of articles."""
+
+    def test_create(self):
+        """Test creating an article.
+
+        The first revision of an article should be a snapshot.
+        """
+        article = create_article(body='Body')
+        revision, body = revisions.get_revision(article, 1)
+
+        self.assertTrue(revision.is_snapshot)
+        self.assertEqual('Body', body)
+        self.assertEqual(article.title, revision.title)
+
+    def test_delta(self):
+        """Test editing an article.
+
+        Small changes to a large body should be stored as changes
+        rather than snapshots.
+        """
+        article = create_article(body=numbered_lines(200))
+        edit(article, numbered_lines(200, changed=50))
+
+        revision, body = revisions.get_revision(article, 2)
+        snapshot = article.revisions.get(number=1)
+
+        self.assertFalse(revision.is_snapshot)
+        self.assertEqual(numbered_lines(200, changed=50), body)
+        self.assertLess(len(revision.data), len(snapshot.data))
+
+    def test_get_revision_queries(self):
+        """Test the number of queries needed to get a revision.
+
+        Any revision should be rebuilt using a single query.
+        """
+        article = create_article(body=numbered_lines(100))
+
+        for i in range(5):
+            edit(article, numbered_lines(100, changed=i))
+
+        with self.assertNumQueries(1):
+            _, body = revisions.get_revision(article, 6)
+
+        self.assertEqual(numbered_lines(100, changed=4), body)
+
+    def test_missing_revision(self):
+        """Test getting a revision that doesn't exist."""
+        article = create_article()
+
+        with self.assertRaises(models.ArticleRevision.DoesNotExist):
+            revisions.get_revision(article, 2)
+
+    @override_settings(HELPCENTER_REVISION_SNAPSHOT_INTERVAL=3)
+    def test_snapshot_interval(self):
+        """Test the frequency of snapshots.
+
+        A snapshot should be stored every few revisions.
+        """
+        article = create_article(body=numbered_lines(100))
+
+        for i in range(6):
+            edit(article, numbered_lines(100, changed=i))
+
+        snapshots = article.revisions.filter(
+            is_snapshot=True).values_list('number', flat=True)
+
+        self.assertEqual([1, 4, 7], list(snapshots))
+
+        for number in range(2, 8):
+            _, body = revisions.get_revision(article, number)
+
+            self.assertEqual(numbered_lines(100, changed=number - 2), body)
+
+    def test_unchanged(self):
+        """Test saving an article without changing its content.
+
+        No revision should be recorded.
+        """
+        article = create_article()
+
+        article.draft = True
+        article.save()
+
+        self.assertEqual(1, article.revisions.count())
+
+
+class TestCompact(TestCase):
+    """Test cases for removing old revisions."""
+
+    @override_settings(HELPCENTER_REVISION_SNAPSHOT_INTERVAL=5)
+    def test_compact(self):
+        """Test removing old revisions of an article.
+
+        The kept revisions should still be rebuilt correctly after
+        their snapshot is removed.
+        """
+        article = create_article(body=numbered_lines(100))
+
+        for i in range(6):
+            edit(article, numbered_lines(100, changed=i))
+
+        removed = revisions.compact(article, keep=3)
+
+        self.assertEqual(4, removed)
+        self.assertEqual(
+            [5, 6, 7],
+            list(article.revisions.values_list('number', flat=True)))
+        self.assertTrue(article.revisions.get(number=5).is_snapshot)
+
+        for number in (5, 6, 7):
+            _, body = revisions.get_revision(article, number)
+
+            self.assertEqual(numbered_lines(100, changed=number - 2), body)
+
+    def test_command(self):
+        """Test compacting revisions using the management command."""
+        article = create_article(body='Body 0')
+        other = create_article(body='Other 0')
+
+        for i in range(1, 4):
+            edit(article, 'Body {}'.format(i))
+            edit(other, 'Other {}'.format(i))
+
+        out = StringIO()
+        call_command(
+            'compactrevisions', str(article.pk), keep=1, stdout=out)
+
+        self.assertIn('Removed 3 revisions.', out.getvalue())
+        self.assertEqual(1, article.revisions.count())
+        self.assertEqual(4, other.revisions.count())
+        self.assertEqual('Body 3', revisions.get_revision(article, 4)[1])
@@ -0,0 +1,137 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from helpcenter import models, routers
+from helpcenter.api.bulk import BulkArticleOperations
+from helpcenter.testing_utils import create_article
+
+
+@override_settings(
+    HELPCENTER_PRIMARY_DATABASE='primary',
+    HELPCENTER_REPLICA_DATABASES=['replica'])
+class TestReplicaRouter(TestCase):
+    """Test cases for the replica database router."""
+
+    def setUp(self):
+        """Create a router with no pinned state."""
+        routers.reset_state()
+        self.router = routers.ReplicaRouter()
+
+    def tearDown(self):
+        """Don't leak pinned state into other tests."""
+        routers.reset_state()
+
+    def test_read(self):
+        """Test routing a read.
+
+        Reads should be sent to a replica.
+        """
+        self.assertEqual('replica', self.router.db_for_read(models.Article))
+
+    @override_settings(HELPCENTER_REPLICA_DATABASES=[])
+    def test_read_no_replicas(self):
+        """Test routing a read with no replicas configured.
+
+        Reads should be sent to the primary.
+        """
+        self.assertEqual('primary', self.router.db_for_read(models.Article))
+
+    def test_read_other_app(self):
+        """Test routing a read for a model from another app.
+
+        The router should have no opinion.
+        """
+        self.assertIsNone(self.router.db_for_read(User))
+
+    def test_read_pinned(self):
+        """Test routing a read while pinned to the primary.
+
+        Reads should be sent to the primary.
+        """
+        routers.pin_to_primary()
+
+        self.assertEqual('primary', self.router.db_for_read(models.Category))
+
+    def test_record_write(self):
+        """Test recording a write.
+
+        Reads after the write should be sent to the primary.
+        """
+        routers.record_write()
+
+        self.assertTrue(routers.has_written())
+        self.assertEqual('primary', self.router.db_for_read(models.Article))
+
+    def test_write(self):
+        """Test routing a write.
+
+        Writes should be sent to the primary. Choosing the database
+        doesn't write anything, so reads should still be sent to a
+        replica.
+        """
+        self.assertEqual('primary', self.router.db_for_write(models.Article))
+        self.assertFalse(routers.has_written())
+        self.assertEqual('replica', self.router.db_for_read(models.Article))
+
+
+@override_settings(
+    DATABASE_ROUTERS=['helpcenter.routers.ReplicaRouter'],
+    HELPCENTER_PRIMARY_DATABASE='default',
+    HELPCENTER_REPLICA_DATABASES=['replica'])
+class TestReplicaDatabases(TestCase):
+    """Test cases for routing between a real primary and replica.
+
+    Nothing is copied from the primary to the replica, so content only
+    exists on the database it was written to.
+    """
+    multi_db = True
+
+    def setUp(self):
+        """Start each test without pinned state."""
+        routers.reset_state()
+
+    def tearDown(self):
+        """Don't leak pinned state into other tests."""
+        routers.reset_state()
+
+    def test_read(self):
+        """Test reading content before anything is written.
+
+        Content should be read from the replica.
+        """
+        models.Category.objects.using('replica').create(title='Replica')
+
+        # Creating the category recorded a write
+        routers.reset_state()
+
+        self.assertEqual(
+            ['Replica'],
+            list(models.Category.objects.values_list('title', flat=True)))
+
+    def test_read_your_writes(self):
+        """Test reading content after writing it.
+
+        The content should be written to the primary, and read from the
+        primary until the thread's state is reset.
+        """
+        article = create_article()
+
+        self.assertTrue(routers.is_pinned())
+        self.assertTrue(models.Article.objects.filter(pk=article.pk).exists())
+        self.assertTrue(models.Article.objects.using('default').filter(
+            pk=article.pk).exists())
+
+        routers.reset_state()
+
+        self.assertFalse(models.Article.objects.exists())
+
+    def test_write_unsaved(self):
+        """Test preparing a write that is never made.
+
+        Choosing the database to write to shouldn't keep reads on the
+        primary.
+        """
+        BulkArticleOperations([])
+
+        self.assertFalse(routers.is_pinned())
+        self.assertFalse(models.Article.objects.exists())
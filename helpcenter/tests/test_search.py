@@ -0,0 +1,319 @@
+from datetime import timedelta
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from helpcenter import cache, search, trigrams
+from helpcenter.testing_utils import create_article, create_category
+
+
+class TestGetTerms(SimpleTestCase):
+    """Test cases for normalizing queries."""
+
+    def test_empty(self):
+        """Test normalizing a query without any words."""
+        self.assertEqual((), search.get_terms(' ?! '))
+
+    def test_normalized(self):
+        """Test normalizing equivalent queries.
+
+        Queries differing only in case, punctuation, repeated words, or
+        word order should have the same terms.
+        """
+        self.assertEqual(
+            search.get_terms('Reset password'),
+            search.get_terms('password, RESET reset?'))
+
+
+class TestLRUCache(SimpleTestCase):
+    """Test cases for the local LRU cache."""
+
+    def test_evict_least_recent(self):
+        """Test adding a value to a full cache.
+
+        The least recently used value should be evicted.
+        """
+        lru = search.LRUCache(2)
+        lru.set('a', 1, 60)
+        lru.set('b', 2, 60)
+        lru.get('a')
+        lru.set('c', 3, 60)
+
+        self.assertEqual(1, lru.get('a'))
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(3, lru.get('c'))
+        self.assertEqual(2, len(lru))
+
+    def test_expired(self):
+        """Test getting an expired value.
+
+        Expired values should not be returned.
+        """
+        lru = search.LRUCache(2)
+        lru.set('a', 1, 0)
+
+        self.assertIsNone(lru.get('a'))
+
+
+class TestExpand(SimpleTestCase):
+    """Test cases for expanding misspelled terms."""
+
+    def test_expand(self):
+        """Test expanding terms.
+
+        Only terms missing from the vocabulary should be expanded.
+        """
+        index = trigrams.TrigramIndex({'password': 1, 'reset': 1})
+
+        self.assertEqual(
+            [('pasword', 'password'), ('reset',)],
+            search.expand(('pasword', 'reset'), index))
+
+
+class TestSearch(TestCase):
+    """Test cases for searching articles."""
+
+    def setUp(self):
+        """Start each test with empty caches."""
+        cache.get_cache().clear()
+        search._local_cache.clear()
+        search._local_index.clear()
+
+    def test_cached_local(self):
+        """Test repeating a search.
+
+        The results should be served from the local cache without
+        ranking the articles again.
+        """
+        article = create_article(title='Reset password')
+        search.search('reset password')
+
+        with self.assertNumQueries(0):
+            self.assertEqual([article.pk], search.search('Password reset'))
+
+    def test_cached_shared(self):
+        """Test repeating a search in another process.
+
+        If the results aren't in the local cache, they should be served
+        from the shared cache.
+        """
+        article = create_article(title='Reset password')
+        search.search('reset password')
+        search._local_cache.clear()
+        search._local_index.clear()
+
+        with self.assertNumQueries(0):
+            self.assertEqual([article.pk], search.search('reset password'))
+
+    def test_category(self):
+        """Test limiting a search to a category."""
+        category = create_category()
+        article = create_article(title='Foo', category=category)
+        create_article(title='Foo bar')
+
+        self.assertEqual([article.pk], search.search('foo', category.pk))
+
+    def test_empty_query(self):
+        """Test searching without any words.
+
+        No articles should be matched.
+        """
+        create_article()
+
+        with self.assertNumQueries(0):
+            self.assertEqual([], search.search('  '))
+
+    def test_index_cached(self):
+        """Test getting the vocabulary index repeatedly.
+
+        The index should only be built once per content generation.
+        """
+        create_article(title='Foo')
+        index = search.get_index()
+
+        with self.assertNumQueries(0):
+            self.assertIs(index, search.get_index())
+
+        create_article(title='Bar')
+
+        self.assertIn('bar', search.get_index())
+
+    def test_index_chunks(self):
+        """Test getting a vocabulary stored in several chunks.
+
+        The vocabulary should be read back from the shared cache, and
+        rebuilt if any of its chunks are missing.
+        """
+        self.addCleanup(
+            setattr, search, 'VOCABULARY_CHUNK_SIZE',
+            search.VOCABULARY_CHUNK_SIZE)
+        search.VOCABULARY_CHUNK_SIZE = 2
+
+        create_article(title='Foo bar', body='Baz')
+        create_article(title='Foo', body='')
+        search.get_index()
+        search._local_index.clear()
+
+        key = search.get_vocabulary_key()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                {'bar': 1, 'baz': 1, 'foo': 2},
+                search.get_cached_vocabulary(key))
+
+        cache.get_cache().delete('{}:1'.format(key))
+
+        self.assertIsNone(search.get_cached_vocabulary(key))
+        self.assertIn('baz', search.get_index())
+
+    def test_index_deleted(self):
+        """Test getting the vocabulary index after deleting an article.
+
+        The index should be rebuilt without the article's words.
+        """
+        article = create_article(title='Foo', body='')
+        search.get_index()
+
+        article.delete()
+
+        self.assertNotIn('foo', search.get_index())
+
+    def test_index_edited(self):
+        """Test getting the vocabulary index after unrelated changes.
+
+        Changes that don't affect the terms of published articles
+        shouldn't rebuild the index, even though they invalidate
+        other cached content.
+        """
+        article = create_article(title='Foo')
+        index = search.get_index()
+
+        article.category = create_category()
+        article.save()
+        cache.invalidate()
+
+        with self.assertNumQueries(0):
+            self.assertIs(index, search.get_index())
+
+    def test_index_unpublished(self):
+        """Test getting the vocabulary index after unpublishing.
+
+        The index should be rebuilt without the unpublished article's
+        words.
+        """
+        article = create_article(title='Foo', body='')
+        search.get_index()
+
+        article.draft = True
+        article.save()
+
+        self.assertNotIn('foo', search.get_index())
+
+    def test_invalidated(self):
+        """Test searching after an article changes.
+
+        Changing an article should invalidate the cached results.
+        """
+        search.search('foo')
+        article = create_article(title='Foo')
+
+        self.assertEqual([article.pk], search.search('foo'))
+
+        article.delete()
+
+        self.assertEqual([], search.search('foo'))
+
+    def test_misspelled(self):
+        """Test searching with a misspelled term.
+
+        Articles containing words similar to the term should be matched.
+        """
+        article = create_article(title='Reset password')
+        create_article(title='Payment')
+
+        self.assertEqual([article.pk], search.search('pasword'))
+
+    def test_ranking(self):
+        """Test the order of the results.
+
+        Articles with more of the terms in their title should be ranked
+        first, followed by more recently published articles.
+        """
+        now = timezone.now()
+        body = create_article(
+            title='Other', body='Foo bar', time_published=now)
+        old = create_article(
+            title='Foo', body='Bar', time_published=now - timedelta(days=1))
+        new = create_article(title='Foo', body='Bar', time_published=now)
+        both = create_article(
+            title='Foo bar', time_published=now - timedelta(days=2))
+        create_article(title='Foo')
+
+        self.assertEqual(
+            [both.pk, new.pk, old.pk, body.pk], search.search('foo bar'))
+
+    def test_markup_ignored(self):
+        """Test searching for words only found in an article's markup.
+
+        Articles should only be matched by the text of their body.
+        """
+        article = create_article(
+            title='Guide', body='<a href="http://example.com/">Read more</a>')
+
+        self.assertEqual([], search.search('example'))
+        self.assertEqual([article.pk], search.search('read'))
+
+    def test_prefix(self):
+        """Test searching for the beginning of a word."""
+        article = create_article(title='Passwords')
+
+        self.assertEqual([article.pk], search.search('pass'))
+
+    @override_settings(HELPCENTER_SEARCH_RESULTS=1)
+    def test_result_limit(self):
+        """Test searching with a limited number of results."""
+        create_article(title='Foo')
+        create_article(title='Foo')
+
+        self.assertEqual(1, len(search.search('foo')))
+
+    def test_results(self):
+        """Test getting the matching articles.
+
+        Only published articles should be returned, in ranked order.
+        """
+        first = create_article(title='Foo bar')
+        second = create_article(title='Foo', body='Bar')
+        create_article(title='Foo bar', draft=True)
+        create_article(
+            title='Foo bar',
+            time_published=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual([first, second], search.get_results('foo bar'))
+
+    def test_scheduled_timeout(self):
+        """Test the cache timeout while an article is scheduled.
+
+        Results should not be cached past the time the article is
+        published.
+        """
+        create_article(time_published=timezone.now() + timedelta(seconds=30))
+
+        self.assertTrue(search.get_cache_timeout() <= 30)
+
+    def test_suggestion(self):
+        """Test suggesting a correction of a misspelled query."""
+        create_article(title='Reset password', body='Forgot it?')
+
+        self.assertEqual(
+            'reset password', search.get_suggestion('Reset pasword'))
+
+    def test_suggestion_correct(self):
+        """Test suggesting a correction of a correct query.
+
+        Nothing should be suggested.
+        """
+        create_article(title='Reset password')
+
+        self.assertIsNone(search.get_suggestion('reset password'))
+        self.assertIsNone(search.get_suggestion(''))
@@ -0,0 +1,69 @@
+from django.test import SimpleTestCase
+
+from helpcenter import trigrams
+
+
+class TestGetTrigrams(SimpleTestCase):
+    """Test cases for getting the trigrams of a word."""
+
+    def test_padded(self):
+        """Test getting the trigrams of a word.
+
+        The word should be padded like it is by ``pg_trgm``.
+        """
+        self.assertEqual(
+            {'  c', ' ca', 'cat', 'at '}, trigrams.get_trigrams('cat'))
+
+
+class TestTrigramIndex(SimpleTestCase):
+    """Test cases for the trigram index."""
+
+    def setUp(self):
+        """Create an index of a small vocabulary."""
+        self.index = trigrams.TrigramIndex({
+            'password': 3,
+            'passwords': 1,
+            'payment': 2,
+            'reset': 4,
+        })
+
+    def test_contains(self):
+        """Test checking if words are in the vocabulary."""
+        self.assertIn('reset', self.index)
+        self.assertNotIn('rest', self.index)
+
+    def test_suggest(self):
+        """Test suggesting words for a misspelled word.
+
+        The most similar words should be suggested first.
+        """
+        self.assertEqual(
+            ['password', 'passwords'],
+            self.index.suggest('pasword', 0.3, 5))
+
+    def test_suggest_limit(self):
+        """Test suggesting a limited number of words."""
+        self.assertEqual(['password'], self.index.suggest('pasword', 0.3, 1))
+
+    def test_suggest_short(self):
+        """Test suggesting words for a very short word.
+
+        Short words have too few trigrams to be corrected reliably.
+        """
+        self.assertEqual([], self.index.suggest('pa', 0, 5))
+
+    def test_suggest_threshold(self):
+        """Test suggesting words for a word unlike any other.
+
+        Words below the similarity threshold should not be suggested.
+        """
+        self.assertEqual([], self.index.suggest('xylophone', 0.3, 5))
+
+    def test_suggest_tie(self):
+        """Test suggesting equally similar words.
+
+        Words appearing in more documents should be suggested first.
+        """
+        index = trigrams.TrigramIndex({'abcx': 1, 'abcy': 2})
+
+        self.assertEqual(['abcy', 'abcx'], index.suggest('abcz', 0, 5))
@@ -1,6 +1,7 @@
 from django.test import TestCase
 
 from helpcenter import utils
+from helpcenter.testing_utils import create_article, create_category
 
 
 class TestStringToClass(TestCase):
@@ -43,3 +44,41 @@ class TestStringToClass(TestCase):
             'helpcenter.tests.test_utils.TestStringToClass')
 
         self.assertEqual(TestStringToClass, result)
+
+
+class TestBulkUpdate(TestCase):
+    """Test cases for the bulk_update function."""
+
+    def test_no_objects(self):
+        """Test updating an empty list of objects.
+
+        No queries should be made.
+        """
+        with self.assertNumQueries(0):
+            self.assertEqual(0, utils.bulk_update([], ['title']))
+
+    def test_update(self):
+        """Test updating multiple instances.
+
+        Each instance should be saved with its own values in a single
+        query.
+        """
+        category = create_category()
+        article = create_article(title='Foo')
+        article2 = create_article(title='Bar', category=category)
+
+        article.title = 'New Foo'
+        article.category = category
+        article2.title = 'New Bar'
+        article2.category = None
+
+        with self.assertNumQueries(1):
+            utils.bulk_update([article, article2], ['title', 'category'])
+
+        article.refresh_from_db()
+        article2.refresh_from_db()
+
+        self.assertEqual('New Foo', article.title)
+        self.assertEqual(category, article.category)
+        self.assertEqual('New Bar', article2.title)
+        self.assertIsNone(article2.category)
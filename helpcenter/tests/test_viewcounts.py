@@ -0,0 +1,254 @@
+import threading
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.utils.six import StringIO
+
+from helpcenter import cache, models, viewcounts
+from helpcenter.testing_utils import create_article
+
+
+class ViewCountTestMixin(object):
+    """Start each test without any counted views."""
+
+    def setUp(self):
+        """Clear the cache and the current thread's buffer."""
+        cache.get_cache().clear()
+        viewcounts._buffer().clear()
+
+
+@override_settings(HELPCENTER_VIEW_COUNT_FLUSH_INTERVAL=0)
+class TestViewCounts(ViewCountTestMixin, TestCase):
+    """Test cases for counting article views."""
+
+    def test_buffered(self):
+        """Test counting views within the flush interval.
+
+        Views should stay in the thread's buffer until it is flushed.
+        """
+        article = create_article()
+
+        with override_settings(HELPCENTER_VIEW_COUNT_FLUSH_INTERVAL=60):
+            viewcounts._local.last_flush = viewcounts.time.time()
+            viewcounts.record_view(article.pk)
+
+        self.assertIsNone(cache.get_cache().get(viewcounts.FIRST_DAY_KEY))
+
+    def test_command(self):
+        """Test writing view counts with the management command."""
+        article = create_article()
+        viewcounts.record_view(article.pk)
+        output = StringIO()
+
+        call_command('flushviewcounts', stdout=output)
+        article.refresh_from_db()
+
+        self.assertEqual(1, article.view_count)
+        self.assertIn('Wrote 1 views.', output.getvalue())
+
+    def test_deleted_article(self):
+        """Test writing the views of an article that was deleted.
+
+        The views should be discarded.
+        """
+        article = create_article()
+        viewcounts.record_view(article.pk)
+        article.delete()
+
+        self.assertEqual(0, viewcounts.write_counts())
+        self.assertEqual(0, viewcounts.write_counts())
+
+    def test_rollup(self):
+        """Test adding views to an existing day in the rollup."""
+        article = create_article()
+        today = viewcounts.get_today()
+        models.ArticleViewDay.objects.create(
+            article=article, day=today, views=5)
+
+        viewcounts.record_view(article.pk)
+        viewcounts.write_counts()
+
+        self.assertEqual(
+            6, models.ArticleViewDay.objects.get(article=article).views)
+
+    def test_save_keeps_count(self):
+        """Test saving an article loaded before views were written.
+
+        Saving the stale article should not overwrite its view count.
+        """
+        article = create_article()
+        viewcounts.record_view(article.pk)
+        viewcounts.write_counts()
+
+        article.title = 'New Title'
+        article.save()
+        article.refresh_from_db()
+
+        self.assertEqual(1, article.view_count)
+        self.assertEqual('New Title', article.title)
+
+    def test_write(self):
+        """Test writing view counts to the database.
+
+        Articles with the same number of views should be updated
+        together, and each article's views should be added to the
+        current day of the rollup.
+        """
+        article = create_article(title='Foo')
+        article2 = create_article(title='Bar')
+        article3 = create_article(title='Baz')
+
+        for pk in (article.pk, article2.pk, article3.pk, article3.pk):
+            viewcounts.record_view(pk)
+
+        # Looking up the articles, two updates, looking up the rollup,
+        # and inserting into it, plus the savepoint of the transaction
+        with self.assertNumQueries(7):
+            self.assertEqual(4, viewcounts.write_counts())
+
+        self.assertEqual(
+            [('Bar', 1), ('Baz', 2), ('Foo', 1)],
+            list(models.Article.objects.order_by('title').values_list(
+                'title', 'view_count')))
+        self.assertEqual(
+            [(article.pk, 1), (article2.pk, 1), (article3.pk, 2)],
+            sorted(models.ArticleViewDay.objects.filter(
+                day=viewcounts.get_today()).values_list('article', 'views')))
+
+    def test_write_concurrent(self):
+        """Test writing views flushed by several threads.
+
+        Every thread's counters should be written, even though each
+        thread only knows about the counters it registered.
+        """
+        article = create_article(title='Foo')
+        article2 = create_article(title='Bar')
+        today = viewcounts.get_today()
+
+        viewcounts._buffer()[(today, article.pk)] = 2
+        viewcounts.flush()
+
+        thread = threading.Thread(target=viewcounts.record_view,
+                                  args=(article2.pk,))
+        thread.start()
+        thread.join()
+
+        viewcounts._buffer()[(today, article.pk)] = 1
+        viewcounts.flush()
+
+        self.assertEqual(4, viewcounts.write_counts())
+        self.assertEqual(
+            [('Bar', 1), ('Foo', 3)],
+            list(models.Article.objects.order_by('title').values_list(
+                'title', 'view_count')))
+
+    def test_write_nothing(self):
+        """Test writing view counts when nothing was viewed.
+
+        The database should not be queried.
+        """
+        with self.assertNumQueries(0):
+            self.assertEqual(0, viewcounts.write_counts())
+
+    def test_write_once(self):
+        """Test writing view counts twice.
+
+        Views should only be written to the database once.
+        """
+        article = create_article()
+        viewcounts.record_view(article.pk)
+
+        viewcounts.write_counts()
+        viewcounts.write_counts()
+        article.refresh_from_db()
+
+        self.assertEqual(1, article.view_count)
+
+    def test_write_previous_day(self):
+        """Test writing views counted on a previous day.
+
+        The views should be added to the day they were counted on.
+        """
+        article = create_article()
+        yesterday = viewcounts.get_today() - timedelta(days=1)
+        viewcounts._buffer()[(yesterday, article.pk)] = 3
+        viewcounts.flush()
+
+        viewcounts.write_counts()
+
+        self.assertEqual(
+            [(yesterday, 3)],
+            list(models.ArticleViewDay.objects.values_list('day', 'views')))
+        self.assertIsNotNone(
+            cache.get_cache().get(viewcounts._key(yesterday, article.pk)))
+
+    def test_write_old_day(self):
+        """Test writing views counted before yesterday.
+
+        Once the views are written, the day's counters should be
+        removed from the cache.
+        """
+        article = create_article()
+        day = viewcounts.get_today() - timedelta(days=2)
+        viewcounts._buffer()[(day, article.pk)] = 3
+        viewcounts.flush()
+
+        self.assertEqual(3, viewcounts.write_counts())
+        self.assertEqual(0, viewcounts.write_counts())
+
+        views_cache = cache.get_cache()
+
+        self.assertIsNone(views_cache.get(viewcounts._key(day, article.pk)))
+        self.assertIsNone(views_cache.get(viewcounts._slots_key(day)))
+        self.assertEqual(
+            viewcounts.get_today() - timedelta(days=1),
+            views_cache.get(viewcounts.FIRST_DAY_KEY))
+
+
+@override_settings(HELPCENTER_VIEW_COUNT_FLUSH_INTERVAL=0)
+class TestViewCountMixin(ViewCountTestMixin, TestCase):
+    """Test cases for counting views in views."""
+
+    def test_api_retrieve(self):
+        """Test retrieving an article from the API."""
+        article = create_article()
+
+        self.client.get(
+            '/api/articles/{}/'.format(article.pk))
+        viewcounts.write_counts()
+        article.refresh_from_db()
+
+        self.assertEqual(1, article.view_count)
+
+    @override_settings(HELPCENTER_CACHE_PAGES=True)
+    def test_cached(self):
+        """Test viewing an article served from the page cache.
+
+        Views of cached responses should be counted as well.
+        """
+        article = create_article()
+        url = article.get_absolute_url()
+
+        self.client.get(url)
+
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        viewcounts.write_counts()
+        article.refresh_from_db()
+
+        self.assertEqual(2, article.view_count)
+
+    def test_not_found(self):
+        """Test requesting an article that can't be viewed.
+
+        Nothing should be counted.
+        """
+        article = create_article(
+            time_published=timezone.now() + timedelta(hours=1))
+
+        self.client.get(article.get_absolute_url())
+
+        self.assertEqual(0, viewcounts.write_counts())
@@ -1,7 +1,13 @@
+from datetime import timedelta
+
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
-from helpcenter import models
+from helpcenter import (
+    cache, instrumentation, models, rankings, search, viewcounts)
 from helpcenter.testing_utils import (
     AuthTestMixin, create_article, create_category,
     instance_to_queryset_string)
@@ -176,6 +182,90 @@ class TestArticleDeleteView(AuthTestMixin, TestCase):
 class TestArticleDetailView(TestCase):
     """ Test cases for Article detail view """
 
+    @override_settings(HELPCENTER_CACHE_PAGES=True)
+    def test_cached(self):
+        """Test getting a cached article detail view.
+
+        Repeated requests from anonymous users should be served from
+        the cache without querying the database.
+        """
+        cache.get_cache().clear()
+        article = create_article()
+        url = article.get_absolute_url()
+
+        response = self.client.get(url)
+
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(url)
+
+        self.assertEqual(200, cached_response.status_code)
+        self.assertEqual(response.content, cached_response.content)
+
+    def test_old_slug(self):
+        """Test getting an article's detail view using an old slug.
+
+        The request should be permanently redirected to the article's
+        current URL without querying the database.
+        """
+        cache.get_cache().clear()
+        article = create_article(title='Old Title')
+        article.title = 'New Title'
+        article.save()
+
+        url = reverse('helpcenter:article-detail', kwargs={
+            'article_pk': article.pk,
+            'article_slug': 'old-title',
+        })
+        self.client.get(url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+
+        self.assertRedirects(
+            response, article.get_absolute_url(), status_code=301)
+
+    @override_settings(HELPCENTER_SLUG_URLS=True)
+    def test_pk_url_with_slug_urls(self):
+        """Test getting an article by pk when slug URLs are enabled.
+
+        The request should be redirected to the article's slug URL.
+        """
+        category = create_category()
+        article = create_article(category=category)
+
+        url = reverse('helpcenter:article-detail', kwargs={
+            'article_pk': article.pk,
+            'article_slug': article.slug,
+        })
+        response = self.client.get(url)
+
+        self.assertRedirects(
+            response, '/docs/{}/{}/'.format(category.slug, article.slug),
+            status_code=301)
+
+    def test_related_articles(self):
+        """Test the related articles shown with an article."""
+        article = create_article(title='Foo')
+        other = create_article(title='Bar')
+        models.RelatedArticle.objects.create(
+            article=article, rank=1, related=other, score=0.5)
+
+        response = self.client.get(article.get_absolute_url())
+
+        self.assertEqual([other], response.context['related_articles'])
+
+    def test_scheduled(self):
+        """Test getting the detail view of a scheduled article.
+
+        Articles should not be visible before they are published.
+        """
+        article = create_article(
+            time_published=timezone.now() + timedelta(hours=1))
+
+        response = self.client.get(article.get_absolute_url())
+
+        self.assertEqual(404, response.status_code)
+
     def test_invalid_pk(self):
         """ Test getting an article's detail view with an invalid pk.
 
@@ -201,6 +291,89 @@ class TestArticleDetailView(TestCase):
         self.assertEqual(article, response.context['article'])
 
 
+class TestArticleSlugDetailView(TestCase):
+    """Test cases for the article detail view identified by slugs."""
+
+    def setUp(self):
+        """Start each test with an empty cache."""
+        cache.get_cache().clear()
+
+    def test_category(self):
+        """Test getting an article in a category by its slugs."""
+        category = create_category()
+        article = create_article(category=category)
+
+        url = reverse('helpcenter:article-slug-detail', kwargs={
+            'article_slug': article.slug,
+            'category_slug': category.slug,
+        })
+
+        with override_settings(HELPCENTER_SLUG_URLS=True):
+            response = self.client.get(url)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(article, response.context['article'])
+
+    def test_no_category(self):
+        """Test getting an article without a category by its slug."""
+        article = create_article()
+
+        url = reverse('helpcenter:article-slug-detail', kwargs={
+            'article_slug': article.slug,
+        })
+
+        with override_settings(HELPCENTER_SLUG_URLS=True):
+            response = self.client.get(url)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(article, response.context['article'])
+
+    def test_old_slug(self):
+        """Test getting an article using an old slug.
+
+        The request should be redirected to the article's current URL.
+        """
+        article = create_article(title='Old Title')
+        article.title = 'New Title'
+        article.save()
+
+        url = reverse('helpcenter:article-slug-detail', kwargs={
+            'article_slug': 'old-title',
+        })
+        response = self.client.get(url)
+
+        self.assertRedirects(
+            response, article.get_absolute_url(), status_code=301)
+
+    def test_pk_url(self):
+        """Test getting an article by slug when slug URLs are disabled.
+
+        The request should be redirected to the article's pk URL.
+        """
+        article = create_article()
+
+        url = reverse('helpcenter:article-slug-detail', kwargs={
+            'article_slug': article.slug,
+        })
+        response = self.client.get(url)
+
+        self.assertRedirects(
+            response, article.get_absolute_url(), status_code=301)
+
+    def test_wrong_category(self):
+        """Test getting an article using a different category's slug."""
+        article = create_article(category=create_category())
+        other = create_category(title='Other')
+
+        url = reverse('helpcenter:article-slug-detail', kwargs={
+            'article_slug': article.slug,
+            'category_slug': other.slug,
+        })
+        response = self.client.get(url)
+
+        self.assertEqual(404, response.status_code)
+
+
 class TestArticleUpdateView(AuthTestMixin, TestCase):
     """ Test cases for the Article update view """
 
@@ -516,7 +689,21 @@ class TestCategoryDetailView(AuthTestMixin, TestCase):
             map(instance_to_queryset_string, category.category_set.all()))
         self.assertQuerysetEqual(
             response.context['articles'],
-            map(instance_to_queryset_string, category.article_list))
+            map(instance_to_queryset_string, category.article_list),
+            transform=instance_to_queryset_string)
+
+    def test_context_data_body_deferred(self):
+        """Test the articles listed in the category detail view.
+
+        The listed articles should not have their bodies loaded.
+        """
+        category = create_category()
+        create_article(category=category, body='A large body.')
+
+        response = self.client.get(category.get_absolute_url())
+        article = response.context['articles'][0]
+
+        self.assertIn('body', article.get_deferred_fields())
 
     @override_settings(HELPCENTER_EXPANDED_ARTICLE_LIST=True)
     def test_context_data_expanded_article_list(self):
@@ -535,7 +722,8 @@ class TestCategoryDetailView(AuthTestMixin, TestCase):
         self.assertEqual(200, response.status_code)
         self.assertQuerysetEqual(
             response.context['articles'],
-            map(instance_to_queryset_string, category.article_list))
+            map(instance_to_queryset_string, category.article_list),
+            transform=instance_to_queryset_string)
 
     def test_draft_as_editor(self):
         """Test the article list as a user with editing permissions.
@@ -559,7 +747,8 @@ class TestCategoryDetailView(AuthTestMixin, TestCase):
         self.assertQuerysetEqual(
             response.context['articles'],
             map(instance_to_queryset_string, category.article_list),
-            ordered=False)
+            ordered=False,
+            transform=instance_to_queryset_string)
 
     def test_draft_as_normal_user(self):
         """Test the article list as a normal user when there are drafts.
@@ -581,7 +770,8 @@ class TestCategoryDetailView(AuthTestMixin, TestCase):
             response.context['articles'],
             map(
                 instance_to_queryset_string,
-                category.article_list.exclude(draft=True)))
+                category.article_list.exclude(draft=True)),
+            transform=instance_to_queryset_string)
 
     def test_invalid_pk(self):
         """ Test getting the detail view with an invalid pk.
@@ -601,7 +791,7 @@ class TestCategoryDetailView(AuthTestMixin, TestCase):
         """Test paginating articles.
 
         There should be a maximum of HELPCENTER_ARTICLES_PER_PAGE
-        articles on each page.
+        articles on each page, with the newest articles first.
         """
         category = create_category()
 
@@ -614,7 +804,8 @@ class TestCategoryDetailView(AuthTestMixin, TestCase):
         self.assertEqual(200, response.status_code)
         self.assertQuerysetEqual(
             response.context['articles'],
-            [instance_to_queryset_string(a1)])
+            [instance_to_queryset_string(a2)],
+            transform=instance_to_queryset_string)
 
         url = "{}?page=2".format(url)
         response = self.client.get(url)
@@ -622,7 +813,8 @@ class TestCategoryDetailView(AuthTestMixin, TestCase):
         self.assertEqual(200, response.status_code)
         self.assertQuerysetEqual(
             response.context['articles'],
-            [instance_to_queryset_string(a2)])
+            [instance_to_queryset_string(a1)],
+            transform=instance_to_queryset_string)
 
     def test_valid_pk(self):
         """ Test getting the detail view of a category.
@@ -747,11 +939,38 @@ class TestCategoryUpdateView(AuthTestMixin, TestCase):
         self.assertEqual(data['title'], category.title)
         self.assertEqual(new_parent, category.parent)
 
+    def test_move_into_subcategory(self):
+        """Test moving a category into one of its subcategories.
+
+        The form should be invalid, and the category should not move.
+        """
+        self.add_permission('change_category')
+        self.login()
+
+        category = create_category()
+        child = create_category(title='Child', parent=category)
+
+        response = self.client.post(
+            category.get_update_url(),
+            {'title': category.title, 'parent': child.pk})
+
+        category.refresh_from_db()
+
+        self.assertEqual(200, response.status_code)
+        self.assertIn('parent', response.context['form'].errors)
+        self.assertIsNone(category.parent)
 
-class TestIndexView(TestCase):
+
+class TestIndexView(AuthTestMixin, TestCase):
     """ Test cases for the index view """
     url = reverse('helpcenter:index')
 
+    def setUp(self, *args, **kwargs):
+        """Start each test with an empty cache."""
+        super(TestIndexView, self).setUp(*args, **kwargs)
+
+        cache.get_cache().clear()
+
     def test_article_listing(self):
         """ Test which articles are listed in the index view.
 
@@ -765,7 +984,43 @@ class TestIndexView(TestCase):
         self.assertEqual(200, response.status_code)
         self.assertQuerysetEqual(
             response.context['articles'],
-            [instance_to_queryset_string(article)])
+            [instance_to_queryset_string(article)],
+            transform=instance_to_queryset_string)
+
+    def test_rankings(self):
+        """Test the article rankings shown on the index page."""
+        article = create_article()
+        models.ArticleViewDay.objects.create(
+            article=article, day=viewcounts.get_today(), views=1)
+        rankings.compute_rankings()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual([article], response.context['popular_articles'])
+        self.assertEqual([article], response.context['trending_articles'])
+
+    def test_article_listing_scheduled(self):
+        """Test listing articles that are scheduled to be published.
+
+        Scheduled articles should only be listed for users who can edit
+        articles.
+        """
+        article = create_article(
+            time_published=timezone.now() + timedelta(hours=1))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(0, len(response.context['articles']))
+
+        self.add_permission('change_article')
+        self.login()
+
+        response = self.client.get(self.url)
+
+        self.assertQuerysetEqual(
+            response.context['articles'],
+            [instance_to_queryset_string(article)],
+            transform=instance_to_queryset_string)
 
     def test_category_listing(self):
         """ Test which categories are listed in the index view.
@@ -782,3 +1037,167 @@ class TestIndexView(TestCase):
         self.assertQuerysetEqual(
             response.context['categories'],
             [instance_to_queryset_string(category)])
+
+    @override_settings(HELPCENTER_CACHE_PAGES=True)
+    def test_cached(self):
+        """Test getting the index view while page caching is enabled.
+
+        After the first request, the page should be served from the
+        cache.
+        """
+        self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+
+        self.assertEqual(200, response.status_code)
+
+    @override_settings(HELPCENTER_CACHE_PAGES=True)
+    def test_cached_authenticated(self):
+        """Test getting the index view as an authenticated user.
+
+        Authenticated users should not receive cached pages, since the
+        page could depend on their permissions.
+        """
+        self.login()
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+
+        self.assertTrue(len(queries) > 0)
+
+    @override_settings(HELPCENTER_CACHE_PAGES=True)
+    def test_cached_invalidation(self):
+        """Test the cached index view after creating an article.
+
+        Creating an article should invalidate the cached page.
+        """
+        self.client.get(self.url)
+        article = create_article()
+
+        response = self.client.get(self.url)
+
+        self.assertContains(response, article.title)
+
+
+class TestSearchView(TestCase):
+    """Test cases for the search view."""
+    url = reverse('helpcenter:search')
+
+    def setUp(self):
+        """Start each test with empty caches."""
+        cache.get_cache().clear()
+        search._local_cache.clear()
+        search._local_index.clear()
+
+    def test_category(self):
+        """Test searching within a category."""
+        category = create_category()
+        article = create_article(title='Foo', category=category)
+        create_article(title='Foo')
+
+        response = self.client.get(
+            self.url, {'q': 'foo', 'category': category.pk})
+
+        self.assertEqual([article], response.context['articles'])
+
+    def test_invalid_category(self):
+        """Test searching with an invalid category.
+
+        The category should be ignored.
+        """
+        article = create_article(title='Foo')
+
+        response = self.client.get(self.url, {'q': 'foo', 'category': 'x'})
+
+        self.assertEqual([article], response.context['articles'])
+
+    def test_no_query(self):
+        """Test getting the view without searching."""
+        response = self.client.get(self.url)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('', response.context['query'])
+        self.assertEqual([], response.context['articles'])
+
+    def test_search(self):
+        """Test searching for articles.
+
+        The matching articles should be listed.
+        """
+        article = create_article(title='Reset password')
+        create_article(title='Other')
+
+        response = self.client.get(self.url, {'q': 'password'})
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('password', response.context['query'])
+        self.assertEqual([article], response.context['articles'])
+        self.assertContains(response, article.title)
+
+    def test_suggestion(self):
+        """Test searching with a misspelled query.
+
+        A corrected query should be suggested.
+        """
+        create_article(title='Reset password')
+
+        response = self.client.get(self.url, {'q': 'pasword'})
+
+        self.assertEqual('password', response.context['suggestion'])
+        self.assertContains(response, 'Did you mean')
+
+
+class TestMetricsView(AuthTestMixin, TestCase):
+    """Test cases for the metrics view."""
+    url = reverse('helpcenter:metrics')
+
+    def test_anonymous(self):
+        """Test getting the view as an anonymous user.
+
+        Anonymous users should not be able to see metrics.
+        """
+        response = self.client.get(self.url)
+
+        self.assertEqual(403, response.status_code)
+
+    def test_not_staff(self):
+        """Test getting the view as a user who is not staff.
+
+        Only staff should be able to see metrics.
+        """
+        self.login()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(403, response.status_code)
+
+    def test_staff(self):
+        """Test getting the view as a staff member.
+
+        Staff members should receive the metrics in the Prometheus text
+        format, including article and category totals.
+        """
+        self.user.is_staff = True
+        self.user.save()
+        self.login()
+
+        create_article()
+        create_article(draft=True)
+        create_category()
+
+        with instrumentation.capture_metrics():
+            self.client.get(reverse('helpcenter:index'))
+
+        response = self.client.get(self.url)
+        content = response.content.decode('utf-8')
+
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn('helpcenter_articles{draft="false"} 1', content)
+        self.assertIn('helpcenter_articles{draft="true"} 1', content)
+        self.assertIn('helpcenter_categories 1', content)
+        self.assertIn(
+            'helpcenter_request_duration_seconds_count{view="IndexView"}',
+            content)
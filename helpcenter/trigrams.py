@@ -0,0 +1,116 @@
+"""Trigram index used to correct misspelled search terms.
+
+A word's trigrams are its runs of three consecutive characters, after
+padding the word with two spaces in front and one behind. The
+similarity of two words is the number of trigrams they share divided
+by the number of distinct trigrams in either of them, which is the
+same measure PostgreSQL's ``pg_trgm`` extension uses.
+
+The index maps each trigram to a posting list of the words containing
+it. Candidates for a misspelled word are found by merging the posting
+lists of the word's own trigrams, so only words sharing at least one
+trigram with it are looked at, rather than the whole vocabulary.
+"""
+
+from collections import Counter
+
+
+# Words shorter than this aren't corrected
+MIN_LENGTH = 3
+
+
+def get_trigrams(word):
+    """Get the set of trigrams in a word.
+
+    Args:
+        word (str):
+            The lowercase word to get the trigrams of.
+
+    Returns:
+        set:
+            The distinct trigrams of the padded word.
+    """
+    padded = u'  {} '.format(word)
+
+    return set(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class TrigramIndex(object):
+    """An index of the words in a vocabulary by their trigrams.
+
+    Attributes:
+        frequencies (dict):
+            A mapping of each word to the number of documents it
+            appears in.
+    """
+
+    def __init__(self, frequencies):
+        """Build the index of a vocabulary.
+
+        Args:
+            frequencies (dict):
+                A mapping of each word in the vocabulary to the number
+                of documents it appears in.
+        """
+        self.frequencies = frequencies
+
+        self._postings = {}
+        self._sizes = []
+        self._words = []
+
+        for word in sorted(frequencies):
+            trigrams = get_trigrams(word)
+
+            for trigram in trigrams:
+                self._postings.setdefault(trigram, []).append(
+                    len(self._words))
+
+            self._sizes.append(len(trigrams))
+            self._words.append(word)
+
+    def __contains__(self, word):
+        """Determine if a word is in the vocabulary."""
+        return word in self.frequencies
+
+    def suggest(self, word, threshold, limit):
+        """Get the words in the vocabulary most similar to a word.
+
+        Args:
+            word (str):
+                The lowercase word to find similar words for.
+            threshold (float):
+                The minimum similarity of a suggested word, between 0
+                and 1.
+            limit (int):
+                The maximum number of words suggested.
+
+        Returns:
+            list:
+                The most similar words, from most to least similar.
+                Equally similar words are ordered by how many documents
+                they appear in. Words shorter than `MIN_LENGTH` get no
+                suggestions.
+        """
+        if len(word) < MIN_LENGTH:
+            return []
+
+        trigrams = get_trigrams(word)
+        shared = Counter()
+
+        for trigram in trigrams:
+            shared.update(self._postings.get(trigram, ()))
+
+        scored = []
+
+        for index, count in shared.items():
+            candidate = self._words[index]
+            similarity = float(count) / (
+                len(trigrams) + self._sizes[index] - count)
+
+            if similarity >= threshold and candidate != word:
+                scored.append((
+                    -similarity, -self.frequencies[candidate], candidate))
+
+        scored.sort()
+
+        return [candidate for _, _, candidate in scored[:limit]]
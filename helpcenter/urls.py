@@ -30,10 +30,20 @@ category_urls = [
     ])),
 ]
 
+slug_urls = [
+    url(r'^(?P<article_slug>[-\w]+)/$', views.ArticleSlugDetailView.as_view(),
+        name='article-slug-detail'),
+    url(r'^(?P<category_slug>[-\w]+)/(?P<article_slug>[-\w]+)/$',
+        views.ArticleSlugDetailView.as_view(), name='article-slug-detail'),
+]
+
 urlpatterns = [
     url(r'^api/', include('helpcenter.api.urls', app_name='helpcenter-api',
         namespace='api')),
     url(r'^articles/', include(article_urls)),
     url(r'^categories/', include(category_urls)),
+    url(r'^docs/', include(slug_urls)),
+    url(r'^metrics/$', views.MetricsView.as_view(), name='metrics'),
+    url(r'^search/$', views.SearchView.as_view(), name='search'),
     url(r'^$', views.IndexView.as_view(), name='index'),
 ]
@@ -3,6 +3,52 @@
 import importlib
 import logging
 
+from django.db import router
+from django.db.models import Case, Value, When
+
+
+def bulk_update(objs, fields, using=None):
+    """Save the given fields of multiple instances in one query.
+
+    Django only gained `QuerySet.bulk_update` in version 2.2, so this
+    builds the equivalent `UPDATE ... SET field = CASE ... END` query
+    by hand.
+
+    Args:
+        objs (list):
+            The model instances to save. They must all be instances of
+            the same model and must already exist in the database.
+        fields (list):
+            The names of the fields to save.
+        using (str):
+            The database to write to. Defaults to the database the
+            model is written to.
+
+    Returns:
+        int:
+            The number of rows updated.
+    """
+    if not objs or not fields:
+        return 0
+
+    model = type(objs[0])
+    updates = {}
+
+    for name in fields:
+        field = model._meta.get_field(name)
+        whens = [
+            When(pk=obj.pk, then=Value(
+                getattr(obj, field.attname), output_field=field))
+            for obj in objs]
+
+        updates[field.attname] = Case(*whens, output_field=field)
+
+    queryset = model._default_manager.using(
+        using or router.db_for_write(model)).filter(
+            pk__in=[obj.pk for obj in objs])
+
+    return queryset.update(**updates)
+
 
 def string_to_class(class_string):
     """Convert a string to a python class.
@@ -0,0 +1,334 @@
+"""Counting of article views.
+
+Writing to the database on every page view would put a write on the
+hot path of the most common request, so views are counted in stages:
+
+1. Each view is added to a buffer local to the current thread.
+2. Every `HELPCENTER_VIEW_COUNT_FLUSH_INTERVAL` seconds, a thread merges
+   its buffer into counters in the help center cache using atomic
+   increments. The thread that creates a counter registers it in a
+   numbered slot of the counter's day, so the counters can be found
+   without keeping a shared list of them that every thread rewrites.
+3. The ``flushviewcounts`` management command, run periodically,
+   writes the counters from the cache to the database. Articles with
+   the same number of new views are updated together with a single
+   `F()` expression, and the views are added to a daily rollup in
+   `ArticleViewDay`.
+
+If a process dies, only the views in its thread buffers are lost, and
+those cover at most one flush interval. Views that a thread flushes
+more than a day after they were counted may also be lost. For counters
+to be combined across processes, the cache given by `HELPCENTER_CACHE`
+must be shared between them, eg: memcached or redis.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from helpcenter import cache, models
+
+
+# The first day that may have counters that weren't written yet
+FIRST_DAY_KEY = 'helpcenter:views:first-day'
+
+
+_local = threading.local()
+
+
+def _buffer():
+    """Get the view buffer for the current thread."""
+    if not hasattr(_local, 'views'):
+        _local.views = {}
+        _local.last_flush = time.time()
+
+    return _local.views
+
+
+def _group_by_amount(amounts):
+    """Group keys by their amount.
+
+    Args:
+        amounts (dict):
+            A mapping of keys to amounts.
+
+    Returns:
+        dict:
+            A mapping of each distinct amount to the list of keys with
+            that amount.
+    """
+    groups = defaultdict(list)
+
+    for key, amount in amounts.items():
+        groups[amount].append(key)
+
+    return groups
+
+
+def _incr(views_cache, key, amount):
+    """Increment a counter in the cache, creating it if needed.
+
+    Returns:
+        bool:
+            True if the counter was created by this call.
+    """
+    try:
+        views_cache.incr(key, amount)
+    except ValueError:
+        if views_cache.add(key, amount, None):
+            return True
+
+        views_cache.incr(key, amount)
+
+    return False
+
+
+def _key(day, pk):
+    """Get the cache key counting an article's views on a day."""
+    return 'helpcenter:views:{}:{}'.format(day.isoformat(), pk)
+
+
+def _register(views_cache, day, pk):
+    """Register a new counter so its views are written.
+
+    The counter is given the next slot of its day. Each slot is only
+    ever written by the thread that claimed it, so concurrent threads
+    never overwrite each other's counters.
+    """
+    slots_key = _slots_key(day)
+
+    try:
+        slot = views_cache.incr(slots_key)
+    except ValueError:
+        slot = 1 if views_cache.add(slots_key, 1, None) else views_cache.incr(
+            slots_key)
+
+    views_cache.set(_slot_key(day, slot), pk, None)
+    views_cache.add(FIRST_DAY_KEY, day, None)
+
+
+def _slot_key(day, slot):
+    """Get the cache key of a registered counter of a day."""
+    return 'helpcenter:views:{}:slot:{}'.format(day.isoformat(), slot)
+
+
+def _slots_key(day):
+    """Get the cache key of the number of counters of a day."""
+    return 'helpcenter:views:{}:slots'.format(day.isoformat())
+
+
+def flush():
+    """Merge the current thread's views into the shared cache.
+
+    Every count is added to its counter in the cache with an atomic
+    increment, and new counters are registered in slots claimed with
+    atomic increments, so concurrent flushes from other threads and
+    processes are safe.
+    """
+    views = _buffer()
+    _local.last_flush = time.time()
+
+    if not views:
+        return
+
+    views_cache = cache.get_cache()
+
+    for (day, pk), amount in views.items():
+        if _incr(views_cache, _key(day, pk), amount):
+            _register(views_cache, day, pk)
+
+    views.clear()
+
+
+def get_flush_interval():
+    """Get the number of seconds views are buffered in a thread for."""
+    return getattr(settings, 'HELPCENTER_VIEW_COUNT_FLUSH_INTERVAL', 10)
+
+
+def get_today():
+    """Get the current date in the current time zone."""
+    now = timezone.now()
+
+    if settings.USE_TZ:
+        now = timezone.localtime(now)
+
+    return now.date()
+
+
+def record_view(pk):
+    """Count a view of an article.
+
+    Args:
+        pk (int):
+            The primary key of the viewed article.
+    """
+    views = _buffer()
+    key = (get_today(), pk)
+    views[key] = views.get(key, 0) + 1
+
+    if time.time() - _local.last_flush >= get_flush_interval():
+        flush()
+
+
+def write_counts(using=None):
+    """Write the view counters from the cache to the database.
+
+    The current thread's buffer is flushed first. The counters
+    registered on each day that hasn't been fully written are read from
+    their slots, and each counter is decremented by the amount written
+    once the database transaction has committed, so views counted while
+    writing are kept for the next call.
+
+    Args:
+        using (str):
+            The database to write to. Defaults to the database articles
+            are written to.
+
+    Returns:
+        int:
+            The number of views written.
+    """
+    flush()
+
+    using = using or router.db_for_write(models.Article)
+    views_cache = cache.get_cache()
+    first_day = views_cache.get(FIRST_DAY_KEY)
+
+    if first_day is None:
+        return 0
+
+    today = get_today()
+    days = [first_day + timedelta(days=n)
+            for n in range((today - first_day).days + 1)]
+
+    slot_counts = views_cache.get_many([_slots_key(day) for day in days])
+    num_slots = dict(
+        (day, slot_counts.get(_slots_key(day), 0)) for day in days)
+    slot_keys = [
+        _slot_key(day, slot)
+        for day in days for slot in range(1, num_slots[day] + 1)]
+    slots = views_cache.get_many(slot_keys)
+
+    # A counter whose slot was just claimed may not be stored yet. Its
+    # day is kept until it is.
+    incomplete = set(day for day in days if any(
+        _slot_key(day, slot) not in slots
+        for slot in range(1, num_slots[day] + 1)))
+
+    pending = set(
+        (day, slots[_slot_key(day, slot)])
+        for day in days for slot in range(1, num_slots[day] + 1)
+        if _slot_key(day, slot) in slots)
+
+    keys = dict((_key(day, pk), (day, pk)) for day, pk in pending)
+    counts = dict(
+        (keys[key], amount)
+        for key, amount in views_cache.get_many(list(keys)).items()
+        if amount)
+
+    written = _write_totals(counts, using) if counts else 0
+
+    for (day, pk), amount in counts.items():
+        try:
+            remaining = views_cache.decr(_key(day, pk), amount)
+        except ValueError:
+            # The counter was evicted, so it can't be counted again.
+            remaining = 0
+
+        if remaining:
+            incomplete.add(day)
+
+    # Views are only counted towards the current day, so once every
+    # counter of a previous day has been written, the day's keys are no
+    # longer needed. Yesterday is always checked again, in case a
+    # thread flushes its views from before midnight late.
+    finished = [day for day in days
+                if day < today - timedelta(days=1) and day not in incomplete]
+
+    views_cache.delete_many(
+        [_slots_key(day) for day in finished] +
+        [_slot_key(day, slot)
+         for day in finished for slot in range(1, num_slots[day] + 1)] +
+        [_key(day, pk) for day, pk in pending if day in finished])
+
+    unfinished = [day for day in days if day not in finished]
+    views_cache.set(
+        FIRST_DAY_KEY, min([today - timedelta(days=1)] + unfinished), None)
+
+    return written
+
+
+def _write_totals(counts, using):
+    """Add counted views to articles and the daily rollup.
+
+    Args:
+        counts (dict):
+            A mapping of (day, article pk) pairs to the number of views
+            to add.
+        using (str):
+            The database to write to.
+
+    Returns:
+        int:
+            The number of views written. Views of articles that no
+            longer exist are discarded.
+    """
+    existing = set(models.Article.objects.using(using).filter(
+        pk__in=set(pk for _, pk in counts),
+    ).order_by().values_list('pk', flat=True))
+
+    totals = defaultdict(int)
+    daily = {}
+
+    for (day, pk), amount in counts.items():
+        if pk in existing:
+            totals[pk] += amount
+            daily[(day, pk)] = amount
+
+    with transaction.atomic(using=using):
+        for amount, pks in _group_by_amount(totals).items():
+            models.Article.objects.using(using).filter(pk__in=pks).update(
+                view_count=F('view_count') + amount)
+
+        _write_daily(daily, using)
+
+    return sum(totals.values())
+
+
+def _write_daily(daily, using):
+    """Add views to the daily rollup.
+
+    Args:
+        daily (dict):
+            A mapping of (day, article pk) pairs to the number of views
+            to add.
+        using (str):
+            The database to write to.
+    """
+    if not daily:
+        return
+
+    days = models.ArticleViewDay.objects.using(using)
+    existing = dict(
+        ((day, pk), row_pk) for row_pk, day, pk in days.filter(
+            article__in=set(pk for _, pk in daily),
+            day__in=set(day for day, _ in daily),
+        ).order_by().values_list('pk', 'day', 'article'))
+
+    updates = dict(
+        (existing[key], amount) for key, amount in daily.items()
+        if key in existing)
+
+    for amount, pks in _group_by_amount(updates).items():
+        days.filter(pk__in=pks).update(views=F('views') + amount)
+
+    days.bulk_create([
+        models.ArticleViewDay(article_id=pk, day=day, views=amount)
+        for (day, pk), amount in daily.items()
+        if (day, pk) not in existing])
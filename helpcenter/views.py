@@ -1,87 +1,197 @@
 from django.conf import settings
+from django.core.exceptions import PermissionDenied
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.shortcuts import render
+from django.db.models import Count
+from django.http import HttpResponse, HttpResponsePermanentRedirect
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
 from django.views import generic
 
-from helpcenter import models
-from helpcenter.mixins import OptionalFormMixin, PermissionsMixin
+from helpcenter import (
+    duplicates, forms, metrics, models, rankings, redirects, related, search)
+from helpcenter.mixins import (
+    CachedResponseMixin, InstrumentedViewMixin, OptionalFormMixin,
+    PermissionsMixin, ProfilingMixin, ViewCountMixin)
 
 
-class ArticleCreateView(OptionalFormMixin, PermissionsMixin,
+class ArticleCreateView(ProfilingMixin, InstrumentedViewMixin,
+                        OptionalFormMixin, PermissionsMixin,
                         generic.edit.CreateView):
     """View for creating new Article instances."""
-    fields = ('title', 'body', 'category', 'draft')
+    form_class = forms.ArticleForm
     form_class_setting = 'HELPCENTER_ARTICLE_CREATE_FORM'
     model = models.Article
     permissions = ('helpcenter.add_article',)
     pk_url_kwarg = 'article_pk'
+    query_budget = 15
     template_name_suffix = '_create'
 
+    def form_valid(self, form):
+        """Save the article, warning about near-duplicates."""
+        response = super(ArticleCreateView, self).form_valid(form)
+        duplicates.warn_duplicates(self.request, self.object)
 
-class ArticleDeleteView(PermissionsMixin, generic.edit.DeleteView):
+        return response
+
+
+class ArticleDeleteView(ProfilingMixin, InstrumentedViewMixin,
+                        PermissionsMixin, generic.edit.DeleteView):
     """ View for deleting an Article instance """
     model = models.Article
     permissions = ('helpcenter.delete_article',)
     pk_url_kwarg = 'article_pk'
+    query_budget = 14
 
     def get_success_url(self):
         """ Redirect to the instance's parent """
         return self.object.get_parent_url()
 
 
-class ArticleDetailView(generic.DetailView):
+class ArticleDetailView(ProfilingMixin, InstrumentedViewMixin,
+                        ViewCountMixin, CachedResponseMixin,
+                        generic.DetailView):
     """ View for viewing an article's details """
     model = models.Article
     pk_url_kwarg = 'article_pk'
+    query_budget = 7
+
+    def get(self, request, *args, **kwargs):
+        """Show the article, redirecting to its canonical URL.
+
+        Links using one of the article's old slugs are redirected
+        without querying the database. Any other URL that doesn't match
+        the article's canonical URL is redirected once the article has
+        been found.
+        """
+        redirect_url = self.get_redirect_url()
+
+        if redirect_url is not None:
+            return HttpResponsePermanentRedirect(redirect_url)
+
+        self.object = self.get_object()
+        canonical_url = self.object.get_absolute_url()
+
+        if request.path != canonical_url:
+            return HttpResponsePermanentRedirect(canonical_url)
+
+        context = self.get_context_data(object=self.object)
+        response = self.render_to_response(context)
+        response.viewed_article_pk = self.object.pk
+
+        return response
+
+    def get_context_data(self, **kwargs):
+        """Add the article's related articles to the context."""
+        context = super(ArticleDetailView, self).get_context_data(**kwargs)
+        context['related_articles'] = related.get_related_articles(
+            self.object)
+
+        return context
 
+    def get_queryset(self):
+        """Only show drafts and scheduled articles to editors."""
+        return models.Article.objects.visible_to(
+            self.request.user).select_related('category')
 
-class ArticleUpdateView(OptionalFormMixin, PermissionsMixin,
+    def get_redirect_url(self):
+        """Get the URL an old link to the article redirects to.
+
+        Returns:
+            str:
+                The article's current URL if the requested slug is one
+                of its old slugs, or None otherwise.
+        """
+        return redirects.get_pk_redirect(
+            int(self.kwargs['article_pk']), self.kwargs['article_slug'])
+
+
+class ArticleSlugDetailView(ArticleDetailView):
+    """View for an article's details identified only by slugs.
+
+    The article is identified by its slug and the slug of its category,
+    if it has one.
+    """
+
+    def get_object(self, queryset=None):
+        """Get the article with the requested slugs."""
+        if queryset is None:
+            queryset = self.get_queryset()
+
+        category_slug = self.kwargs.get('category_slug')
+
+        if category_slug is None:
+            queryset = queryset.filter(category=None)
+        else:
+            queryset = queryset.filter(category__slug=category_slug)
+
+        return get_object_or_404(queryset, slug=self.kwargs['article_slug'])
+
+    def get_redirect_url(self):
+        """Get the URL an old link to the article redirects to."""
+        return redirects.get_slug_redirect(
+            self.kwargs.get('category_slug'), self.kwargs['article_slug'])
+
+
+class ArticleUpdateView(ProfilingMixin, InstrumentedViewMixin,
+                        OptionalFormMixin, PermissionsMixin,
                         generic.edit.UpdateView):
     """ View for updating Article instances """
-    fields = ('title', 'body', 'category', 'draft')
+    form_class = forms.ArticleForm
     form_class_setting = 'HELPCENTER_ARTICLE_UPDATE_FORM'
     model = models.Article
     permissions = ('helpcenter.change_article',)
     pk_url_kwarg = 'article_pk'
+    query_budget = 21
     template_name_suffix = '_update'
 
+    def form_valid(self, form):
+        """Save the article, warning about near-duplicates."""
+        response = super(ArticleUpdateView, self).form_valid(form)
+        duplicates.warn_duplicates(self.request, self.object)
+
+        return response
 
-class CategoryCreateView(OptionalFormMixin, PermissionsMixin,
+
+class CategoryCreateView(ProfilingMixin, InstrumentedViewMixin,
+                         OptionalFormMixin, PermissionsMixin,
                          generic.edit.CreateView):
     """View for creating new Category instances."""
-    fields = ('title', 'parent')
+    form_class = forms.CategoryForm
     form_class_setting = 'HELPCENTER_CATEGORY_CREATE_FORM'
     model = models.Category
     permissions = ('helpcenter.add_category',)
     pk_url_kwarg = 'category_pk'
+    query_budget = 13
     template_name_suffix = '_create'
 
 
-class CategoryDeleteView(PermissionsMixin, generic.edit.DeleteView):
+class CategoryDeleteView(ProfilingMixin, InstrumentedViewMixin,
+                         PermissionsMixin, generic.edit.DeleteView):
     """ View for deleting Category instances """
     model = models.Category
     permissions = ('helpcenter.delete_category',)
     pk_url_kwarg = 'category_pk'
+    query_budget = 21
 
     def get_success_url(self):
         """ Return the url of the instances parent """
         return self.object.get_parent_url()
 
 
-class CategoryDetailView(generic.DetailView):
+class CategoryDetailView(ProfilingMixin, InstrumentedViewMixin,
+                         CachedResponseMixin, generic.DetailView):
     """ View for viewing a Category's details """
     model = models.Category
     pk_url_kwarg = 'category_pk'
+    query_budget = 9
 
     def get_context_data(self, *args, **kwargs):
         """ Add custom context data """
         context = super(CategoryDetailView, self).get_context_data(
             *args, **kwargs)
 
-        articles = self.object.article_list
-
-        if not self.request.user.has_perm('helpcenter.change_article'):
-            articles = articles.exclude(draft=True)
+        articles = self.object.article_list.for_listing().visible_to(
+            self.request.user)
 
         context['articles'] = self._paginate_query(articles)
 
@@ -104,33 +214,105 @@ class CategoryDetailView(generic.DetailView):
             return paginator.page(paginator.num_pages)
 
 
-class CategoryUpdateView(OptionalFormMixin, PermissionsMixin,
+class CategoryUpdateView(ProfilingMixin, InstrumentedViewMixin,
+                         OptionalFormMixin, PermissionsMixin,
                          generic.edit.UpdateView):
     """ View for updating existing Category instances """
-    fields = ('title', 'parent')
+    form_class = forms.CategoryForm
     form_class_setting = 'HELPCENTER_CATEGORY_UPDATE_FORM'
     model = models.Category
     permissions = ('helpcenter.change_category',)
     pk_url_kwarg = 'category_pk'
+    query_budget = 12
     template_name_suffix = '_update'
 
 
-class IndexView(generic.View):
+class IndexView(ProfilingMixin, InstrumentedViewMixin, CachedResponseMixin,
+                generic.View):
     """ View for the helpcenter index (home page) """
+    query_budget = 7
     template_name = 'helpcenter/index.html'
 
     def get(self, request, *args, **kwargs):
         """ Handle get requests """
-        return render(request, self.template_name, self.get_context_data())
+        return TemplateResponse(
+            request, self.template_name, self.get_context_data())
 
     def get_context_data(self, *args, **kwargs):
         """ Get context data for a request """
         context = {}
 
-        articles = models.Article.objects.filter(category=None)
+        articles = models.Article.objects.for_listing().visible_to(
+            self.request.user).filter(category=None)
         context['articles'] = articles
 
         categories = models.Category.objects.filter(parent=None)
         context['categories'] = categories
 
+        ranked = rankings.get_ranked_articles()
+        context['popular_articles'] = ranked['popular']
+        context['trending_articles'] = ranked['trending']
+
         return context
+
+
+class SearchView(ProfilingMixin, InstrumentedViewMixin, CachedResponseMixin,
+                 generic.View):
+    """View for searching published articles.
+
+    The text searched for is given by the ``q`` parameter, and the
+    search can be limited to a single category with the ``category``
+    parameter. If the query contains misspelled words, a corrected
+    query is suggested.
+    """
+    query_budget = 4
+    template_name = 'helpcenter/search.html'
+
+    def get(self, request, *args, **kwargs):
+        """ Handle get requests """
+        return TemplateResponse(
+            request, self.template_name, self.get_context_data())
+
+    def get_context_data(self, *args, **kwargs):
+        """ Get context data for a request """
+        query = self.request.GET.get('q', '').strip()
+
+        try:
+            category_id = int(self.request.GET['category'])
+        except (KeyError, ValueError):
+            category_id = None
+
+        return {
+            'articles': search.get_results(query, category_id),
+            'query': query,
+            'suggestion': search.get_suggestion(query),
+        }
+
+
+class MetricsView(generic.View):
+    """View exposing help center metrics to Prometheus.
+
+    Only staff members may access the view.
+    """
+    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def get(self, request, *args, **kwargs):
+        """Render the metrics in the Prometheus text format."""
+        if not request.user.is_staff:
+            raise PermissionDenied()
+
+        article_counts = models.Article.objects.values('draft').annotate(
+            count=Count('pk')).order_by()
+        articles = [
+            ((('draft', str(row['draft']).lower()),), row['count'])
+            for row in article_counts]
+
+        categories = [((), models.Category.objects.count())]
+
+        content = metrics.render(extra=[
+            ('helpcenter_articles', 'The number of articles.', articles),
+            ('helpcenter_categories', 'The number of categories.',
+             categories),
+        ])
+
+        return HttpResponse(content, content_type=self.content_type)
@@ -27,11 +27,14 @@ setup(
         'Programming Language :: Python :: 3.4',
         'Programming Language :: Python :: 3.5',
     ],
-    packages=find_packages(exclude=['example_project']),
+    packages=find_packages(exclude=['benchmarks', 'example_project']),
     include_package_data=True,
     install_requires=[
         'django',
         'djangorestframework',
         'pytz',
     ],
+    extras_require={
+        'related': ['numpy', 'scipy'],
+    },
     zip_safe=False)
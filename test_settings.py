@@ -15,7 +15,14 @@ DATABASES = {
         'PASSWORD': '',
         'HOST': '',
         'PORT': '',
-    }
+    },
+    # A second database used to test routing reads to a replica. It
+    # isn't a mirror of the default database, so only content written
+    # to it directly can be read from it.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
 }
 
 
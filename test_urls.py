@@ -1,7 +1,9 @@
 from django.conf.urls import include, url
+from django.contrib import admin
 
 
 urlpatterns = [
+    url(r'^admin/', include(admin.site.urls)),
     url(r'^', include('helpcenter.urls', app_name='helpcenter',
         namespace='help')),
 ]